@@ -0,0 +1,11 @@
+from __future__ import annotations
+
+__lazy_modules__ = ["typing"]
+
+from typing import Final
+
+STRICT_SOFT_SENTINEL_RECORD: Final[str] = "1\nfilelock-strict-v1\x00\n0\n"
+
+__all__ = [
+    "STRICT_SOFT_SENTINEL_RECORD",
+]
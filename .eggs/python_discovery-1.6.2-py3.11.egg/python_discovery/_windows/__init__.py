@@ -0,0 +1,13 @@
+"""Windows-specific Python discovery via PEP 514 registry entries."""
+
+from __future__ import annotations
+
+from ._pep514 import _run, discover_pythons
+from ._propose import Pep514PythonInfo, propose_interpreters
+
+__all__ = [
+    "Pep514PythonInfo",
+    "_run",
+    "discover_pythons",
+    "propose_interpreters",
+]
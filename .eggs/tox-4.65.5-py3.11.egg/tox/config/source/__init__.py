@@ -0,0 +1,9 @@
+from __future__ import annotations
+
+from .api import Source
+from .discover import discover_source
+
+__all__ = (
+    "Source",
+    "discover_source",
+)
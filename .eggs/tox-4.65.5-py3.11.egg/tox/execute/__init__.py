@@ -0,0 +1,11 @@
+"""Package that handles execution of commands within tox environments."""
+
+from __future__ import annotations
+
+from .api import Outcome
+from .request import ExecuteRequest
+
+__all__ = (
+    "ExecuteRequest",
+    "Outcome",
+)
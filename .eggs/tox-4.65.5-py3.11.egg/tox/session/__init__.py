@@ -0,0 +1,3 @@
+"""Package that handles execution of various commands within tox."""
+
+from __future__ import annotations
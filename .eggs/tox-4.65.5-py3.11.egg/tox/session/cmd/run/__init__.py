@@ -0,0 +1,3 @@
+"""Defines how we execute a tox environment."""
+
+from __future__ import annotations
@@ -0,0 +1,3 @@
+"""Package handling the creation and management of tox environments."""
+
+from __future__ import annotations
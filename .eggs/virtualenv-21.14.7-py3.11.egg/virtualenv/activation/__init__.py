@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+from .bash import BashActivator
+from .batch import BatchActivator
+from .cshell import CShellActivator
+from .fish import FishActivator
+from .nushell import NushellActivator
+from .powershell import PowerShellActivator
+from .python import PythonActivator
+from .xonsh import XonshActivator
+
+__all__ = [
+    "BashActivator",
+    "BatchActivator",
+    "CShellActivator",
+    "FishActivator",
+    "NushellActivator",
+    "PowerShellActivator",
+    "PythonActivator",
+    "XonshActivator",
+]
@@ -0,0 +1 @@
+"python.exe" -m pydoc %*
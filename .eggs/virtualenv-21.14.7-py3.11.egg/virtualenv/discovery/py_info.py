@@ -0,0 +1,9 @@
+"""Backward-compatibility re-export — use ``python_discovery.PythonInfo`` directly."""
+
+from __future__ import annotations
+
+from python_discovery import PythonInfo
+
+__all__ = [
+    "PythonInfo",
+]
@@ -0,0 +1,11 @@
+from __future__ import annotations
+
+from .acquire import get_wheel, pip_wheel_env_run
+from .util import Version, Wheel
+
+__all__ = [
+    "Version",
+    "Wheel",
+    "get_wheel",
+    "pip_wheel_env_run",
+]
@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+from ._permission import make_exe, set_tree
+from ._sync import copy, copytree, ensure_dir, safe_delete, symlink
+from ._win import get_short_path_name
+
+__all__ = [
+    "copy",
+    "copytree",
+    "ensure_dir",
+    "get_short_path_name",
+    "make_exe",
+    "safe_delete",
+    "set_tree",
+    "symlink",
+]
@@ -2,3 +2,5 @@
 '''
 Atomic primitives for Python.
 '''
+
+from atomos._snapshot import snapshot  # noqa: F401
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+'''
+atomos._snapshot
+
+Consistent reads of several references at once.
+'''
+
+import time
+
+# The number of attempts after which a reader yields to other threads
+# between attempts, rather than spinning.
+_SPIN = 16
+
+
+def _reader(ref):
+    # Atomics provide `get_with_version`, atoms `deref_with_version`.
+    read = getattr(ref, 'get_with_version', None)
+    if read is None:
+        read = getattr(ref, 'deref_with_version', None)
+    if read is None:
+        raise TypeError('{0!r} has no version to snapshot'.format(ref))
+    return read
+
+
+def snapshot(*refs):
+    '''
+    Returns a tuple of the values of `refs`, atomics or atoms, as they were
+    at one and the same moment::
+
+        >>> requests, errors = atomos.snapshot(request_count, error_count)
+
+    Reading each in turn instead may yield values from different moments,
+    e.g. more errors than requests, should they change in between.
+
+    No lock is taken. Instead, the values are read along with their
+    versions, and the versions read again: if none changed, no ref changed
+    in between either, so that there was a moment when all of them held the
+    values read. Otherwise, the values are read anew. Writers are therefore
+    never blocked, while a reader retries for as long as writers keep it
+    from observing a moment without changes.
+
+    :param \\*refs: The refs to read. Each must provide `get_with_version`
+        or `deref_with_version`.
+    '''
+    readers = [_reader(ref) for ref in refs]
+    if len(readers) == 1:
+        return (readers[0]()[0],)
+
+    attempts = 0
+    while True:
+        collected = [read() for read in readers]
+        if all(read()[1] == version
+               for read, (_, version) in zip(readers, collected)):
+            return tuple(value for value, _ in collected)
+
+        attempts += 1
+        if attempts >= _SPIN:
+            time.sleep(0)
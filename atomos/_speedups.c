@@ -0,0 +1,1322 @@
+/*
+ * atomos._speedups
+ *
+ * Optional compiled implementations of AtomicInteger, AtomicLong and
+ * AtomicBoolean.
+ *
+ * Values are held in native 64-bit (respectively 32-bit) words and
+ * manipulated with the compiler's atomic builtins instead of a lock. As a
+ * result the integer types are bounded: an operation which would leave the
+ * signed 64-bit range raises OverflowError and leaves the value untouched.
+ *
+ * Each object also counts its writes in a version, bumped *after* the value
+ * is stored. A reader taking the version before and after the value, and
+ * retrying if the two differ, therefore never pairs a value with a version
+ * newer than it; at worst it pairs a new value with the version before it,
+ * which makes a poller see the same change twice, but never miss one. Unlike
+ * a seqlock this keeps writers free of any lock.
+ *
+ * Threads blocked in await_change park on a threading.Condition, which is
+ * only created once somebody waits. Writers signal it only while the count
+ * of waiters is non-zero, so that a write costs a single extra load when
+ * nobody waits. Waiters count themselves before checking the version and
+ * writers bump the version before checking the count, so that either the
+ * waiter sees the new version or the writer sees the waiter.
+ *
+ * atomos.atomic imports these types when the extension is available and
+ * otherwise falls back to its pure Python implementations.
+ */
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+#include <stddef.h>
+#include <stdint.h>
+
+#if defined(_MSC_VER)
+#include <intrin.h>
+
+static int64_t
+atomic_load64(volatile int64_t *p)
+{
+    return _InterlockedCompareExchange64((volatile __int64 *)p, 0, 0);
+}
+
+static int64_t
+atomic_exchange64(volatile int64_t *p, int64_t v)
+{
+    return _InterlockedExchange64((volatile __int64 *)p, v);
+}
+
+static void
+atomic_add64(volatile int64_t *p, int64_t v)
+{
+    _InterlockedExchangeAdd64((volatile __int64 *)p, v);
+}
+
+static PyObject *
+atomic_load_ptr(PyObject *volatile *p)
+{
+    return (PyObject *)_InterlockedCompareExchangePointer(
+        (void *volatile *)p, NULL, NULL);
+}
+
+static int
+atomic_cas_ptr(PyObject *volatile *p, PyObject **expected, PyObject *desired)
+{
+    PyObject *seen = (PyObject *)_InterlockedCompareExchangePointer(
+        (void *volatile *)p, desired, *expected);
+    if (seen == *expected) {
+        return 1;
+    }
+    *expected = seen;
+    return 0;
+}
+
+static int
+atomic_cas64(volatile int64_t *p, int64_t *expected, int64_t desired)
+{
+    int64_t seen = _InterlockedCompareExchange64((volatile __int64 *)p,
+                                                 desired, *expected);
+    if (seen == *expected) {
+        return 1;
+    }
+    *expected = seen;
+    return 0;
+}
+
+static long
+atomic_load32(volatile long *p)
+{
+    return _InterlockedCompareExchange(p, 0, 0);
+}
+
+static long
+atomic_exchange32(volatile long *p, long v)
+{
+    return _InterlockedExchange(p, v);
+}
+
+static int
+atomic_cas32(volatile long *p, long *expected, long desired)
+{
+    long seen = _InterlockedCompareExchange(p, desired, *expected);
+    if (seen == *expected) {
+        return 1;
+    }
+    *expected = seen;
+    return 0;
+}
+
+typedef long flag_t;
+#else
+#define atomic_load64(p) __atomic_load_n((p), __ATOMIC_SEQ_CST)
+#define atomic_exchange64(p, v) __atomic_exchange_n((p), (v), __ATOMIC_SEQ_CST)
+#define atomic_add64(p, v) __atomic_add_fetch((p), (v), __ATOMIC_SEQ_CST)
+#define atomic_load_ptr atomic_load64
+#define atomic_cas_ptr atomic_cas64
+#define atomic_cas64(p, e, d) \
+    __atomic_compare_exchange_n((p), (e), (d), 0, __ATOMIC_SEQ_CST, \
+                                __ATOMIC_SEQ_CST)
+#define atomic_load32 atomic_load64
+#define atomic_exchange32 atomic_exchange64
+#define atomic_cas32 atomic_cas64
+
+typedef int32_t flag_t;
+#endif
+
+
+/* Overflow checked arithmetic, returning non-zero on overflow. */
+static int
+checked_add(int64_t a, int64_t b, int64_t *result)
+{
+    if ((b > 0 && a > INT64_MAX - b) || (b < 0 && a < INT64_MIN - b)) {
+        return 1;
+    }
+    *result = a + b;
+    return 0;
+}
+
+static int
+checked_sub(int64_t a, int64_t b, int64_t *result)
+{
+    if ((b < 0 && a > INT64_MAX + b) || (b > 0 && a < INT64_MIN + b)) {
+        return 1;
+    }
+    *result = a - b;
+    return 0;
+}
+
+
+/*
+ * Versions and waiting for changes, shared by all types
+ */
+
+typedef struct {
+    volatile int64_t version;
+    volatile int64_t waiters;
+    PyObject *volatile changed;
+} change_t;
+
+/* threading.Condition, time.monotonic, atomos.util.wait_until and the pure
+ * Python implementations, looked up when first needed. */
+static PyObject *condition_type;
+static PyObject *monotonic;
+static PyObject *util_wait_until;
+static PyObject *py_atomic_integer;
+static PyObject *py_atomic_long;
+static PyObject *py_atomic_boolean;
+
+static PyObject *
+lookup(PyObject **cache, const char *module, const char *name)
+{
+    PyObject *m, *obj;
+
+    obj = atomic_load_ptr(cache);
+    if (obj != NULL) {
+        return obj;
+    }
+    m = PyImport_ImportModule(module);
+    if (m == NULL) {
+        return NULL;
+    }
+    obj = PyObject_GetAttrString(m, name);
+    Py_DECREF(m);
+    if (obj == NULL) {
+        return NULL;
+    }
+    {
+        PyObject *expected = NULL;
+        if (!atomic_cas_ptr(cache, &expected, obj)) {
+            Py_DECREF(obj);
+            obj = expected;
+        }
+    }
+    return obj;
+}
+
+/* Returns a borrowed reference to the condition, creating it if needed. */
+static PyObject *
+get_condition(change_t *change)
+{
+    PyObject *cls, *cond, *expected = NULL;
+
+    cond = atomic_load_ptr(&change->changed);
+    if (cond != NULL) {
+        return cond;
+    }
+    cls = lookup(&condition_type, "threading", "Condition");
+    if (cls == NULL) {
+        return NULL;
+    }
+    cond = PyObject_CallObject(cls, NULL);
+    if (cond == NULL) {
+        return NULL;
+    }
+    if (!atomic_cas_ptr(&change->changed, &expected, cond)) {
+        Py_DECREF(cond);
+        cond = expected;
+    }
+    return cond;
+}
+
+static PyObject *
+call_method(PyObject *obj, const char *name, PyObject *arg)
+{
+    if (arg == NULL) {
+        return PyObject_CallMethod(obj, name, NULL);
+    }
+    return PyObject_CallMethod(obj, name, "O", arg);
+}
+
+static void
+notify_change(change_t *change)
+{
+    PyObject *cond = atomic_load_ptr(&change->changed);
+    PyObject *r;
+
+    if (cond == NULL) {
+        return;
+    }
+    r = call_method(cond, "acquire", NULL);
+    if (r == NULL) {
+        goto error;
+    }
+    Py_DECREF(r);
+    r = call_method(cond, "notify_all", NULL);
+    Py_XDECREF(r);
+    if (r == NULL) {
+        PyObject *type, *value, *tb;
+        PyErr_Fetch(&type, &value, &tb);
+        Py_XDECREF(call_method(cond, "release", NULL));
+        PyErr_Restore(type, value, tb);
+        goto error;
+    }
+    r = call_method(cond, "release", NULL);
+    if (r == NULL) {
+        goto error;
+    }
+    Py_DECREF(r);
+    return;
+
+error:
+    /* The write itself has happened, so the failure to wake the waiters
+     * cannot be reported to the writer. */
+    PyErr_WriteUnraisable(cond);
+}
+
+/* Called after every write. */
+static void
+signal_change(change_t *change)
+{
+    atomic_add64(&change->version, 1);
+    if (atomic_load64(&change->waiters)) {
+        notify_change(change);
+    }
+}
+
+static double
+now(void)
+{
+    PyObject *fn = lookup(&monotonic, "time", "monotonic");
+    PyObject *t;
+    double result;
+
+    if (fn == NULL) {
+        return -1.0;
+    }
+    t = PyObject_CallObject(fn, NULL);
+    if (t == NULL) {
+        return -1.0;
+    }
+    result = PyFloat_AsDouble(t);
+    Py_DECREF(t);
+    return result;
+}
+
+/* Blocks until the version differs from `since`, or `timeout` (a number of
+ * seconds or None) passes. Returns 1 if it changed, 0 on timeout and -1 with
+ * an exception set on failure. */
+static int
+wait_for_change(change_t *change, int64_t since, PyObject *timeout)
+{
+    PyObject *cond, *r, *type, *value, *tb;
+    double deadline = 0.0;
+    int result;
+
+    cond = get_condition(change);
+    if (cond == NULL) {
+        return -1;
+    }
+    if (timeout != Py_None) {
+        double t = PyFloat_AsDouble(timeout), start;
+        if (t == -1.0 && PyErr_Occurred()) {
+            return -1;
+        }
+        start = now();
+        if (start == -1.0 && PyErr_Occurred()) {
+            return -1;
+        }
+        deadline = start + t;
+    }
+
+    atomic_add64(&change->waiters, 1);
+    r = call_method(cond, "acquire", NULL);
+    if (r == NULL) {
+        atomic_add64(&change->waiters, -1);
+        return -1;
+    }
+    Py_DECREF(r);
+
+    for (;;) {
+        if (atomic_load64(&change->version) != since) {
+            result = 1;
+            break;
+        }
+        if (timeout == Py_None) {
+            r = call_method(cond, "wait", NULL);
+        }
+        else {
+            double remaining = deadline - now();
+            PyObject *arg;
+            if (PyErr_Occurred()) {
+                result = -1;
+                break;
+            }
+            if (remaining <= 0.0) {
+                result = 0;
+                break;
+            }
+            arg = PyFloat_FromDouble(remaining);
+            if (arg == NULL) {
+                result = -1;
+                break;
+            }
+            r = call_method(cond, "wait", arg);
+            Py_DECREF(arg);
+        }
+        if (r == NULL) {
+            result = -1;
+            break;
+        }
+        Py_DECREF(r);
+    }
+
+    PyErr_Fetch(&type, &value, &tb);
+    r = call_method(cond, "release", NULL);
+    if (r == NULL) {
+        if (type == NULL) {
+            result = -1;
+            PyErr_Fetch(&type, &value, &tb);
+        }
+        else {
+            PyErr_Clear();
+        }
+    }
+    Py_XDECREF(r);
+    PyErr_Restore(type, value, tb);
+    atomic_add64(&change->waiters, -1);
+    return result;
+}
+
+static int
+parse_await_change(PyObject *args, PyObject *kwargs, int64_t *since,
+                   PyObject **timeout)
+{
+    static char *kwlist[] = {"since_version", "timeout", NULL};
+    long long v;
+
+    *timeout = Py_None;
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "L|O:await_change", kwlist,
+                                     &v, timeout)) {
+        return -1;
+    }
+    *since = (int64_t)v;
+    return 0;
+}
+
+/* Implements wait_until with atomos.util.wait_until, by way of the object's
+ * own get_with_version and await_change. */
+static PyObject *
+wait_until(PyObject *self, PyObject *args, PyObject *kwargs)
+{
+    static char *kwlist[] = {"pred", "timeout", NULL};
+    PyObject *pred, *timeout = Py_None, *fn, *get, *await_, *result = NULL;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "O|O:wait_until", kwlist,
+                                     &pred, &timeout)) {
+        return NULL;
+    }
+    fn = lookup(&util_wait_until, "atomos.util", "wait_until");
+    if (fn == NULL) {
+        return NULL;
+    }
+    get = PyObject_GetAttrString(self, "get_with_version");
+    await_ = PyObject_GetAttrString(self, "await_change");
+    if (get != NULL && await_ != NULL) {
+        result = PyObject_CallFunctionObjArgs(fn, get, await_, pred, timeout,
+                                              NULL);
+    }
+    Py_XDECREF(get);
+    Py_XDECREF(await_);
+    return result;
+}
+
+
+/* Builds the `(value, version)` tuple of get_with_version, stealing the
+ * reference to `value`. */
+static PyObject *
+value_with_version(PyObject *value, int64_t version)
+{
+    if (value == NULL) {
+        return NULL;
+    }
+    return Py_BuildValue("(NL)", value, (long long)version);
+}
+
+/* Parses the `since_version` argument of get_if_changed. */
+static int
+as_version(PyObject *obj, int64_t *result)
+{
+    long long v = PyLong_AsLongLong(obj);
+
+    if (v == -1 && PyErr_Occurred()) {
+        return -1;
+    }
+    *result = (int64_t)v;
+    return 0;
+}
+
+/* The parameter names of the methods taking arguments, which are those of the
+ * pure Python implementations, so that either accepts them by keyword. */
+static const char *const since_names[] = {"since_version"};
+static const char *const value_names[] = {"value"};
+static const char *const delta_names[] = {"delta"};
+static const char *const cas_names[] = {"expect", "update"};
+
+/* Parses the arguments of a METH_FASTCALL | METH_KEYWORDS method whose `n`
+ * parameters, none of them optional, are named by `names`, into `out`.
+ * Returns -1 with an exception set on failure. */
+static int
+parse_args(const char *fname, PyObject *const *args, Py_ssize_t nargs,
+           PyObject *kwnames, const char *const *names, Py_ssize_t n,
+           PyObject **out)
+{
+    Py_ssize_t i, k, nkw;
+
+    if (kwnames == NULL && nargs == n) {
+        for (i = 0; i < n; i++) {
+            out[i] = args[i];
+        }
+        return 0;
+    }
+    if (nargs > n) {
+        PyErr_Format(PyExc_TypeError,
+                     "%s() takes %zd positional argument%s but %zd were "
+                     "given", fname, n, n == 1 ? "" : "s", nargs);
+        return -1;
+    }
+    for (i = 0; i < n; i++) {
+        out[i] = i < nargs ? args[i] : NULL;
+    }
+    nkw = kwnames == NULL ? 0 : PyTuple_GET_SIZE(kwnames);
+    for (k = 0; k < nkw; k++) {
+        PyObject *key = PyTuple_GET_ITEM(kwnames, k);
+
+        for (i = 0; i < n; i++) {
+            if (PyUnicode_CompareWithASCIIString(key, names[i]) == 0) {
+                break;
+            }
+        }
+        if (i == n) {
+            PyErr_Format(PyExc_TypeError,
+                         "%s() got an unexpected keyword argument '%U'",
+                         fname, key);
+            return -1;
+        }
+        if (out[i] != NULL) {
+            PyErr_Format(PyExc_TypeError,
+                         "%s() got multiple values for argument '%s'",
+                         fname, names[i]);
+            return -1;
+        }
+        out[i] = args[nargs + k];
+    }
+    for (i = 0; i < n; i++) {
+        if (out[i] == NULL) {
+            PyErr_Format(PyExc_TypeError,
+                         "%s() missing required argument '%s'", fname,
+                         names[i]);
+            return -1;
+        }
+    }
+    return 0;
+}
+
+
+/* Implements tp_new. The compiled types take no lock, so they cannot honour a
+ * `lock_type`: given one, the pure Python implementation named `py_name` is
+ * constructed instead. Subclasses, which that would not be an instance of,
+ * raise TypeError. */
+static PyObject *
+new_or_fallback(PyTypeObject *type, PyObject *args, PyObject *kwargs,
+                PyTypeObject *exact, PyObject **cache, const char *py_name)
+{
+    PyObject *lock_type = NULL, *cls;
+
+    if (kwargs != NULL) {
+        lock_type = PyDict_GetItemString(kwargs, "lock_type");
+    }
+    if (lock_type == NULL && PyTuple_GET_SIZE(args) > 1) {
+        lock_type = PyTuple_GET_ITEM(args, 1);
+    }
+    if (lock_type == NULL || lock_type == Py_None) {
+        return PyType_GenericNew(type, args, kwargs);
+    }
+    if (type != exact) {
+        PyErr_Format(PyExc_TypeError,
+                     "%s does not support lock_type, as it takes no lock",
+                     type->tp_name);
+        return NULL;
+    }
+    cls = lookup(cache, "atomos.atomic", py_name);
+    if (cls == NULL) {
+        return NULL;
+    }
+    return PyObject_Call(cls, args, kwargs);
+}
+
+
+/* Formats `<atomos.atomic.Name(value) object at 0x...>`, as util.repr does. */
+static PyObject *
+format_repr(PyObject *self, PyObject *value)
+{
+    const char *name = Py_TYPE(self)->tp_name;
+    const char *dot = strrchr(name, '.');
+    PyObject *result;
+
+    if (value == NULL) {
+        return NULL;
+    }
+    if (dot != NULL) {
+        name = dot + 1;
+    }
+    result = PyUnicode_FromFormat("<atomos.atomic.%s(%R) object at %p>",
+                                  name, value, self);
+    Py_DECREF(value);
+    return result;
+}
+
+
+/*
+ * AtomicInteger and AtomicLong
+ */
+
+typedef struct {
+    PyObject_HEAD
+    volatile int64_t value;
+    change_t change;
+    PyObject *weakreflist;
+} AtomicInt64Object;
+
+static PyTypeObject AtomicInteger_Type;
+static PyTypeObject AtomicLong_Type;
+
+/* Converts `obj` to an int64_t, raising TypeError when it is not an int. */
+static int
+as_int64(PyObject *self, PyObject *obj, const char *what, int64_t *result)
+{
+    long long v;
+
+    if (!PyLong_Check(obj)) {
+        PyErr_Format(PyExc_TypeError, "%s must be of type %s", what,
+                     PyObject_TypeCheck(self, &AtomicLong_Type) ? "long"
+                                                                : "int");
+        return -1;
+    }
+    v = PyLong_AsLongLong(obj);
+    if (v == -1 && PyErr_Occurred()) {
+        return -1;
+    }
+    *result = (int64_t)v;
+    return 0;
+}
+
+static PyObject *
+int64_new(PyTypeObject *type, PyObject *args, PyObject *kwargs)
+{
+    if (PyType_IsSubtype(type, &AtomicLong_Type)) {
+        return new_or_fallback(type, args, kwargs, &AtomicLong_Type,
+                               &py_atomic_long, "_PyAtomicLong");
+    }
+    return new_or_fallback(type, args, kwargs, &AtomicInteger_Type,
+                           &py_atomic_integer, "_PyAtomicInteger");
+}
+
+static int
+int64_init(AtomicInt64Object *self, PyObject *args, PyObject *kwargs)
+{
+    /* A `lock_type` other than None never gets here, see int64_new. */
+    static char *kwlist[] = {"value", "lock_type", NULL};
+    PyObject *value = NULL, *lock_type = NULL;
+    int64_t v = 0;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "|OO", kwlist, &value,
+                                     &lock_type)) {
+        return -1;
+    }
+    if (value != NULL && as_int64((PyObject *)self, value, "_value", &v) < 0) {
+        return -1;
+    }
+    atomic_exchange64(&self->value, v);
+    return 0;
+}
+
+static void
+int64_dealloc(AtomicInt64Object *self)
+{
+    if (self->weakreflist != NULL) {
+        PyObject_ClearWeakRefs((PyObject *)self);
+    }
+    Py_XDECREF(self->change.changed);
+    Py_TYPE(self)->tp_free((PyObject *)self);
+}
+
+static PyObject *
+int64_repr(AtomicInt64Object *self)
+{
+    return format_repr((PyObject *)self,
+                       PyLong_FromLongLong(atomic_load64(&self->value)));
+}
+
+static PyObject *
+int64_get(AtomicInt64Object *self, PyObject *Py_UNUSED(ignored))
+{
+    return PyLong_FromLongLong(atomic_load64(&self->value));
+}
+
+static PyObject *
+int64_get_version(AtomicInt64Object *self, PyObject *Py_UNUSED(ignored))
+{
+    return PyLong_FromLongLong(atomic_load64(&self->change.version));
+}
+
+/* Reads the value and its version consistently, see the top of this file. */
+static void
+int64_read(AtomicInt64Object *self, int64_t *value, int64_t *version)
+{
+    int64_t before;
+
+    do {
+        before = atomic_load64(&self->change.version);
+        *value = atomic_load64(&self->value);
+        *version = atomic_load64(&self->change.version);
+    } while (before != *version);
+}
+
+static PyObject *
+int64_get_with_version(AtomicInt64Object *self, PyObject *Py_UNUSED(ignored))
+{
+    int64_t value, version;
+
+    int64_read(self, &value, &version);
+    return value_with_version(PyLong_FromLongLong(value), version);
+}
+
+static PyObject *
+int64_get_if_changed(AtomicInt64Object *self, PyObject *const *args,
+                     Py_ssize_t nargs, PyObject *kwnames)
+{
+    PyObject *since;
+    int64_t value, version, since_version;
+
+    if (parse_args("get_if_changed", args, nargs, kwnames, since_names, 1,
+                   &since) < 0 ||
+            as_version(since, &since_version) < 0) {
+        return NULL;
+    }
+    int64_read(self, &value, &version);
+    if (version == since_version) {
+        Py_RETURN_NONE;
+    }
+    return value_with_version(PyLong_FromLongLong(value), version);
+}
+
+static PyObject *
+int64_await_change(AtomicInt64Object *self, PyObject *args, PyObject *kwargs)
+{
+    int64_t value;
+    int64_t version, since;
+    PyObject *timeout;
+    int changed;
+
+    if (parse_await_change(args, kwargs, &since, &timeout) < 0) {
+        return NULL;
+    }
+    changed = wait_for_change(&self->change, since, timeout);
+    if (changed < 0) {
+        return NULL;
+    }
+    if (!changed) {
+        Py_RETURN_NONE;
+    }
+    int64_read(self, &value, &version);
+    return value_with_version(PyLong_FromLongLong(value), version);
+}
+
+static PyObject *
+int64_set(AtomicInt64Object *self, PyObject *const *args,
+          Py_ssize_t nargs, PyObject *kwnames)
+{
+    PyObject *value;
+    int64_t v;
+
+    if (parse_args("set", args, nargs, kwnames, value_names, 1,
+                   &value) < 0 ||
+            as_int64((PyObject *)self, value, "_value", &v) < 0) {
+        return NULL;
+    }
+    atomic_exchange64(&self->value, v);
+    signal_change(&self->change);
+    Py_INCREF(value);
+    return value;
+}
+
+static PyObject *
+int64_get_and_set(AtomicInt64Object *self, PyObject *const *args,
+                  Py_ssize_t nargs, PyObject *kwnames)
+{
+    PyObject *value;
+    int64_t v;
+
+    if (parse_args("get_and_set", args, nargs, kwnames, value_names, 1,
+                   &value) < 0 ||
+            as_int64((PyObject *)self, value, "_value", &v) < 0) {
+        return NULL;
+    }
+    v = atomic_exchange64(&self->value, v);
+    signal_change(&self->change);
+    return PyLong_FromLongLong(v);
+}
+
+static PyObject *
+int64_compare_and_set(AtomicInt64Object *self, PyObject *const *args,
+                      Py_ssize_t nargs, PyObject *kwnames)
+{
+    PyObject *params[2], *expect, *update;
+    int64_t desired, current;
+    long long e;
+    int overflow;
+
+    if (parse_args("compare_and_set", args, nargs, kwnames, cas_names, 2,
+                   params) < 0) {
+        return NULL;
+    }
+    expect = params[0];
+    update = params[1];
+    if (as_int64((PyObject *)self, update, "_value", &desired) < 0) {
+        return NULL;
+    }
+
+    if (PyLong_Check(expect)) {
+        e = PyLong_AsLongLongAndOverflow(expect, &overflow);
+        if (e == -1 && PyErr_Occurred()) {
+            return NULL;
+        }
+        if (overflow) {
+            Py_RETURN_FALSE;
+        }
+        current = (int64_t)e;
+        if (atomic_cas64(&self->value, &current, desired)) {
+            signal_change(&self->change);
+            Py_RETURN_TRUE;
+        }
+        Py_RETURN_FALSE;
+    }
+
+    /* Any other type is compared by equality, as the pure Python version
+     * does. Should the value change in the meantime, compare again. */
+    current = atomic_load64(&self->value);
+    for (;;) {
+        PyObject *cur = PyLong_FromLongLong(current);
+        int eq;
+
+        if (cur == NULL) {
+            return NULL;
+        }
+        eq = PyObject_RichCompareBool(cur, expect, Py_EQ);
+        Py_DECREF(cur);
+        if (eq < 0) {
+            return NULL;
+        }
+        if (!eq) {
+            Py_RETURN_FALSE;
+        }
+        if (atomic_cas64(&self->value, &current, desired)) {
+            signal_change(&self->change);
+            Py_RETURN_TRUE;
+        }
+    }
+}
+
+/* Applies `delta` with a compare-and-swap loop, storing the old and new
+ * values. Returns -1 with an exception set on failure. */
+static int
+int64_apply(AtomicInt64Object *self, PyObject *delta_obj, int subtract,
+            int64_t *oldval, int64_t *newval)
+{
+    int64_t delta, current, next;
+
+    if (as_int64((PyObject *)self, delta_obj, "delta", &delta) < 0) {
+        return -1;
+    }
+    current = atomic_load64(&self->value);
+    do {
+        if (subtract ? checked_sub(current, delta, &next)
+                     : checked_add(current, delta, &next)) {
+            PyErr_Format(PyExc_OverflowError,
+                         "%s value out of 64-bit range",
+                         Py_TYPE(self)->tp_name);
+            return -1;
+        }
+    } while (!atomic_cas64(&self->value, &current, next));
+    signal_change(&self->change);
+    *oldval = current;
+    *newval = next;
+    return 0;
+}
+
+static PyObject *
+int64_add_and_get(AtomicInt64Object *self, PyObject *const *args,
+                  Py_ssize_t nargs, PyObject *kwnames)
+{
+    PyObject *delta;
+    int64_t oldval, newval;
+
+    if (parse_args("add_and_get", args, nargs, kwnames, delta_names, 1,
+                   &delta) < 0 ||
+            int64_apply(self, delta, 0, &oldval, &newval) < 0) {
+        return NULL;
+    }
+    return PyLong_FromLongLong(newval);
+}
+
+static PyObject *
+int64_get_and_add(AtomicInt64Object *self, PyObject *const *args,
+                  Py_ssize_t nargs, PyObject *kwnames)
+{
+    PyObject *delta;
+    int64_t oldval, newval;
+
+    if (parse_args("get_and_add", args, nargs, kwnames, delta_names, 1,
+                   &delta) < 0 ||
+            int64_apply(self, delta, 0, &oldval, &newval) < 0) {
+        return NULL;
+    }
+    return PyLong_FromLongLong(oldval);
+}
+
+static PyObject *
+int64_subtract_and_get(AtomicInt64Object *self, PyObject *const *args,
+                       Py_ssize_t nargs, PyObject *kwnames)
+{
+    PyObject *delta;
+    int64_t oldval, newval;
+
+    if (parse_args("subtract_and_get", args, nargs, kwnames, delta_names, 1,
+                   &delta) < 0 ||
+            int64_apply(self, delta, 1, &oldval, &newval) < 0) {
+        return NULL;
+    }
+    return PyLong_FromLongLong(newval);
+}
+
+static PyObject *
+int64_get_and_subtract(AtomicInt64Object *self, PyObject *const *args,
+                       Py_ssize_t nargs, PyObject *kwnames)
+{
+    PyObject *delta;
+    int64_t oldval, newval;
+
+    if (parse_args("get_and_subtract", args, nargs, kwnames, delta_names, 1,
+                   &delta) < 0 ||
+            int64_apply(self, delta, 1, &oldval, &newval) < 0) {
+        return NULL;
+    }
+    return PyLong_FromLongLong(oldval);
+}
+
+static PyMethodDef int64_methods[] = {
+    {"get", (PyCFunction)int64_get, METH_NOARGS,
+     "Returns the value."},
+    {"get_version", (PyCFunction)int64_get_version, METH_NOARGS,
+     "Returns the version, which is bumped by every write."},
+    {"get_with_version", (PyCFunction)int64_get_with_version, METH_NOARGS,
+     "Returns a tuple of the value and its version."},
+    {"get_if_changed", (PyCFunction)(void (*)(void))int64_get_if_changed,
+     METH_FASTCALL | METH_KEYWORDS,
+     "Returns a tuple of the value and its version if the version differs\n"
+     "from `since_version`, otherwise `None`.\n\n"
+     ":param since_version: The version last seen by the caller."},
+    {"await_change", (PyCFunction)(void (*)(void))int64_await_change,
+     METH_VARARGS | METH_KEYWORDS,
+     "Blocks until the version differs from `since_version`, then returns a\n"
+     "tuple of the value and its version. Returns `None` if `timeout`\n"
+     "seconds pass first.\n\n"
+     ":param since_version: The version last seen by the caller.\n"
+     ":param timeout: The longest time to wait, in seconds, or `None` to\n"
+     "    wait indefinitely."},
+    {"wait_until", (PyCFunction)(void (*)(void))wait_until,
+     METH_VARARGS | METH_KEYWORDS,
+     "Blocks until `pred`, called with the value, returns true. Returns\n"
+     "`True` once it does, or `False` if `timeout` seconds pass first.\n\n"
+     ":param pred: A function which will be passed the value.\n"
+     ":param timeout: The longest time to wait, in seconds, or `None` to\n"
+     "    wait indefinitely."},
+    {"set", (PyCFunction)(void (*)(void))int64_set,
+     METH_FASTCALL | METH_KEYWORDS,
+     "Atomically sets the value to `value`.\n\n"
+     ":param value: The value to set."},
+    {"get_and_set", (PyCFunction)(void (*)(void))int64_get_and_set,
+     METH_FASTCALL | METH_KEYWORDS,
+     "Atomically sets the value to `value` and returns the old value.\n\n"
+     ":param value: The value to set."},
+    {"compare_and_set", (PyCFunction)(void (*)(void))int64_compare_and_set,
+     METH_FASTCALL | METH_KEYWORDS,
+     "Atomically sets the value to `update` if the current value is equal "
+     "to\n`expect`.\n\n"
+     ":param expect: The expected current value.\n"
+     ":param update: The value to set if and only if `expect` equals the\n"
+     "    current value."},
+    {"add_and_get", (PyCFunction)(void (*)(void))int64_add_and_get,
+     METH_FASTCALL | METH_KEYWORDS,
+     "Atomically adds `delta` to the current value.\n\n"
+     ":param delta: The delta to add."},
+    {"get_and_add", (PyCFunction)(void (*)(void))int64_get_and_add,
+     METH_FASTCALL | METH_KEYWORDS,
+     "Atomically adds `delta` to the current value and returns the old "
+     "value.\n\n"
+     ":param delta: The delta to add."},
+    {"subtract_and_get", (PyCFunction)(void (*)(void))int64_subtract_and_get,
+     METH_FASTCALL | METH_KEYWORDS,
+     "Atomically subtracts `delta` from the current value.\n\n"
+     ":param delta: The delta to subtract."},
+    {"get_and_subtract", (PyCFunction)(void (*)(void))int64_get_and_subtract,
+     METH_FASTCALL | METH_KEYWORDS,
+     "Atomically subtracts `delta` from the current value and returns the\n"
+     "old value.\n\n"
+     ":param delta: The delta to subtract."},
+    {NULL, NULL, 0, NULL}
+};
+
+#define INT64_TYPE(TYPENAME, NAME, DOC)                                    \
+static PyTypeObject TYPENAME = {                                           \
+    PyVarObject_HEAD_INIT(NULL, 0)                                         \
+    .tp_name = "atomos.atomic." NAME,                                      \
+    .tp_basicsize = sizeof(AtomicInt64Object),                             \
+    .tp_dealloc = (destructor)int64_dealloc,                               \
+    .tp_repr = (reprfunc)int64_repr,                                       \
+    .tp_flags = Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE,                  \
+    .tp_doc = DOC,                                                         \
+    .tp_weaklistoffset = offsetof(AtomicInt64Object, weakreflist),         \
+    .tp_methods = int64_methods,                                           \
+    .tp_init = (initproc)int64_init,                                       \
+    .tp_new = int64_new,                                                   \
+};
+
+INT64_TYPE(AtomicInteger_Type, "AtomicInteger",
+           "An integer value which allows atomic manipulation semantics.\n\n"
+           "This is the compiled implementation, which holds a signed 64-bit "
+           "value\nmanipulated with hardware atomics.")
+
+INT64_TYPE(AtomicLong_Type, "AtomicLong",
+           "A long value which allows atomic manipulation semantics.\n\n"
+           "This is the compiled implementation, which holds a signed 64-bit "
+           "value\nmanipulated with hardware atomics.")
+
+
+/*
+ * AtomicBoolean
+ */
+
+typedef struct {
+    PyObject_HEAD
+    volatile flag_t value;
+    change_t change;
+    PyObject *weakreflist;
+} AtomicBooleanObject;
+
+static int
+as_flag(PyObject *obj, flag_t *result)
+{
+    if (!PyBool_Check(obj)) {
+        PyErr_SetString(PyExc_TypeError, "_value must be of type bool");
+        return -1;
+    }
+    *result = obj == Py_True;
+    return 0;
+}
+
+static PyTypeObject AtomicBoolean_Type;
+
+static PyObject *
+bool_new(PyTypeObject *type, PyObject *args, PyObject *kwargs)
+{
+    return new_or_fallback(type, args, kwargs, &AtomicBoolean_Type,
+                           &py_atomic_boolean, "_PyAtomicBoolean");
+}
+
+static int
+bool_init(AtomicBooleanObject *self, PyObject *args, PyObject *kwargs)
+{
+    /* A `lock_type` other than None never gets here, see bool_new. */
+    static char *kwlist[] = {"value", "lock_type", NULL};
+    PyObject *value = NULL, *lock_type = NULL;
+    flag_t v = 0;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "|OO", kwlist, &value,
+                                     &lock_type)) {
+        return -1;
+    }
+    if (value != NULL && as_flag(value, &v) < 0) {
+        return -1;
+    }
+    atomic_exchange32(&self->value, v);
+    return 0;
+}
+
+static void
+bool_dealloc(AtomicBooleanObject *self)
+{
+    if (self->weakreflist != NULL) {
+        PyObject_ClearWeakRefs((PyObject *)self);
+    }
+    Py_XDECREF(self->change.changed);
+    Py_TYPE(self)->tp_free((PyObject *)self);
+}
+
+static PyObject *
+bool_repr(AtomicBooleanObject *self)
+{
+    return format_repr((PyObject *)self,
+                       PyBool_FromLong(atomic_load32(&self->value)));
+}
+
+static PyObject *
+bool_get(AtomicBooleanObject *self, PyObject *Py_UNUSED(ignored))
+{
+    return PyBool_FromLong(atomic_load32(&self->value));
+}
+
+static PyObject *
+bool_get_version(AtomicBooleanObject *self, PyObject *Py_UNUSED(ignored))
+{
+    return PyLong_FromLongLong(atomic_load64(&self->change.version));
+}
+
+/* Reads the value and its version consistently, see the top of this file. */
+static void
+bool_read(AtomicBooleanObject *self, flag_t *value, int64_t *version)
+{
+    int64_t before;
+
+    do {
+        before = atomic_load64(&self->change.version);
+        *value = atomic_load32(&self->value);
+        *version = atomic_load64(&self->change.version);
+    } while (before != *version);
+}
+
+static PyObject *
+bool_get_with_version(AtomicBooleanObject *self, PyObject *Py_UNUSED(ignored))
+{
+    flag_t value;
+    int64_t version;
+
+    bool_read(self, &value, &version);
+    return value_with_version(PyBool_FromLong(value), version);
+}
+
+static PyObject *
+bool_get_if_changed(AtomicBooleanObject *self, PyObject *const *args,
+                    Py_ssize_t nargs, PyObject *kwnames)
+{
+    PyObject *since;
+    flag_t value;
+    int64_t version, since_version;
+
+    if (parse_args("get_if_changed", args, nargs, kwnames, since_names, 1,
+                   &since) < 0 ||
+            as_version(since, &since_version) < 0) {
+        return NULL;
+    }
+    bool_read(self, &value, &version);
+    if (version == since_version) {
+        Py_RETURN_NONE;
+    }
+    return value_with_version(PyBool_FromLong(value), version);
+}
+
+static PyObject *
+bool_await_change(AtomicBooleanObject *self, PyObject *args, PyObject *kwargs)
+{
+    flag_t value;
+    int64_t version, since;
+    PyObject *timeout;
+    int changed;
+
+    if (parse_await_change(args, kwargs, &since, &timeout) < 0) {
+        return NULL;
+    }
+    changed = wait_for_change(&self->change, since, timeout);
+    if (changed < 0) {
+        return NULL;
+    }
+    if (!changed) {
+        Py_RETURN_NONE;
+    }
+    bool_read(self, &value, &version);
+    return value_with_version(PyBool_FromLong(value), version);
+}
+
+static PyObject *
+bool_set(AtomicBooleanObject *self, PyObject *const *args,
+         Py_ssize_t nargs, PyObject *kwnames)
+{
+    PyObject *value;
+    flag_t v;
+
+    if (parse_args("set", args, nargs, kwnames, value_names, 1,
+                   &value) < 0 ||
+            as_flag(value, &v) < 0) {
+        return NULL;
+    }
+    atomic_exchange32(&self->value, v);
+    signal_change(&self->change);
+    Py_INCREF(value);
+    return value;
+}
+
+static PyObject *
+bool_get_and_set(AtomicBooleanObject *self, PyObject *const *args,
+                 Py_ssize_t nargs, PyObject *kwnames)
+{
+    PyObject *value;
+    flag_t v;
+
+    if (parse_args("get_and_set", args, nargs, kwnames, value_names, 1,
+                   &value) < 0 ||
+            as_flag(value, &v) < 0) {
+        return NULL;
+    }
+    v = atomic_exchange32(&self->value, v);
+    signal_change(&self->change);
+    return PyBool_FromLong(v);
+}
+
+static PyObject *
+bool_compare_and_set(AtomicBooleanObject *self, PyObject *const *args,
+                     Py_ssize_t nargs, PyObject *kwnames)
+{
+    PyObject *params[2], *expect, *update;
+    flag_t desired, current;
+
+    if (parse_args("compare_and_set", args, nargs, kwnames, cas_names, 2,
+                   params) < 0) {
+        return NULL;
+    }
+    expect = params[0];
+    update = params[1];
+    if (as_flag(update, &desired) < 0) {
+        return NULL;
+    }
+
+    current = atomic_load32(&self->value);
+    for (;;) {
+        int eq = PyObject_RichCompareBool(current ? Py_True : Py_False,
+                                          expect, Py_EQ);
+        if (eq < 0) {
+            return NULL;
+        }
+        if (!eq) {
+            Py_RETURN_FALSE;
+        }
+        if (atomic_cas32(&self->value, &current, desired)) {
+            signal_change(&self->change);
+            Py_RETURN_TRUE;
+        }
+    }
+}
+
+static PyMethodDef bool_methods[] = {
+    {"get", (PyCFunction)bool_get, METH_NOARGS,
+     "Returns the value."},
+    {"get_version", (PyCFunction)bool_get_version, METH_NOARGS,
+     "Returns the version, which is bumped by every write."},
+    {"get_with_version", (PyCFunction)bool_get_with_version, METH_NOARGS,
+     "Returns a tuple of the value and its version."},
+    {"get_if_changed", (PyCFunction)(void (*)(void))bool_get_if_changed,
+     METH_FASTCALL | METH_KEYWORDS,
+     "Returns a tuple of the value and its version if the version differs\n"
+     "from `since_version`, otherwise `None`.\n\n"
+     ":param since_version: The version last seen by the caller."},
+    {"await_change", (PyCFunction)(void (*)(void))bool_await_change,
+     METH_VARARGS | METH_KEYWORDS,
+     "Blocks until the version differs from `since_version`, then returns a\n"
+     "tuple of the value and its version. Returns `None` if `timeout`\n"
+     "seconds pass first.\n\n"
+     ":param since_version: The version last seen by the caller.\n"
+     ":param timeout: The longest time to wait, in seconds, or `None` to\n"
+     "    wait indefinitely."},
+    {"wait_until", (PyCFunction)(void (*)(void))wait_until,
+     METH_VARARGS | METH_KEYWORDS,
+     "Blocks until `pred`, called with the value, returns true. Returns\n"
+     "`True` once it does, or `False` if `timeout` seconds pass first.\n\n"
+     ":param pred: A function which will be passed the value.\n"
+     ":param timeout: The longest time to wait, in seconds, or `None` to\n"
+     "    wait indefinitely."},
+    {"set", (PyCFunction)(void (*)(void))bool_set,
+     METH_FASTCALL | METH_KEYWORDS,
+     "Atomically sets the value to `value`.\n\n"
+     ":param value: The value to set."},
+    {"get_and_set", (PyCFunction)(void (*)(void))bool_get_and_set,
+     METH_FASTCALL | METH_KEYWORDS,
+     "Atomically sets the value to `value` and returns the old value.\n\n"
+     ":param value: The value to set."},
+    {"compare_and_set", (PyCFunction)(void (*)(void))bool_compare_and_set,
+     METH_FASTCALL | METH_KEYWORDS,
+     "Atomically sets the value to `update` if the current value is equal "
+     "to\n`expect`.\n\n"
+     ":param expect: The expected current value.\n"
+     ":param update: The value to set if and only if `expect` equals the\n"
+     "    current value."},
+    {NULL, NULL, 0, NULL}
+};
+
+static PyTypeObject AtomicBoolean_Type = {
+    PyVarObject_HEAD_INIT(NULL, 0)
+    .tp_name = "atomos.atomic.AtomicBoolean",
+    .tp_basicsize = sizeof(AtomicBooleanObject),
+    .tp_dealloc = (destructor)bool_dealloc,
+    .tp_repr = (reprfunc)bool_repr,
+    .tp_flags = Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE,
+    .tp_doc = "A boolean value whichs allows atomic manipulation semantics."
+              "\n\nThis is the compiled implementation, which manipulates "
+              "its value with\nhardware atomics.",
+    .tp_weaklistoffset = offsetof(AtomicBooleanObject, weakreflist),
+    .tp_methods = bool_methods,
+    .tp_init = (initproc)bool_init,
+    .tp_new = bool_new,
+};
+
+
+static struct PyModuleDef speedups_module = {
+    PyModuleDef_HEAD_INIT,
+    "atomos._speedups",
+    "Compiled implementations of some of the atomic primitives.",
+    -1,
+    NULL,
+    NULL,
+    NULL,
+    NULL,
+    NULL,
+};
+
+PyMODINIT_FUNC
+PyInit__speedups(void)
+{
+    PyObject *m;
+
+    if (PyType_Ready(&AtomicInteger_Type) < 0 ||
+            PyType_Ready(&AtomicLong_Type) < 0 ||
+            PyType_Ready(&AtomicBoolean_Type) < 0) {
+        return NULL;
+    }
+
+    m = PyModule_Create(&speedups_module);
+    if (m == NULL) {
+        return NULL;
+    }
+#ifdef Py_GIL_DISABLED
+    PyUnstable_Module_SetGIL(m, Py_MOD_GIL_NOT_USED);
+#endif
+
+    Py_INCREF(&AtomicInteger_Type);
+    if (PyModule_AddObject(m, "AtomicInteger",
+                           (PyObject *)&AtomicInteger_Type) < 0) {
+        goto error;
+    }
+    Py_INCREF(&AtomicLong_Type);
+    if (PyModule_AddObject(m, "AtomicLong",
+                           (PyObject *)&AtomicLong_Type) < 0) {
+        goto error;
+    }
+    Py_INCREF(&AtomicBoolean_Type);
+    if (PyModule_AddObject(m, "AtomicBoolean",
+                           (PyObject *)&AtomicBoolean_Type) < 0) {
+        goto error;
+    }
+    return m;
+
+error:
+    Py_DECREF(m);
+    return NULL;
+}
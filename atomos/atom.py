@@ -6,11 +6,66 @@ Atom data type.
 '''
 
 import collections
+import threading
+import weakref
 
 import atomos.atomic as atomic
 import atomos.util as util
 
 
+def _get_in(state, path):
+    for key in path:
+        if state is None:
+            return None
+        state = state.get(key)
+    return state
+
+
+def _update_in(state, path, fn, *args, **kwargs):
+    # Copies only the containers along `path`, sharing everything else with
+    # `state`. Missing containers are created as dictionaries.
+    if not path:
+        return fn(state, *args, **kwargs)
+
+    key = path[0]
+    if state is None:
+        state = {}
+        child = None
+    else:
+        state = state.copy()
+        child = state.get(key)
+
+    state[key] = _update_in(child, path[1:], fn, *args, **kwargs)
+    return state
+
+
+def _assoc(_, value):
+    return value
+
+
+def _dissoc_in(state, path):
+    if not path:
+        raise ValueError('path must not be empty')
+
+    key = path[0]
+    if state is None or key not in state:
+        return state
+
+    if len(path) == 1:
+        state = state.copy()
+        del state[key]
+        return state
+
+    child = _dissoc_in(state[key], path[1:])
+    if child is state[key]:
+        # Nothing was removed, so the state must stay the same object, too.
+        return state
+
+    state = state.copy()
+    state[key] = child
+    return state
+
+
 class ARef(object):
     '''
     Ref object super type.
@@ -50,7 +105,12 @@ class ARef(object):
             wihtout copying as other watches may in turn be passed the same 
             eference!
         '''
-        self._watches[key] = fn
+        # The watches dictionary is copied on write, and never mutated once
+        # published, so that notifying watches needs neither a lock nor a
+        # copy of its own.
+        watches = self._watches.copy()
+        watches[key] = fn
+        self._watches = watches
 
     @util.synchronized
     def remove_watch(self, key):
@@ -59,7 +119,9 @@ class ARef(object):
 
         :param key: The key of the watch to remove.
         '''
-        self._watches.pop(key, None)
+        watches = self._watches.copy()
+        watches.pop(key, None)
+        self._watches = watches
 
     def notify_watches(self, oldval, newval):
         '''
@@ -69,10 +131,10 @@ class ARef(object):
         :param oldval: The old value which will be passed to the watch.
         :param newval: The new value which will be passed to the watch.
         '''
-        watches = self._watches.copy()
+        watches = self._watches
         for k in watches:
             fn = watches[k]
-            if isinstance(fn, collections.Callable):
+            if callable(fn):
                 fn(k, self, oldval, newval)
 
 
@@ -141,6 +203,9 @@ class Atom(ARef):
     def __init__(self, state):
         super(Atom, self).__init__()
         self._state = atomic.AtomicReference(state)
+        # Pending commutes, and the lock held by the thread combining them.
+        self._commutes = collections.deque()
+        self._combiner = threading.Lock()
 
     def __repr__(self):
         return util.repr(__name__, self, self._state._value)
@@ -151,6 +216,57 @@ class Atom(ARef):
         '''
         return self._state.get()
 
+    def deref_with_version(self):
+        '''
+        Returns a tuple of the value held and its version. The version is
+        bumped by every `swap`, `reset` and successful `compare_and_set`.
+        '''
+        return self._state.get_with_version()
+
+    def deref_if_changed(self, since_version):
+        '''
+        Returns a tuple of the value held and its version if the atom changed
+        since `since_version`, otherwise `None`. This lets a poller tell
+        whether anything changed by comparing versions rather than states::
+
+            >>> state, version = atom.deref_with_version()
+            >>> changed = atom.deref_if_changed(version)
+            >>> if changed is not None:
+            ...     state, version = changed
+
+        :param since_version: The version last seen by the caller.
+        '''
+        return self._state.get_if_changed(since_version)
+
+    def await_change(self, since_version, timeout=None):
+        '''
+        Blocks until the atom changes from `since_version`, then returns a
+        tuple of the value held and its version. Returns `None` if `timeout`
+        seconds pass first.
+
+        :param since_version: The version last seen by the caller.
+        :param timeout: The longest time to wait, in seconds, or `None` to
+            wait indefinitely.
+        '''
+        return self._state.await_change(since_version, timeout)
+
+    def wait_until(self, pred, timeout=None):
+        '''
+        Blocks until `pred`, called with the value held, returns true. Returns
+        `True` once it does, or `False` if `timeout` seconds pass first::
+
+            >>> state.wait_until(lambda s: s['active_conns'] == 0, timeout=5)
+
+        Waiting threads are woken by changes to the atom, rather than polling
+        it.
+
+        :param pred: A function which will be passed the value held.
+        :param timeout: The longest time to wait, in seconds, or `None` to
+            wait indefinitely.
+        '''
+        return util.wait_until(self.deref_with_version, self.await_change,
+                               pred, timeout)
+
     def swap(self, fn, *args, **kwargs):
         '''
         Given a mutator `fn`, calls `fn` with the atom's current state, `args`,
@@ -177,8 +293,7 @@ class Atom(ARef):
 
         :param newval: The new value to set.
         '''
-        oldval = self._state.get()
-        self._state.set(newval)
+        oldval = self._state.get_and_set(newval)
         self.notify_watches(oldval, newval)
         return newval
 
@@ -197,3 +312,353 @@ class Atom(ARef):
             self.notify_watches(oldval, newval)
 
         return ret
+
+    def commute(self, fn, *args, **kwargs):
+        '''
+        Like `swap`, calls `fn` with the atom's current state, `args`, and
+        `kwargs`, and makes the return value of this invocation the new
+        state. Unlike `swap`, `fn` must be commutative with respect to every
+        other function passed to `commute`, e.g. incrementing a counter or
+        adding to a set, so that such updates may be applied in any order.
+
+        This allows concurrent commutes to be combined: each is queued, and
+        one thread at a time, the combiner, applies all queued updates in
+        turn and sets the result as the new state with a single
+        compare-and-set. Concurrent commutes thereby amount to one state
+        transition, and one round of watch notifications, rather than
+        competing with each other and retrying. Returns the new state set by
+        the batch which included this update.
+
+        Should `fn` raise an exception, only this update is dropped from its
+        batch, and the exception is raised here.
+
+        :param fn: A commutative function which will be passed the current
+            state. Should return a new state. This absolutely *MUST NOT*
+            mutate the reference to the current state!
+        :param \\*args: Arguments to be passed to `fn`.
+        :param \\*\\*kwargs: Keyword arguments to be passed to `fn`.
+        '''
+        # A request holds the update, and once applied, the resulting state
+        # or the exception raised.
+        request = [fn, args, kwargs, None, None, False]
+        self._commutes.append(request)
+        with self._combiner:
+            # A previous combiner may well have applied this update already.
+            if not request[5]:
+                self._combine()
+
+        if request[4] is not None:
+            raise request[4]
+
+        return request[3]
+
+    def _combine(self):
+        # Must be called with the combiner lock held.
+        batch = []
+        while True:
+            try:
+                batch.append(self._commutes.popleft())
+            except IndexError:
+                break
+
+        while True:
+            oldval = newval = self.deref()
+            applied = []
+            for request in batch:
+                fn, args, kwargs = request[:3]
+                try:
+                    newval = fn(newval, *args, **kwargs)
+                except Exception as e:
+                    request[4] = e
+                else:
+                    request[4] = None
+                    applied.append(request)
+
+            # Other updates, e.g. by `swap`, may still intervene, in which
+            # case the batch is applied anew.
+            if not applied or self._state.compare_and_set(oldval, newval):
+                break
+
+        for request in batch:
+            request[3] = newval
+            request[5] = True
+
+        if applied:
+            self.notify_watches(oldval, newval)
+
+    def swap_in(self, path, fn, *args, **kwargs):
+        '''
+        Given a `path` of keys into nested state and a mutator `fn`, calls
+        `fn` with the value at `path`, `args`, and `kwargs`, and atomically
+        replaces that value with the return value of this invocation. Returns
+        the new state of the atom.
+
+        Only the dictionaries along `path` are copied, everything else is
+        shared with the old state, so `fn` does not need to copy anything
+        defensively::
+
+            >>> state = Atom({'clients': {'foo': {'conns': 0}}})
+            >>> state.swap_in(['clients', 'foo', 'conns'], lambda n: n + 1)
+            {'clients': {'foo': {'conns': 1}}}
+
+        Keys missing along `path` are created as dictionaries, and `fn` is
+        passed `None` if there is no value at `path` itself.
+
+        :param path: A sequence of keys.
+        :param fn: A function which will be passed the value at `path`.
+            Should return a new value. Like the mutator of `swap`, this
+            *MUST NOT* mutate the value it is passed.
+        :param \\*args: Arguments to be passed to `fn`.
+        :param \\*\\*kwargs: Keyword arguments to be passed to `fn`.
+        '''
+        return self.swap(_update_in, list(path), fn, *args, **kwargs)
+
+    def assoc_in(self, path, value):
+        '''
+        Atomically sets the value at `path` of nested state to `value`,
+        copying only the dictionaries along `path`. Returns the new state of
+        the atom.
+
+        :param path: A sequence of keys.
+        :param value: The value to set.
+        '''
+        return self.swap(_update_in, list(path), _assoc, value)
+
+    def dissoc_in(self, path):
+        '''
+        Atomically removes the last key of `path` from nested state, copying
+        only the dictionaries along `path`. Returns the new state of the atom.
+        Nothing is changed if there is no value at `path`: the version stays
+        the same, and watches are not notified.
+
+        :param path: A non-empty sequence of keys.
+        '''
+        path = list(path)
+        while True:
+            oldval = self.deref()
+            newval = _dissoc_in(oldval, path)
+            if newval is oldval:
+                return oldval
+
+            if self._state.compare_and_set(oldval, newval):
+                self.notify_watches(oldval, newval)
+                return newval
+
+    def cursor(self, path):
+        '''
+        Returns a `Cursor` focused on the value at `path` of nested state.
+
+        :param path: A sequence of keys.
+        '''
+        return Cursor(self, path)
+
+
+class Cursor(object):
+    '''
+    Cursor object type.
+
+    A cursor focuses on part of an atom's nested state, at a path of keys,
+    and allows that part to be read and changed as if it were an atom of its
+    own. Code handed a cursor therefore does not need to know the shape of
+    the state around it::
+
+        >>> state = Atom({'clients': {'foo': {'conns': 0}}})
+        >>> foo = state.cursor(['clients', 'foo'])
+        >>> foo.swap(lambda client: dict(client, conns=client['conns'] + 1))
+        {'conns': 1}
+        >>> state.deref()
+        {'clients': {'foo': {'conns': 1}}}
+
+    Changes made through a cursor are changes to the atom, with all that
+    implies: they are atomic, and they notify the atom's watches.
+
+    :param atom: The atom to focus on.
+    :param path: A sequence of keys.
+    '''
+    def __init__(self, atom, path):
+        self.atom = atom
+        self.path = tuple(path)
+
+    def __repr__(self):
+        return util.repr(__name__, self, self.deref())
+
+    def deref(self):
+        '''
+        Returns the value at the cursor's path, or `None` if there is none.
+        '''
+        return _get_in(self.atom.deref(), self.path)
+
+    def swap(self, fn, *args, **kwargs):
+        '''
+        Given a mutator `fn`, calls `fn` with the value at the cursor's path,
+        `args`, and `kwargs`, and atomically replaces that value with the
+        return value of this invocation. Returns the new value.
+
+        :param fn: A function which will be passed the value at the cursor's
+            path. Should return a new value. This *MUST NOT* mutate the value
+            it is passed.
+        :param \\*args: Arguments to be passed to `fn`.
+        :param \\*\\*kwargs: Keyword arguments to be passed to `fn`.
+        '''
+        state = self.atom.swap_in(self.path, fn, *args, **kwargs)
+        return _get_in(state, self.path)
+
+    def reset(self, newval):
+        '''
+        Resets the value at the cursor's path to `newval`, returning `newval`.
+
+        :param newval: The new value to set.
+        '''
+        self.atom.assoc_in(self.path, newval)
+        return newval
+
+    def cursor(self, path):
+        '''
+        Returns a `Cursor` focused further, on the value at `path` relative to
+        this cursor's path.
+
+        :param path: A sequence of keys.
+        '''
+        return Cursor(self.atom, self.path + tuple(path))
+
+
+class Derived(ARef):
+    '''
+    Derived ref object type.
+
+    A derived ref holds the value of a function of other refs, its sources,
+    such as atoms or other derived refs. It is read-only: its value changes
+    only when its sources do. Use `derive` to construct one.
+
+    The value is computed lazily, on `deref`, and cached along with the
+    versions of the sources it was computed from. Each `deref` reads the
+    sources' versions, by way of their `deref_with_version`, and recomputes
+    the value only if they differ, so a derived ref which is not read is
+    never recomputed at all. As the versions live with the sources, changes
+    made to multiprocessing atoms by other processes are seen, too.
+
+    Watches may be added to a derived ref like to any other. Once it has
+    some, it is recomputed eagerly whenever a source changes, and its
+    watches are notified if the value changed. Derived refs built on it do
+    not count: they are told of changes without it being recomputed.
+
+    Note that watches are only notified of changes made in this process.
+    '''
+    def __init__(self, fn, sources):
+        super(Derived, self).__init__()
+        self._fn = fn
+        self._sources = tuple(sources)
+        # The cached value and the versions of the sources it was computed
+        # from.
+        self._cache = None
+        self._lock = threading.Lock()
+        # The derived refs built on this one, which are told of changes by
+        # way of these functions rather than watches, so that they do not
+        # make this one compute eagerly. Copied on write, like the watches.
+        self._dependents = {}
+
+        # The sources tell this ref of changes, so that it may notify its own
+        # watches. They refer to it only weakly, so that an unused derived
+        # ref can be collected, and then forget it.
+        key = object()
+        self_ref = weakref.ref(self)
+
+        def invalidate(k, ref, oldval, newval):
+            derived = self_ref()
+            if derived is not None:
+                derived._invalidate()
+            elif isinstance(ref, Derived):
+                ref._remove_dependent(key)
+            else:
+                ref.remove_watch(key)
+
+        for source in self._sources:
+            if isinstance(source, Derived):
+                source._add_dependent(key, invalidate)
+            else:
+                source.add_watch(key, invalidate)
+
+    def __repr__(self):
+        return util.repr(__name__, self, self.deref())
+
+    @util.synchronized
+    def _add_dependent(self, key, fn):
+        dependents = self._dependents.copy()
+        dependents[key] = fn
+        self._dependents = dependents
+
+    @util.synchronized
+    def _remove_dependent(self, key):
+        dependents = self._dependents.copy()
+        dependents.pop(key, None)
+        self._dependents = dependents
+
+    def _invalidate(self):
+        dependents = self._dependents
+        for k in dependents:
+            dependents[k](k, self, None, None)
+
+        if self._watches:
+            cache = self._cache
+            oldval = cache[0] if cache is not None else None
+            newval = self.deref()
+            if newval is not oldval and newval != oldval:
+                self.notify_watches(oldval, newval)
+
+    def deref(self):
+        '''
+        Returns the value, computing it if a source changed since it was last
+        computed.
+        '''
+        return self.deref_with_version()[0]
+
+    def deref_with_version(self):
+        '''
+        Returns a tuple of the value and its version, which is the tuple of
+        the versions of the sources it was computed from.
+        '''
+        derefs = [source.deref_with_version() for source in self._sources]
+        versions = tuple(version for _, version in derefs)
+        cache = self._cache
+        if cache is not None and cache[1] == versions:
+            return cache[0], versions
+
+        with self._lock:
+            cache = self._cache
+            if cache is not None and cache[1] == versions:
+                return cache[0], versions
+
+            value = self._fn(*[value for value, _ in derefs])
+            self._cache = (value, versions)
+            return value, versions
+
+    def add_watch(self, key, fn):
+        '''
+        Adds `key` to the watches dictionary with the value `fn`.
+
+        :param key: The key for this watch.
+        :param fn: The value for this watch, should be a function.
+        '''
+        super(Derived, self).add_watch(key, fn)
+        # Compute the value now, so that the first change has an old value
+        # to pass to the watch.
+        self.deref()
+
+
+def derive(fn, *sources):
+    '''
+    Returns a read-only `Derived` ref holding `fn` applied to the values of
+    `sources`. The value is only computed when read, and then cached until a
+    source changes::
+
+        >>> state = Atom({'clients': set(['foo', 'bar'])})
+        >>> clients = derive(lambda s: sorted(s['clients']), state)
+        >>> clients.deref()
+        ['bar', 'foo']
+
+    :param fn: A function which will be passed the value of each source.
+        It should not have side effects, since it may be called any number
+        of times, or not at all.
+    :param \\*sources: The refs, e.g. atoms, to derive a value from.
+    '''
+    return Derived(fn, sources)
@@ -5,6 +5,9 @@ atomos.atomic
 Atomic primitives.
 '''
 
+import abc
+import array
+import threading
 
 import six
 
@@ -14,27 +17,153 @@ if six.PY3:
     long = int
 
 
+# An ABC only so that the compiled implementations, which cannot derive from
+# these classes, may be registered as their subclasses, see below.
+@six.add_metaclass(abc.ABCMeta)
 class AtomicReference(object):
     '''
     A reference to an object which allows atomic manipulation semantics.
 
     AtomicReferences are particularlly useful when an object cannot otherwise
     be manipulated atomically.
+
+    Every write bumps a monotonically increasing version, which makes it
+    cheap to tell whether the value changed since it was last read::
+
+        >>> value, version = ref.get_with_version()
+        >>> ref.get_if_changed(version) is None
+        True
+
+    Rather than poll, a thread may also block until the value changes, with
+    `await_change`, or until it satisfies a predicate, with `wait_until`.
+
+    Writes, and some reads, are protected by a `util.ReadersWriterLock`. A
+    different kind of lock with the same interface may be chosen by way of
+    `lock_type`, e.g. `util.BiasedLock` for references mostly used by a
+    single thread::
+
+        >>> ref = AtomicReference({}, lock_type=util.BiasedLock)
+
+    `lock_type` may also be a mutex type, e.g. `util.AdaptiveLock`, in which
+    case a `util.ReadersWriterLock` is built from it.
     '''
-    def __init__(self, value=None):
+    def __init__(self, value=None, lock_type=util.ReadersWriterLock):
         self._value = value
-        self._lock = util.ReadersWriterLock()
+        # A sequence number, odd while a write is in progress and even
+        # otherwise. The version is half of it. This lets `get_with_version`
+        # read the value and its version consistently without a lock, by
+        # retrying should the sequence number change in between.
+        self._seq = 0
+        self._lock = lock_type()
+        # A plain mutex type, e.g. `util.AdaptiveLock`, is used to build a
+        # readers-writer lock.
+        if not hasattr(self._lock, 'shared'):
+            self._lock = util.ReadersWriterLock(lock_type)
+        # The number of threads blocked in `await_change`, and the condition
+        # they wait on. Writers only signal the condition while there are
+        # waiters, so that a write costs nothing extra when nobody waits.
+        self._waiters = 0
+        self._changed = threading.Condition(threading.Lock())
 
     def __repr__(self):
         return util.repr(__name__, self, self._value)
 
-    def get(self):
+    def _get_locked(self):
         '''
         Returns the value.
         '''
         with self._lock.shared:
             return self._value
 
+    def _get_unlocked(self):
+        '''
+        Returns the value.
+        '''
+        return self._value
+
+    # On free-threaded builds every reader would otherwise contend on the
+    # shared lock's reader count, which serializes reads across cores. The
+    # value is only ever replaced wholesale, under the exclusive lock, and
+    # such builds guarantee that loading an attribute is atomic, so a read
+    # sees either the old or the new reference without a lock at all. The
+    # other reads in this module, and in atomos.atom, take no lock to begin
+    # with, or only while a write is in progress.
+    get = _get_unlocked if util.FREE_THREADED else _get_locked
+
+    def get_version(self):
+        '''
+        Returns the version, which is bumped by every write.
+        '''
+        return self._seq >> 1
+
+    def get_with_version(self):
+        '''
+        Returns a tuple of the value and its version.
+        '''
+        seq = self._seq
+        value = self._value
+        if seq & 1 or seq != self._seq:
+            # A write is in progress, so wait for it by way of the lock.
+            with self._lock.shared:
+                return self._value, self._seq >> 1
+
+        return value, seq >> 1
+
+    def get_if_changed(self, since_version):
+        '''
+        Returns a tuple of the value and its version if the version differs
+        from `since_version`, otherwise `None`.
+
+        :param since_version: The version last seen by the caller.
+        '''
+        value, version = self.get_with_version()
+        if version == since_version:
+            return None
+
+        return value, version
+
+    def await_change(self, since_version, timeout=None):
+        '''
+        Blocks until the version differs from `since_version`, then returns a
+        tuple of the value and its version. Returns `None` if `timeout`
+        seconds pass first.
+
+        :param since_version: The version last seen by the caller.
+        :param timeout: The longest time to wait, in seconds, or `None` to
+            wait indefinitely.
+        '''
+        with self._changed:
+            self._waiters += 1
+            try:
+                # The sequence number is compared directly, rather than by way
+                # of `get_with_version`, which may take the shared lock: a
+                # writer holds the exclusive lock while it signals.
+                changed = self._changed.wait_for(
+                    lambda: self._seq != since_version << 1, timeout)
+            finally:
+                self._waiters -= 1
+
+        if not changed:
+            return None
+
+        return self.get_with_version()
+
+    def wait_until(self, pred, timeout=None):
+        '''
+        Blocks until `pred`, called with the value, returns true. Returns
+        `True` once it does, or `False` if `timeout` seconds pass first.
+
+        :param pred: A function which will be passed the value.
+        :param timeout: The longest time to wait, in seconds, or `None` to
+            wait indefinitely.
+        '''
+        return util.wait_until(self.get_with_version, self.await_change, pred,
+                               timeout)
+
+    def _notify(self):
+        with self._changed:
+            self._changed.notify_all()
+
     def set(self, value):
         '''
         Atomically sets the value to `value`.
@@ -42,7 +171,11 @@ class AtomicReference(object):
         :param value: The value to set.
         '''
         with self._lock.exclusive:
+            self._seq += 1
             self._value = value
+            self._seq += 1
+            if self._waiters:
+                self._notify()
             return value
 
     def get_and_set(self, value):
@@ -53,7 +186,11 @@ class AtomicReference(object):
         '''
         with self._lock.exclusive:
             oldval = self._value
+            self._seq += 1
             self._value = value
+            self._seq += 1
+            if self._waiters:
+                self._notify()
             return oldval
 
     def compare_and_set(self, expect, update):
@@ -66,8 +203,15 @@ class AtomicReference(object):
             current value.
         '''
         with self._lock.exclusive:
-            if self._value == expect:
+            # Checking identity first keeps the common case, where `expect`
+            # was itself read from this reference, from running a potentially
+            # expensive `__eq__` while the lock is held.
+            if self._value is expect or self._value == expect:
+                self._seq += 1
                 self._value = update
+                self._seq += 1
+                if self._waiters:
+                    self._notify()
                 return True
 
             return False
@@ -77,22 +221,78 @@ class AtomicBoolean(AtomicReference):
     '''
     A boolean value whichs allows atomic manipulation semantics.
     '''
-    def __init__(self, value=False):
-        super(AtomicBoolean, self).__init__(value=value)
+    def __init__(self, value=False, lock_type=util.ReadersWriterLock):
+        if not isinstance(value, bool):
+            raise TypeError('_value must be of type bool')
 
-    # We do not need a locked get since a boolean is not a complex data type.
+        AtomicReference.__init__(self, value=value, lock_type=lock_type)
+
+    # We do not need a locked get: the value is only ever replaced wholesale,
+    # under the exclusive lock, and loading an attribute is atomic, with or
+    # without the GIL.
     def get(self):
         '''
         Returns the value.
         '''
         return self._value
 
-    def __setattr__(self, name, value):
-        # Ensure the `value` attribute is always a bool.
-        if name == '_value' and not isinstance(value, bool):
+    def set(self, value):
+        '''
+        Atomically sets the value to `value`.
+
+        :param value: The value to set.
+        '''
+        if not isinstance(value, bool):
+            raise TypeError('_value must be of type bool')
+
+        with self._lock.exclusive:
+            self._seq += 1
+            self._value = value
+            self._seq += 1
+            if self._waiters:
+                self._notify()
+            return value
+
+    def get_and_set(self, value):
+        '''
+        Atomically sets the value to `value` and returns the old value.
+
+        :param value: The value to set.
+        '''
+        if not isinstance(value, bool):
+            raise TypeError('_value must be of type bool')
+
+        with self._lock.exclusive:
+            oldval = self._value
+            self._seq += 1
+            self._value = value
+            self._seq += 1
+            if self._waiters:
+                self._notify()
+            return oldval
+
+    def compare_and_set(self, expect, update):
+        '''
+        Atomically sets the value to `update` if the current value is equal to
+        `expect`.
+
+        :param expect: The expected current value.
+        :param update: The value to set if and only if `expect` equals the
+            current value.
+        '''
+        if not isinstance(update, bool):
             raise TypeError('_value must be of type bool')
 
-        super(AtomicBoolean, self).__setattr__(name, value)
+        with self._lock.exclusive:
+            if self._value == expect:
+                self._seq += 1
+                self._value = update
+                self._seq += 1
+                if self._waiters:
+                    self._notify()
+                return True
+
+            return False
 
 
 class AtomicNumber(AtomicReference):
@@ -100,23 +300,107 @@ class AtomicNumber(AtomicReference):
     AtomicNumber object super type.
 
     Contains common methods for AtomicInteger, AtomicLong, and AtomicFloat.
+
+    Subtypes constrain the values they hold by way of `_value_types` and the
+    deltas they accept by way of `_delta_types`. Both are checked before the
+    lock is taken, so that the locked section is only the arithmetic itself.
+    The delta types are chosen such that applying any accepted delta to any
+    accepted value again yields an accepted value.
     '''
-    # We do not need a locked get since numbers are not complex data types.
+    _value_types = object
+    _delta_types = object
+    _type_name = 'object'
+
+    def __init__(self, value=0, lock_type=util.ReadersWriterLock):
+        if not isinstance(value, self._value_types):
+            raise TypeError('_value must be of type ' + self._type_name)
+
+        super(AtomicNumber, self).__init__(value=value, lock_type=lock_type)
+
+    # We do not need a locked get: the value is only ever replaced wholesale,
+    # under the exclusive lock, and loading an attribute is atomic, with or
+    # without the GIL.
     def get(self):
         '''
         Returns the value.
         '''
         return self._value
 
+    def set(self, value):
+        '''
+        Atomically sets the value to `value`.
+
+        :param value: The value to set.
+        '''
+        if not isinstance(value, self._value_types):
+            raise TypeError('_value must be of type ' + self._type_name)
+
+        with self._lock.exclusive:
+            self._seq += 1
+            self._value = value
+            self._seq += 1
+            if self._waiters:
+                self._notify()
+            return value
+
+    def get_and_set(self, value):
+        '''
+        Atomically sets the value to `value` and returns the old value.
+
+        :param value: The value to set.
+        '''
+        if not isinstance(value, self._value_types):
+            raise TypeError('_value must be of type ' + self._type_name)
+
+        with self._lock.exclusive:
+            oldval = self._value
+            self._seq += 1
+            self._value = value
+            self._seq += 1
+            if self._waiters:
+                self._notify()
+            return oldval
+
+    def compare_and_set(self, expect, update):
+        '''
+        Atomically sets the value to `update` if the current value is equal to
+        `expect`.
+
+        :param expect: The expected current value.
+        :param update: The value to set if and only if `expect` equals the
+            current value.
+        '''
+        if not isinstance(update, self._value_types):
+            raise TypeError('_value must be of type ' + self._type_name)
+
+        with self._lock.exclusive:
+            if self._value == expect:
+                self._seq += 1
+                self._value = update
+                self._seq += 1
+                if self._waiters:
+                    self._notify()
+                return True
+
+            return False
+
     def add_and_get(self, delta):
         '''
         Atomically adds `delta` to the current value.
 
         :param delta: The delta to add.
         '''
+        if not isinstance(delta, self._delta_types):
+            raise TypeError('delta must be of type ' + self._type_name)
+
         with self._lock.exclusive:
-            self._value += delta
-            return self._value
+            value = self._value + delta
+            self._seq += 1
+            self._value = value
+            self._seq += 1
+            if self._waiters:
+                self._notify()
+            return value
 
     def get_and_add(self, delta):
         '''
@@ -124,9 +408,17 @@ class AtomicNumber(AtomicReference):
 
         :param delta: The delta to add.
         '''
+        if not isinstance(delta, self._delta_types):
+            raise TypeError('delta must be of type ' + self._type_name)
+
         with self._lock.exclusive:
             oldval = self._value
-            self._value += delta
+            value = oldval + delta
+            self._seq += 1
+            self._value = value
+            self._seq += 1
+            if self._waiters:
+                self._notify()
             return oldval
 
     def subtract_and_get(self, delta):
@@ -135,9 +427,17 @@ class AtomicNumber(AtomicReference):
 
         :param delta: The delta to subtract.
         '''
+        if not isinstance(delta, self._delta_types):
+            raise TypeError('delta must be of type ' + self._type_name)
+
         with self._lock.exclusive:
-            self._value -= delta
-            return self._value
+            value = self._value - delta
+            self._seq += 1
+            self._value = value
+            self._seq += 1
+            if self._waiters:
+                self._notify()
+            return value
 
     def get_and_subtract(self, delta):
         '''
@@ -146,9 +446,17 @@ class AtomicNumber(AtomicReference):
 
         :param delta: The delta to subtract.
         '''
+        if not isinstance(delta, self._delta_types):
+            raise TypeError('delta must be of type ' + self._type_name)
+
         with self._lock.exclusive:
             oldval = self._value
-            self._value -= delta
+            value = oldval - delta
+            self._seq += 1
+            self._value = value
+            self._seq += 1
+            if self._waiters:
+                self._notify()
             return oldval
 
 
@@ -156,42 +464,451 @@ class AtomicInteger(AtomicNumber):
     '''
     An integer value which allows atomic manipulation semantics.
     '''
-    def __init__(self, value=0):
-        super(AtomicInteger, self).__init__(value=value)
-
-    def __setattr__(self, name, value):
-        # Ensure the `_value` attribute is always an int.
-        if name == '_value' and not isinstance(value, int):
-            raise TypeError('_value must be of type int')
+    _value_types = int
+    _delta_types = int
+    _type_name = 'int'
 
-        super(AtomicInteger, self).__setattr__(name, value)
+    def __init__(self, value=0, lock_type=util.ReadersWriterLock):
+        AtomicNumber.__init__(self, value=value, lock_type=lock_type)
 
 
 class AtomicLong(AtomicNumber):
     '''
     A long value which allows atomic manipulation semantics.
     '''
-    def __init__(self, value=long(0)):
-        super(AtomicLong, self).__init__(value=value)
+    _value_types = long
+    _delta_types = six.integer_types
+    _type_name = 'long'
 
-    def __setattr__(self, name, value):
-        # Ensure the `_value` attribute is always a long.
-        if name == '_value' and not isinstance(value, long):
-            raise TypeError('_value must be of type long')
-
-        super(AtomicLong, self).__setattr__(name, value)
+    def __init__(self, value=long(0), lock_type=util.ReadersWriterLock):
+        AtomicNumber.__init__(self, value=value, lock_type=lock_type)
 
 
 class AtomicFloat(AtomicNumber):
     '''
     A float value which allows atomic manipulation semantics.
     '''
-    def __init__(self, value=float(0)):
-        super(AtomicFloat, self).__init__(value=value)
+    _value_types = float
+    _delta_types = (float,) + six.integer_types
+    _type_name = 'float'
+
+    def __init__(self, value=float(0), lock_type=util.ReadersWriterLock):
+        AtomicNumber.__init__(self, value=value, lock_type=lock_type)
+
+
+class AtomicStampedReference(AtomicReference):
+    '''
+    A reference to an object, paired with an integer stamp, which allows
+    atomic manipulation semantics.
+
+    Unlike `AtomicReference`, `compare_and_set` compares the reference by
+    identity, never calling `__eq__`, and requires the stamp to match as
+    well. Bumping the stamp on every update therefore guards against the ABA
+    problem, where a reference is changed and then changed back in between
+    a read and a subsequent compare-and-set::
+
+        >>> head = AtomicStampedReference(node)
+        >>> node, stamp = head.get()
+        >>> head.compare_and_set(node, node.next, stamp, stamp + 1)
+        True
+
+    The reference and the stamp are always read and written together, so
+    `get` returns both as a tuple.
+    '''
+    def __init__(self, reference=None, stamp=0,
+                 lock_type=util.ReadersWriterLock):
+        if not isinstance(stamp, six.integer_types):
+            raise TypeError('stamp must be of type int')
+
+        AtomicReference.__init__(self, value=(reference, stamp),
+                                 lock_type=lock_type)
+
+    # We do not need a locked get: the pair is only ever replaced wholesale,
+    # under the exclusive lock, and loading an attribute is atomic, with or
+    # without the GIL.
+    def get(self):
+        '''
+        Returns a tuple of the reference and the stamp.
+        '''
+        return self._value
+
+    def get_reference(self):
+        '''
+        Returns the reference.
+        '''
+        return self._value[0]
+
+    def get_stamp(self):
+        '''
+        Returns the stamp.
+        '''
+        return self._value[1]
+
+    def set(self, reference, stamp):
+        '''
+        Atomically sets the reference to `reference` and the stamp to `stamp`.
+
+        :param reference: The reference to set.
+        :param stamp: The stamp to set.
+        '''
+        if not isinstance(stamp, six.integer_types):
+            raise TypeError('stamp must be of type int')
+
+        with self._lock.exclusive:
+            self._seq += 1
+            self._value = (reference, stamp)
+            self._seq += 1
+            if self._waiters:
+                self._notify()
+            return reference, stamp
+
+    def get_and_set(self, reference, stamp):
+        '''
+        Atomically sets the reference to `reference` and the stamp to `stamp`
+        and returns a tuple of the old reference and stamp.
+
+        :param reference: The reference to set.
+        :param stamp: The stamp to set.
+        '''
+        if not isinstance(stamp, six.integer_types):
+            raise TypeError('stamp must be of type int')
+
+        with self._lock.exclusive:
+            oldval = self._value
+            self._seq += 1
+            self._value = (reference, stamp)
+            self._seq += 1
+            if self._waiters:
+                self._notify()
+            return oldval
+
+    def compare_and_set(self, expect_reference, update_reference,
+                        expect_stamp, update_stamp):
+        '''
+        Atomically sets the reference to `update_reference` and the stamp to
+        `update_stamp` if the current reference is `expect_reference` and the
+        current stamp is equal to `expect_stamp`.
+
+        :param expect_reference: The expected current reference.
+        :param update_reference: The reference to set.
+        :param expect_stamp: The expected current stamp.
+        :param update_stamp: The stamp to set.
+        '''
+        if not isinstance(update_stamp, six.integer_types):
+            raise TypeError('stamp must be of type int')
+
+        with self._lock.exclusive:
+            reference, stamp = self._value
+            if reference is expect_reference and stamp == expect_stamp:
+                self._seq += 1
+                self._value = (update_reference, update_stamp)
+                self._seq += 1
+                if self._waiters:
+                    self._notify()
+                return True
+
+            return False
+
+    def attempt_stamp(self, expect_reference, update_stamp):
+        '''
+        Atomically sets the stamp to `update_stamp` if the current reference
+        is `expect_reference`.
+
+        :param expect_reference: The expected current reference.
+        :param update_stamp: The stamp to set.
+        '''
+        if not isinstance(update_stamp, six.integer_types):
+            raise TypeError('stamp must be of type int')
+
+        with self._lock.exclusive:
+            if self._value[0] is expect_reference:
+                self._seq += 1
+                self._value = (expect_reference, update_stamp)
+                self._seq += 1
+                if self._waiters:
+                    self._notify()
+                return True
+
+            return False
+
+
+class AtomicMarkableReference(AtomicReference):
+    '''
+    A reference to an object, paired with a boolean mark, which allows atomic
+    manipulation semantics.
+
+    As with `AtomicStampedReference`, `compare_and_set` compares the
+    reference by identity and requires the mark to match as well. A mark is
+    typically used to flag a node as logically deleted, atomically with its
+    successor, in linked data structures.
+    '''
+    def __init__(self, reference=None, mark=False,
+                 lock_type=util.ReadersWriterLock):
+        if not isinstance(mark, bool):
+            raise TypeError('mark must be of type bool')
+
+        AtomicReference.__init__(self, value=(reference, mark),
+                                 lock_type=lock_type)
+
+    # We do not need a locked get: the pair is only ever replaced wholesale,
+    # under the exclusive lock, and loading an attribute is atomic, with or
+    # without the GIL.
+    def get(self):
+        '''
+        Returns a tuple of the reference and the mark.
+        '''
+        return self._value
+
+    def get_reference(self):
+        '''
+        Returns the reference.
+        '''
+        return self._value[0]
+
+    def is_marked(self):
+        '''
+        Returns the mark.
+        '''
+        return self._value[1]
+
+    def set(self, reference, mark):
+        '''
+        Atomically sets the reference to `reference` and the mark to `mark`.
+
+        :param reference: The reference to set.
+        :param mark: The mark to set.
+        '''
+        if not isinstance(mark, bool):
+            raise TypeError('mark must be of type bool')
+
+        with self._lock.exclusive:
+            self._seq += 1
+            self._value = (reference, mark)
+            self._seq += 1
+            if self._waiters:
+                self._notify()
+            return reference, mark
+
+    def get_and_set(self, reference, mark):
+        '''
+        Atomically sets the reference to `reference` and the mark to `mark`
+        and returns a tuple of the old reference and mark.
+
+        :param reference: The reference to set.
+        :param mark: The mark to set.
+        '''
+        if not isinstance(mark, bool):
+            raise TypeError('mark must be of type bool')
+
+        with self._lock.exclusive:
+            oldval = self._value
+            self._seq += 1
+            self._value = (reference, mark)
+            self._seq += 1
+            if self._waiters:
+                self._notify()
+            return oldval
+
+    def compare_and_set(self, expect_reference, update_reference,
+                        expect_mark, update_mark):
+        '''
+        Atomically sets the reference to `update_reference` and the mark to
+        `update_mark` if the current reference is `expect_reference` and the
+        current mark is `expect_mark`.
+
+        :param expect_reference: The expected current reference.
+        :param update_reference: The reference to set.
+        :param expect_mark: The expected current mark.
+        :param update_mark: The mark to set.
+        '''
+        if not isinstance(update_mark, bool):
+            raise TypeError('mark must be of type bool')
+
+        with self._lock.exclusive:
+            reference, mark = self._value
+            if reference is expect_reference and mark == expect_mark:
+                self._seq += 1
+                self._value = (update_reference, update_mark)
+                self._seq += 1
+                if self._waiters:
+                    self._notify()
+                return True
+
+            return False
+
+    def attempt_mark(self, expect_reference, update_mark):
+        '''
+        Atomically sets the mark to `update_mark` if the current reference is
+        `expect_reference`.
+
+        :param expect_reference: The expected current reference.
+        :param update_mark: The mark to set.
+        '''
+        if not isinstance(update_mark, bool):
+            raise TypeError('mark must be of type bool')
+
+        with self._lock.exclusive:
+            if self._value[0] is expect_reference:
+                self._seq += 1
+                self._value = (expect_reference, update_mark)
+                self._seq += 1
+                if self._waiters:
+                    self._notify()
+                return True
+
+            return False
+
+
+class AtomicBitSet(object):
+    '''
+    A fixed-size set of bits which may be set and cleared atomically, e.g. to
+    deduplicate integer IDs between threads at one bit per possible ID.
+
+    The bits are packed into an `array.array` of 64-bit words. Writes lock
+    only the stripe of their word, one of `stripes` locks which words are
+    assigned to round-robin, so that writes to different words rarely
+    contend. Reads take no lock::
+
+        >>> seen = AtomicBitSet(1 << 20)
+        >>> seen.test_and_set(42)
+        False
+        >>> seen.test_and_set(42)
+        True
+
+    :param size: The number of bits.
+    :param stripes: The number of locks, rounded up to a power of two.
+    '''
+    def __init__(self, size, stripes=16):
+        if size < 0:
+            raise ValueError('size must not be negative')
+
+        count = 1
+        while count < stripes:
+            count *= 2
+
+        self._size = size
+        self._mask = count - 1
+        self._words = self._new_words((size + 63) // 64)
+        self._locks = [self._new_lock() for _ in range(count)]
+
+    def __repr__(self):
+        return util.repr(__name__, self, self.popcount())
+
+    def _new_words(self, count):
+        return array.array('Q', bytes(8 * count))
+
+    def _new_lock(self):
+        return threading.Lock()
+
+    def _word(self, i):
+        if not 0 <= i < self._size:
+            raise IndexError('bit index out of range')
+
+        return i >> 6, 1 << (i & 63)
+
+    def __len__(self):
+        return self._size
+
+    def __contains__(self, i):
+        return self.get(i)
+
+    def get(self, i):
+        '''
+        Returns `True` if bit `i` is set, otherwise `False`.
 
-    def __setattr__(self, name, value):
-        # Ensure the `_value` attribute is always a float.
-        if name == '_value' and not isinstance(value, float):
-            raise TypeError('_value must be of type float')
+        :param i: The index of the bit.
+        '''
+        w, bit = self._word(i)
+        return bool(self._words[w] & bit)
+
+    def test_and_set(self, i):
+        '''
+        Atomically sets bit `i` and returns whether it was set before.
+
+        :param i: The index of the bit.
+        '''
+        w, bit = self._word(i)
+        words = self._words
+        if words[w] & bit:
+            return True
+
+        with self._locks[w & self._mask]:
+            word = words[w]
+            if word & bit:
+                return True
+
+            words[w] = word | bit
+            return False
 
-        super(AtomicFloat, self).__setattr__(name, value)
+    def clear(self, i):
+        '''
+        Atomically clears bit `i` and returns whether it was set before.
+
+        :param i: The index of the bit.
+        '''
+        w, bit = self._word(i)
+        words = self._words
+        with self._locks[w & self._mask]:
+            word = words[w]
+            words[w] = word & ~bit
+            return bool(word & bit)
+
+    def set_many(self, indices):
+        '''
+        Sets each of `indices`, taking each stripe's lock once, and returns
+        the list of those which were not set before, in the order given.
+        Each bit is set atomically, but not all of them at once.
+
+        :param indices: An iterable of bit indices.
+        '''
+        by_stripe = {}
+        for n, i in enumerate(indices):
+            w, bit = self._word(i)
+            by_stripe.setdefault(w & self._mask, []).append((n, i, w, bit))
+
+        words = self._words
+        added = []
+        for stripe, bits in by_stripe.items():
+            with self._locks[stripe]:
+                for n, i, w, bit in bits:
+                    word = words[w]
+                    if not word & bit:
+                        words[w] = word | bit
+                        added.append((n, i))
+
+        added.sort()
+        return [i for _, i in added]
+
+    def popcount(self):
+        '''
+        Returns the number of bits set. Bits changed meanwhile may or may not
+        be counted.
+        '''
+        n = int.from_bytes(memoryview(self._words).tobytes(), 'little')
+        try:
+            return n.bit_count()
+        except AttributeError:
+            return bin(n).count('1')
+
+
+# The pure Python implementations remain reachable under these names, e.g. so
+# that the test suite can exercise both them and the compiled ones. (This is
+# also why they call their base classes explicitly rather than through super:
+# their public names may be rebound below.)
+_PyAtomicBoolean = AtomicBoolean
+_PyAtomicInteger = AtomicInteger
+_PyAtomicLong = AtomicLong
+
+# Prefer the compiled implementations, which use hardware atomics in place of
+# a lock, when the optional extension is available. Note that these hold
+# signed 64-bit values and raise OverflowError rather than grow beyond that,
+# and that, as they take no lock, they construct the pure Python
+# implementation instead when given a `lock_type`.
+try:
+    from atomos._speedups import AtomicBoolean, AtomicInteger, AtomicLong
+except ImportError:
+    pass
+else:
+    AtomicReference.register(AtomicBoolean)
+    AtomicNumber.register(AtomicInteger)
+    AtomicNumber.register(AtomicLong)
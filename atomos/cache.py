@@ -0,0 +1,352 @@
+# -*- coding: utf-8 -*-
+'''
+atomos.cache
+
+A concurrent, size-bounded memoization cache.
+'''
+
+import collections
+import functools
+import threading
+import time
+
+import atomos.atomic as atomic
+import atomos.util as util
+
+# The number of recorded reads after which a reader tries to apply them to
+# the recency order of its segment, and the most that are kept.
+_DRAIN_THRESHOLD = 32
+_READ_BUFFER_SIZE = 256
+
+# Separates positional from keyword arguments in keys made by `cached`.
+_KWARGS_MARK = object()
+
+
+class _Entry(object):
+    __slots__ = ('value', 'expires_at')
+
+    def __init__(self, value, expires_at):
+        self.value = value
+        self.expires_at = expires_at
+
+    def expired(self):
+        expires_at = self.expires_at
+        return expires_at is not None and expires_at <= time.monotonic()
+
+
+class _Flight(object):
+    '''
+    A load in progress, which other threads missing the same key wait for.
+    '''
+    __slots__ = ('done', 'value', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class _Segment(object):
+    __slots__ = ('lock', 'table', 'order', 'reads', 'flights', 'capacity')
+
+    def __init__(self, capacity):
+        self.lock = threading.Lock()
+        # The entries, which are read without the lock, and their keys in
+        # least recently used order, which is only touched with it.
+        self.table = {}
+        self.order = collections.OrderedDict()
+        # The keys read since the order was last brought up to date. Should
+        # the order fall behind, the oldest reads are dropped.
+        self.reads = collections.deque(maxlen=_READ_BUFFER_SIZE)
+        self.flights = {}
+        self.capacity = capacity
+
+
+class Cache(object):
+    '''
+    A mapping of keys to values which are expensive to compute, which may be
+    shared between threads. Once it holds `maxsize` entries, adding another
+    evicts the least recently used one::
+
+        >>> cache = Cache(maxsize=1000, ttl=60)
+        >>> cache.get_or_load('foo', lambda key: key.upper())
+        'FOO'
+        >>> cache.get('foo')
+        'FOO'
+
+    Unlike an atom holding a dictionary, a cache is split into segments,
+    each changed in place under a lock of its own. Hits take no lock at all:
+    rather than moving an entry to the end of the recency order right away,
+    a hit is recorded in a buffer, which is applied to the order in batches,
+    whenever the segment's lock is free or it is changed anyway. Eviction is
+    therefore least recently used within a segment, and approximately so
+    overall.
+
+    Loading is single-flight: should several threads miss the same key at
+    once, only the first calls the loader, and the others wait for its
+    result, or the exception it raised, which nothing is cached for.
+
+    Entries expire `ttl` seconds after they were added, if given. Hits,
+    misses, loads and evictions are counted in atomic longs, and returned by
+    `stats`.
+
+    :param maxsize: The most entries to hold, or `None` not to bound it.
+    :param ttl: The number of seconds entries live for, or `None` for them
+        not to expire.
+    :param loader: The function `get_or_load` calls with a missing key,
+        unless it is given another.
+    :param concurrency_level: The most segments, rounded down to a power of
+        two.
+    '''
+    def __init__(self, maxsize=128, ttl=None, loader=None,
+                 concurrency_level=16):
+        if maxsize is not None and maxsize < 1:
+            raise ValueError('maxsize must be positive')
+
+        # Segments should hold enough entries each for eviction to be close
+        # to least recently used overall.
+        limit = concurrency_level
+        if maxsize is not None:
+            limit = min(limit, max(maxsize // 8, 1))
+        count = 1
+        while count * 2 <= limit:
+            count *= 2
+
+        self._mask = count - 1
+        if maxsize is None:
+            self._segments = [_Segment(None) for _ in range(count)]
+        else:
+            self._segments = [_Segment(maxsize // count +
+                                       (1 if i < maxsize % count else 0))
+                              for i in range(count)]
+
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._loader = loader
+        self._hits = atomic.AtomicLong()
+        self._misses = atomic.AtomicLong()
+        self._loads = atomic.AtomicLong()
+        self._evictions = atomic.AtomicLong()
+
+    def __repr__(self):
+        return util.repr(__name__, self, self.stats())
+
+    def _segment(self, key):
+        h = hash(key)
+        return self._segments[(h ^ (h >> 16)) & self._mask]
+
+    def __len__(self):
+        return sum(len(segment.table) for segment in self._segments)
+
+    def __contains__(self, key):
+        return self._lookup(self._segment(key), key) is not None
+
+    def _lookup(self, segment, key):
+        # Returns the live entry of `key`, or `None`, without counting it.
+        entry = segment.table.get(key)
+        if entry is None:
+            return None
+
+        if entry.expired():
+            with segment.lock:
+                if segment.table.get(key) is entry:
+                    del segment.table[key]
+                    segment.order.pop(key, None)
+            return None
+
+        return entry
+
+    def _record_read(self, segment, key):
+        segment.reads.append(key)
+        if len(segment.reads) >= _DRAIN_THRESHOLD and \
+                segment.lock.acquire(False):
+            try:
+                self._drain_reads(segment)
+            finally:
+                segment.lock.release()
+
+    def _drain_reads(self, segment):
+        # Must be called with the lock held.
+        order, reads = segment.order, segment.reads
+        while True:
+            try:
+                key = reads.popleft()
+            except IndexError:
+                return
+
+            if key in order:
+                order.move_to_end(key)
+
+    def _insert(self, segment, key, value, ttl):
+        # Must be called with the lock held.
+        if ttl is None:
+            ttl = self.ttl
+        expires_at = None if ttl is None else time.monotonic() + ttl
+
+        segment.table[key] = _Entry(value, expires_at)
+        segment.order[key] = None
+        segment.order.move_to_end(key)
+        if segment.capacity is None or len(segment.order) <= segment.capacity:
+            return
+
+        self._drain_reads(segment)
+        while len(segment.order) > segment.capacity:
+            evicted, _ = segment.order.popitem(last=False)
+            del segment.table[evicted]
+            self._evictions.add_and_get(1)
+
+    def get(self, key, default=None):
+        '''
+        Returns the value of `key`, or `default` if it has none.
+
+        :param key: The key to look up.
+        :param default: The value to return if `key` has none.
+        '''
+        segment = self._segment(key)
+        entry = self._lookup(segment, key)
+        if entry is None:
+            self._misses.add_and_get(1)
+            return default
+
+        self._hits.add_and_get(1)
+        self._record_read(segment, key)
+        return entry.value
+
+    def get_or_load(self, key, loader=None):
+        '''
+        Returns the value of `key`, loading it with `loader(key)` should it
+        have none. Only one thread at a time loads a key; others missing it
+        meanwhile wait for that thread's result.
+
+        :param key: The key to look up.
+        :param loader: The function to load the value with, by default the
+            cache's loader.
+        '''
+        segment = self._segment(key)
+        entry = self._lookup(segment, key)
+        if entry is not None:
+            self._hits.add_and_get(1)
+            self._record_read(segment, key)
+            return entry.value
+
+        with segment.lock:
+            # Another thread may have added the entry meanwhile.
+            entry = segment.table.get(key)
+            if entry is not None and entry.expired():
+                del segment.table[key]
+                segment.order.pop(key, None)
+                entry = None
+
+            if entry is None:
+                flight = segment.flights.get(key)
+                loading = flight is None
+                if loading:
+                    flight = segment.flights[key] = _Flight()
+
+        if entry is not None:
+            self._hits.add_and_get(1)
+            self._record_read(segment, key)
+            return entry.value
+
+        self._misses.add_and_get(1)
+        if not loading:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            flight.value = (loader or self._loader)(key)
+        except BaseException as e:
+            flight.error = e
+            raise
+        else:
+            self._loads.add_and_get(1)
+            with segment.lock:
+                self._insert(segment, key, flight.value, None)
+            return flight.value
+        finally:
+            with segment.lock:
+                del segment.flights[key]
+            flight.done.set()
+
+    def put(self, key, value, ttl=None):
+        '''
+        Sets the value of `key` to `value`.
+
+        :param key: The key to set.
+        :param value: The value to set.
+        :param ttl: The number of seconds the entry lives for, by default the
+            cache's `ttl`.
+        '''
+        segment = self._segment(key)
+        with segment.lock:
+            self._insert(segment, key, value, ttl)
+
+    def invalidate(self, key):
+        '''
+        Removes `key`, should it have a value.
+
+        :param key: The key to remove.
+        '''
+        segment = self._segment(key)
+        with segment.lock:
+            segment.table.pop(key, None)
+            segment.order.pop(key, None)
+
+    def clear(self):
+        '''
+        Removes every entry.
+        '''
+        for segment in self._segments:
+            with segment.lock:
+                segment.table.clear()
+                segment.order.clear()
+                segment.reads.clear()
+
+    def stats(self):
+        '''
+        Returns a dictionary of the number of hits, misses, loads and
+        evictions so far.
+        '''
+        return {'hits': self._hits.get(),
+                'misses': self._misses.get(),
+                'loads': self._loads.get(),
+                'evictions': self._evictions.get()}
+
+
+def cached(maxsize=128, ttl=None, key=None):
+    '''
+    A decorator which memoizes its wrapped function in a `Cache`, loading
+    each distinct call once, even when called from many threads at once::
+
+        >>> @cached(maxsize=1000, ttl=60)
+        ... def lookup(user_id):
+        ...     return fetch_user(user_id)
+
+    The cache is available as the `cache` attribute of the wrapper.
+
+    :param maxsize: The most calls to remember, or `None` not to bound it.
+    :param ttl: The number of seconds results live for, or `None` for them
+        not to expire.
+    :param key: A function which, given the arguments of a call, returns
+        its cache key. By default the arguments themselves are, and must
+        therefore be hashable.
+    '''
+    def decorator(fn):
+        cache = Cache(maxsize=maxsize, ttl=ttl)
+
+        @functools.wraps(fn)
+        def decorated(*args, **kwargs):
+            if key is not None:
+                k = key(*args, **kwargs)
+            elif kwargs:
+                k = args + (_KWARGS_MARK,) + tuple(sorted(kwargs.items()))
+            else:
+                k = args
+            return cache.get_or_load(k, lambda _: fn(*args, **kwargs))
+
+        decorated.cache = cache
+        return decorated
+
+    return decorator
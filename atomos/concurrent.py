@@ -0,0 +1,515 @@
+# -*- coding: utf-8 -*-
+'''
+atomos.concurrent
+
+Concurrent collections built on atomic references.
+'''
+
+import threading
+
+import atomos.atomic as atomic
+import atomos.util as util
+
+
+class _Node(object):
+    __slots__ = ('value', 'next')
+
+    def __init__(self, value, next=None):
+        self.value = value
+        self.next = next
+
+
+class ConcurrentStack(object):
+    '''
+    A last-in-first-out stack which may be shared between threads.
+
+    This is a Treiber stack: a singly linked list whose head is an
+    `AtomicReference`. Pushing and popping each compare-and-set the head,
+    retrying should another thread have changed it in the meantime, so that
+    unlike an atom holding a list, an operation never copies the stack::
+
+        >>> stack = ConcurrentStack()
+        >>> stack.push('foo')
+        >>> stack.pop()
+        'foo'
+
+    Nodes are never reused while any thread may still refer to them, so the
+    stack is not subject to the ABA problem.
+    '''
+    def __init__(self):
+        self._head = atomic.AtomicReference()
+
+    def __repr__(self):
+        return util.repr(__name__, self, self.peek())
+
+    def push(self, value):
+        '''
+        Pushes `value` onto the stack.
+
+        :param value: The value to push.
+        '''
+        node = _Node(value)
+        while True:
+            node.next = self._head.get()
+            if self._head.compare_and_set(node.next, node):
+                return
+
+    def push_all(self, values):
+        '''
+        Pushes each of `values` onto the stack, in order, with a single
+        compare-and-set. The last value therefore ends up on top, and no
+        other thread ever sees only some of them pushed.
+
+        :param values: An iterable of values to push.
+        '''
+        bottom = top = None
+        for value in values:
+            top = _Node(value, top)
+            if bottom is None:
+                bottom = top
+
+        if top is None:
+            return
+
+        while True:
+            bottom.next = self._head.get()
+            if self._head.compare_and_set(bottom.next, top):
+                return
+
+    def pop(self, default=None):
+        '''
+        Removes and returns the value on top of the stack, or returns
+        `default` if the stack is empty.
+
+        :param default: The value to return if the stack is empty.
+        '''
+        while True:
+            head = self._head.get()
+            if head is None:
+                return default
+
+            if self._head.compare_and_set(head, head.next):
+                return head.value
+
+    def peek(self, default=None):
+        '''
+        Returns the value on top of the stack without removing it, or
+        `default` if the stack is empty.
+
+        :param default: The value to return if the stack is empty.
+        '''
+        head = self._head.get()
+        if head is None:
+            return default
+
+        return head.value
+
+    def drain(self, max_n=None):
+        '''
+        Removes up to `max_n` values from the top of the stack, with a single
+        compare-and-set, and returns them as a list, top first.
+
+        :param max_n: The most values to remove, or `None` to remove all of
+            them.
+        '''
+        while True:
+            head = node = self._head.get()
+            values = []
+            while node is not None and (max_n is None or len(values) < max_n):
+                values.append(node.value)
+                node = node.next
+
+            if not values or self._head.compare_and_set(head, node):
+                return values
+
+    def is_empty(self):
+        '''
+        Returns `True` if the stack is empty, otherwise `False`.
+        '''
+        return self._head.get() is None
+
+
+class ConcurrentQueue(object):
+    '''
+    A first-in-first-out queue which may be shared between any number of
+    producer and consumer threads.
+
+    The queue is a singly linked list whose head is a sentinel node, whose
+    successor holds the oldest value, and both the head and the tail are
+    `AtomicReference` objects. Consumers take a value as in Michael and
+    Scott's queue, by swinging the head to its successor with
+    compare-and-set::
+
+        >>> queue = ConcurrentQueue()
+        >>> queue.offer('foo')
+        >>> queue.poll()
+        'foo'
+
+    Producers, however, do not follow Michael and Scott, which would take a
+    compare-and-set of each node's link, and so an `AtomicReference` per
+    node. Instead, they swing the tail to their new node with a single
+    `get_and_set`, and then link the previous tail to it, as in Vyukov's
+    queue. `offer` therefore never retries, and `poll` only does when another
+    consumer succeeded, but the queue as a whole is not lock-free: should a
+    producer stall between its two steps, its value, and every value offered
+    after it, stay invisible to consumers until it resumes. `poll` does not
+    wait for it meanwhile, but returns `default`, even if a later `offer`
+    already returned. The queue is therefore not linearizable either: an
+    `offer` which has returned is not necessarily visible to the next
+    `poll`, though values are still handed out in the order their nodes
+    were linked. With the GIL, the window is a few bytecodes wide.
+
+    `offer_all` and `drain` move a whole batch of values with one atomic
+    operation.
+    '''
+    def __init__(self):
+        sentinel = _Node(None)
+        self._head = atomic.AtomicReference(sentinel)
+        self._tail = atomic.AtomicReference(sentinel)
+
+    def __repr__(self):
+        return util.repr(__name__, self, self.peek())
+
+    def offer(self, value):
+        '''
+        Adds `value` to the tail of the queue.
+
+        :param value: The value to add.
+        '''
+        node = _Node(value)
+        self._tail.get_and_set(node).next = node
+
+    def offer_all(self, values):
+        '''
+        Adds each of `values` to the tail of the queue, in order, with a single
+        atomic operation. Consumers therefore see either none or all of them,
+        never interleaved with values offered by other threads.
+
+        :param values: An iterable of values to add.
+        '''
+        first = last = None
+        for value in values:
+            node = _Node(value)
+            if first is None:
+                first = node
+            else:
+                last.next = node
+            last = node
+
+        if first is not None:
+            self._tail.get_and_set(last).next = first
+
+    def poll(self, default=None):
+        '''
+        Removes and returns the value at the head of the queue, or returns
+        `default` if the queue is empty.
+
+        :param default: The value to return if the queue is empty.
+        '''
+        while True:
+            head = self._head.get()
+            node = head.next
+            if node is None:
+                return default
+
+            value = node.value
+            if self._head.compare_and_set(head, node):
+                # The node is the new sentinel. Drop its value, which has
+                # been handed out, so that the queue does not keep it alive.
+                node.value = None
+                return value
+
+    def peek(self, default=None):
+        '''
+        Returns the value at the head of the queue without removing it, or
+        `default` if the queue is empty.
+
+        :param default: The value to return if the queue is empty.
+        '''
+        while True:
+            head = self._head.get()
+            node = head.next
+            if node is None:
+                return default
+
+            # A consumer taking the node clears its value, after swinging the
+            # head, so the value is only good if the head did not move.
+            value = node.value
+            if self._head.get() is head:
+                return value
+
+    def drain(self, max_n=None):
+        '''
+        Removes up to `max_n` values from the head of the queue, with a single
+        compare-and-set, and returns them as a list, oldest first.
+
+        :param max_n: The most values to remove, or `None` to remove all of
+            them.
+        '''
+        while True:
+            head = last = self._head.get()
+            values = []
+            node = head.next
+            while node is not None and (max_n is None or len(values) < max_n):
+                values.append(node.value)
+                last = node
+                node = node.next
+
+            if not values:
+                return values
+
+            if self._head.compare_and_set(head, last):
+                last.value = None
+                return values
+
+    def is_empty(self):
+        '''
+        Returns `True` if the queue is empty, otherwise `False`.
+        '''
+        return self._head.get().next is None
+
+
+class ConcurrentMap(object):
+    '''
+    A mapping which may be shared between threads, with atomic per-key
+    operations.
+
+    Keeping a dictionary in an atom means every change copies it and
+    contends with changes to every other key. A `ConcurrentMap` is instead
+    striped into `concurrency_level` segments, each a dictionary changed in
+    place under a lock of its own, so that writers only contend if their
+    keys fall into the same segment::
+
+        >>> counts = ConcurrentMap()
+        >>> counts.merge('foo', 1, lambda old, new: old + new)
+        1
+        >>> counts.compute_if_absent('bar', lambda key: [])
+        []
+
+    Reads take no lock at all: looking up a key in a dictionary is atomic,
+    also while it is being changed or resized. Iterating over the map is
+    weakly consistent: segments are copied one at a time as iteration
+    reaches them, so it never fails on account of concurrent changes, but
+    may or may not reflect changes made after it started.
+
+    As in Java, a map cannot hold `None` as a value. The functions passed to
+    `compute`, `compute_if_present` and `merge` return `None` to remove a
+    mapping instead. These functions run while holding their segment's lock
+    and therefore should be short, and must not use the map themselves.
+
+    :param concurrency_level: The number of segments, rounded up to a power
+        of two.
+    '''
+    def __init__(self, concurrency_level=16):
+        count = 1
+        while count < concurrency_level:
+            count *= 2
+
+        self._mask = count - 1
+        self._locks = [threading.Lock() for _ in range(count)]
+        self._tables = [{} for _ in range(count)]
+
+    def __repr__(self):
+        return util.repr(__name__, self, dict(self.items()))
+
+    def _segment(self, key):
+        h = hash(key)
+        # Mix the high bits in, since small integers hash to themselves.
+        return (h ^ (h >> 16)) & self._mask
+
+    def __len__(self):
+        return sum(len(table) for table in self._tables)
+
+    def __contains__(self, key):
+        return key in self._tables[self._segment(key)]
+
+    def __iter__(self):
+        return self.keys()
+
+    def __getitem__(self, key):
+        value = self._tables[self._segment(key)].get(key)
+        if value is None:
+            raise KeyError(key)
+
+        return value
+
+    def __setitem__(self, key, value):
+        self.put(key, value)
+
+    def __delitem__(self, key):
+        if self.remove(key) is None:
+            raise KeyError(key)
+
+    def get(self, key, default=None):
+        '''
+        Returns the value of `key`, or `default` if it has none.
+
+        :param key: The key to look up.
+        :param default: The value to return if `key` has none.
+        '''
+        return self._tables[self._segment(key)].get(key, default)
+
+    def put(self, key, value):
+        '''
+        Sets the value of `key` to `value` and returns the old value, or
+        `None` if it had none.
+
+        :param key: The key to set.
+        :param value: The value to set.
+        '''
+        if value is None:
+            raise ValueError('value must not be None')
+
+        i = self._segment(key)
+        with self._locks[i]:
+            table = self._tables[i]
+            oldval = table.get(key)
+            table[key] = value
+            return oldval
+
+    def put_if_absent(self, key, value):
+        '''
+        Sets the value of `key` to `value` if it has none. Returns the
+        current value if it has one, otherwise `None`.
+
+        :param key: The key to set.
+        :param value: The value to set.
+        '''
+        if value is None:
+            raise ValueError('value must not be None')
+
+        i = self._segment(key)
+        with self._locks[i]:
+            table = self._tables[i]
+            oldval = table.get(key)
+            if oldval is None:
+                table[key] = value
+            return oldval
+
+    def remove(self, key):
+        '''
+        Removes `key` and returns its value, or `None` if it had none.
+
+        :param key: The key to remove.
+        '''
+        i = self._segment(key)
+        with self._locks[i]:
+            return self._tables[i].pop(key, None)
+
+    def compute(self, key, fn):
+        '''
+        Atomically sets the value of `key` to `fn(key, oldval)`, where
+        `oldval` is its current value, or `None` if it has none. Returns the
+        new value. Should `fn` return `None`, `key` is removed instead.
+
+        :param key: The key to compute the value of.
+        :param fn: A function which will be passed the key and its current
+            value.
+        '''
+        i = self._segment(key)
+        with self._locks[i]:
+            table = self._tables[i]
+            newval = fn(key, table.get(key))
+            if newval is None:
+                table.pop(key, None)
+            else:
+                table[key] = newval
+            return newval
+
+    def compute_if_absent(self, key, fn):
+        '''
+        Atomically sets the value of `key` to `fn(key)` if it has none.
+        Returns its current value if it has one, otherwise the new value.
+        `fn` is only called if the key has no value; should it return
+        `None`, nothing is set.
+
+        :param key: The key to compute the value of.
+        :param fn: A function which will be passed the key.
+        '''
+        i = self._segment(key)
+        value = self._tables[i].get(key)
+        if value is not None:
+            return value
+
+        with self._locks[i]:
+            table = self._tables[i]
+            value = table.get(key)
+            if value is None:
+                value = fn(key)
+                if value is not None:
+                    table[key] = value
+            return value
+
+    def compute_if_present(self, key, fn):
+        '''
+        Atomically sets the value of `key` to `fn(key, oldval)` if it has a
+        value, `oldval`. Returns the new value, or `None` if it had none.
+        Should `fn` return `None`, `key` is removed instead.
+
+        :param key: The key to compute the value of.
+        :param fn: A function which will be passed the key and its current
+            value.
+        '''
+        i = self._segment(key)
+        with self._locks[i]:
+            table = self._tables[i]
+            oldval = table.get(key)
+            if oldval is None:
+                return None
+
+            newval = fn(key, oldval)
+            if newval is None:
+                del table[key]
+            else:
+                table[key] = newval
+            return newval
+
+    def merge(self, key, value, fn):
+        '''
+        Atomically sets the value of `key` to `value` if it has none, or
+        otherwise to `fn(oldval, value)`, where `oldval` is its current
+        value. Returns the new value. Should `fn` return `None`, `key` is
+        removed instead.
+
+        :param key: The key to merge the value of.
+        :param value: The value to set, or merge with the current value.
+        :param fn: A function which will be passed the current value and
+            `value`.
+        '''
+        if value is None:
+            raise ValueError('value must not be None')
+
+        i = self._segment(key)
+        with self._locks[i]:
+            table = self._tables[i]
+            oldval = table.get(key)
+            newval = value if oldval is None else fn(oldval, value)
+            if newval is None:
+                del table[key]
+            else:
+                table[key] = newval
+            return newval
+
+    def items(self):
+        '''
+        Returns a weakly consistent iterator over the `(key, value)` pairs.
+        '''
+        for table in self._tables:
+            # Copying a dictionary is atomic, where iterating over one which
+            # is being changed would fail.
+            for item in table.copy().items():
+                yield item
+
+    def keys(self):
+        '''
+        Returns a weakly consistent iterator over the keys.
+        '''
+        for key, _ in self.items():
+            yield key
+
+    def values(self):
+        '''
+        Returns a weakly consistent iterator over the values.
+        '''
+        for _, value in self.items():
+            yield value
@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+'''
+atomos.delay
+
+Delay and Promise data types.
+'''
+
+import threading
+
+import atomos.util as util
+
+# The value of a delay or promise which has not been realized yet.
+_PENDING = object()
+
+
+class Delay(object):
+    '''
+    A value computed at most once, the first time it is dereferenced.
+
+    This is modeled after Clojure's delay. Calling `deref` computes the
+    value by calling `fn(*args, **kwargs)`; threads dereferencing it while
+    that is underway wait for the result, and later calls return it
+    straight away::
+
+        >>> client = Delay(connect, 'db.example.com')
+        >>> client.deref()
+
+    Once realized, the value is read without taking a lock: `deref` costs an
+    attribute load and a comparison. Should `fn` raise an exception, it is
+    raised again by every call to `deref`, rather than `fn` being retried.
+
+    :param fn: The function computing the value.
+    :param \\*args: Arguments to be passed to `fn`.
+    :param \\*\\*kwargs: Keyword arguments to be passed to `fn`.
+    '''
+    def __init__(self, fn, *args, **kwargs):
+        self._value = _PENDING
+        self._error = None
+        self._fn = fn
+        self._args = args
+        self._kwargs = kwargs
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        value = self._value
+        return util.repr(__name__, self,
+                         'pending' if value is _PENDING else value)
+
+    def deref(self):
+        '''
+        Returns the value, computing it first if it has not been yet.
+        '''
+        value = self._value
+        if value is not _PENDING:
+            return value
+
+        return self._realize()
+
+    def _realize(self):
+        with self._lock:
+            if self._value is _PENDING and self._error is None:
+                try:
+                    value = self._fn(*self._args, **self._kwargs)
+                except Exception as e:
+                    self._error = e
+                else:
+                    self._value = value
+                # The function and its arguments are no longer needed, and
+                # should not be kept alive.
+                self._fn = self._args = self._kwargs = None
+
+            if self._error is not None:
+                raise self._error
+
+            return self._value
+
+    def realized(self):
+        '''
+        Returns `True` if the value has been computed, or computing it
+        failed, otherwise `False`.
+        '''
+        return self._value is not _PENDING or self._error is not None
+
+
+class Promise(object):
+    '''
+    A value which is delivered once, by any thread, and which threads may
+    wait for.
+
+    This is modeled after Clojure's promise. `deref` blocks until the value
+    has been delivered, or `timeout` seconds pass::
+
+        >>> result = Promise()
+        >>> result.deliver(42)
+        True
+        >>> result.deref(timeout=1)
+        42
+
+    Once delivered, the value is read without taking a lock: `deref` costs
+    an attribute load and a comparison.
+    '''
+    def __init__(self):
+        self._value = _PENDING
+        self._lock = threading.Lock()
+        self._delivered = threading.Event()
+
+    def __repr__(self):
+        value = self._value
+        return util.repr(__name__, self,
+                         'pending' if value is _PENDING else value)
+
+    def deref(self, timeout=None, default=None):
+        '''
+        Returns the value, waiting for it to be delivered. Returns `default`
+        if `timeout` seconds pass first.
+
+        :param timeout: The longest time to wait, in seconds, or `None` to
+            wait indefinitely.
+        :param default: The value to return on timeout.
+        '''
+        value = self._value
+        if value is not _PENDING:
+            return value
+
+        if not self._delivered.wait(timeout):
+            return default
+
+        return self._value
+
+    def deliver(self, value):
+        '''
+        Delivers `value`, waking up the threads waiting for it. Returns
+        `True`, or `False` if a value was delivered before, in which case
+        `value` is ignored.
+
+        :param value: The value to deliver.
+        '''
+        with self._lock:
+            if self._value is not _PENDING:
+                return False
+
+            self._value = value
+            self._delivered.set()
+            return True
+
+    def realized(self):
+        '''
+        Returns `True` if the value has been delivered, otherwise `False`.
+        '''
+        return self._value is not _PENDING
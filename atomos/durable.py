@@ -0,0 +1,406 @@
+# -*- coding: utf-8 -*-
+'''
+atomos.durable
+
+Durable atom data type, backed by a write-ahead log and snapshots.
+'''
+
+import os
+import pickle
+import struct
+import threading
+import zlib
+
+from six.moves import queue
+
+import atomos.atom
+import atomos.atomic as atomic
+
+
+#: Records are written to the operating system by a background thread, but
+#: never explicitly flushed to disk. They survive the process crashing once
+#: written, but not necessarily the machine crashing.
+ASYNC = 'async'
+
+#: Records are written and flushed to disk in batches by a background thread,
+#: i.e. with group commit. This is the default.
+BATCHED = 'batched'
+
+#: As `BATCHED`, except that `swap`, `reset` and `compare_and_set` do not
+#: return until their record has been flushed to disk.
+SYNC = 'sync'
+
+#: The version of the file layout written by this module. Files written with
+#: a different layout version are refused rather than misread.
+LAYOUT_VERSION = 1
+
+# The log is a sequence of records, each a header of payload length (I),
+# CRC-32 of the payload (I) and log sequence number (Q), followed by the
+# payload. A snapshot is a header of magic (8s), layout version (I), log
+# sequence number (Q) and CRC-32 of the payload (I), followed by the payload.
+_RECORD = struct.Struct('<IIQ')
+_SNAPSHOT = struct.Struct('<8sIQI')
+_MAGIC = b'atomossn'
+_STOP = object()
+
+
+class _LoggedReference(atomic.AtomicReference):
+    '''
+    An AtomicReference which passes every value it commits to `log`, while
+    still holding its lock, so that values are logged in commit order.
+    '''
+    def __init__(self, value, log):
+        super(_LoggedReference, self).__init__(value=value)
+        self._log = log
+
+    def set(self, value):
+        with self._lock.exclusive:
+            self._log(self._value, value)
+            self._seq += 1
+            self._value = value
+            self._seq += 1
+            if self._waiters:
+                self._notify()
+            return value
+
+    def get_and_set(self, value):
+        with self._lock.exclusive:
+            oldval = self._value
+            self._log(oldval, value)
+            self._seq += 1
+            self._value = value
+            self._seq += 1
+            if self._waiters:
+                self._notify()
+            return oldval
+
+    def compare_and_set(self, expect, update):
+        with self._lock.exclusive:
+            if self._value is expect or self._value == expect:
+                self._log(self._value, update)
+                self._seq += 1
+                self._value = update
+                self._seq += 1
+                if self._waiters:
+                    self._notify()
+                return True
+
+            return False
+
+
+class DurableAtom(atomos.atom.Atom):
+    '''
+    Durable atom object type.
+
+    A `DurableAtom` behaves like an `Atom`, except that its state survives
+    restarts. Every committed change is appended to a write-ahead log in
+    `directory`, and every so often a full snapshot of the state is taken and
+    the log truncated. Constructing a `DurableAtom` on an existing directory
+    recovers the state from the snapshot, replaying the log on top of it::
+
+        >>> state = DurableAtom('/var/lib/myapp/state', {'clients': ()})
+        >>> state.swap(lambda s: dict(s, clients=s['clients'] + ('foo',)))
+
+    Committing a change only enqueues it: records are serialized, written and
+    flushed by a background thread, which writes whatever has accumulated as
+    one batch. How durable a change is once `swap` returns is governed by
+    `durability`, see `ASYNC`, `BATCHED` and `SYNC`. In every mode, `sync`
+    blocks until all changes committed so far are on disk.
+
+    By default each record holds the complete new state. Where states are
+    large and changes small, `diff` and `patch` functions may be given
+    instead: `diff(old, new)` should return a compact delta, and
+    `patch(state, delta)` should apply it, returning the new state. Both
+    run on the background thread, or during recovery, never in `swap`.
+
+    As with any atom, states must not be mutated once swapped in. This
+    matters doubly here, since they are serialized after the fact.
+
+    :param directory: The directory holding the log and snapshots. It is
+        created if it does not exist.
+    :param state: The initial state, used only if nothing can be recovered.
+    :param durability: One of `ASYNC`, `BATCHED` or `SYNC`.
+    :param snapshot_every: The number of records after which a snapshot is
+        taken and the log truncated.
+    :param serializer: An object providing `dumps` and `loads`, converting
+        states (or deltas) to and from bytes. Defaults to `pickle`.
+    :param diff: An optional function returning the delta between two
+        states.
+    :param patch: An optional function applying a delta to a state.
+    '''
+    def __init__(self, directory, state=None, durability=BATCHED,
+                 snapshot_every=1000, serializer=pickle, diff=None,
+                 patch=None):
+        if durability not in (ASYNC, BATCHED, SYNC):
+            raise ValueError('unknown durability {0!r}'.format(durability))
+
+        if (diff is None) != (patch is None):
+            raise ValueError('diff and patch must be given together')
+
+        self.directory = directory
+        self._durability = durability
+        self._snapshot_every = snapshot_every
+        self._serializer = serializer
+        self._diff = diff
+        self._patch = patch
+
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+        self._log_path = os.path.join(directory, 'wal')
+        self._snapshot_path = os.path.join(directory, 'snapshot')
+
+        state, self._lsn = self._recover(state)
+        self._durable_lsn = self._lsn
+        self._snapshot_lsn = self._lsn
+        self._error = None
+        self._queue = queue.Queue()
+        self._durable = threading.Condition(threading.Lock())
+
+        super(DurableAtom, self).__init__(state)
+        self._state = _LoggedReference(state, self._enqueue)
+
+        self._log_file = open(self._log_path, 'ab')
+        self._writer = threading.Thread(target=self._run,
+                                        name='DurableAtom writer')
+        self._writer.daemon = True
+        self._writer.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_value, exc_type, tb):
+        self.close()
+
+    def _recover(self, state):
+        lsn = 0
+        if os.path.exists(self._snapshot_path):
+            with open(self._snapshot_path, 'rb') as f:
+                data = f.read()
+
+            magic, version, lsn, crc = _SNAPSHOT.unpack_from(data)
+            payload = data[_SNAPSHOT.size:]
+            if magic != _MAGIC or version != LAYOUT_VERSION:
+                raise ValueError('{0} is not a snapshot of layout version {1}'
+                                 .format(self._snapshot_path, LAYOUT_VERSION))
+
+            if zlib.crc32(payload) & 0xffffffff != crc:
+                raise ValueError('{0} is corrupt'.format(self._snapshot_path))
+
+            state = self._serializer.loads(payload)
+
+        if not os.path.exists(self._log_path):
+            return state, lsn
+
+        with open(self._log_path, 'r+b') as f:
+            data = f.read()
+            offset = 0
+            while offset + _RECORD.size <= len(data):
+                length, crc, record_lsn = _RECORD.unpack_from(data, offset)
+                start = offset + _RECORD.size
+                payload = data[start:start + length]
+                if len(payload) < length or \
+                        zlib.crc32(payload) & 0xffffffff != crc:
+                    break
+
+                # Records up to the snapshot may remain should a crash have
+                # happened between taking the snapshot and truncating the log.
+                if record_lsn > lsn:
+                    record = self._serializer.loads(payload)
+                    if self._patch is None:
+                        state = record
+                    else:
+                        state = self._patch(state, record)
+                    lsn = record_lsn
+
+                offset = start + length
+
+            # Anything beyond the last intact record is the remains of a write
+            # torn by a crash, and is discarded.
+            if offset < len(data):
+                f.truncate(offset)
+
+        return state, lsn
+
+    def _enqueue(self, oldval, newval):
+        # Called by `_LoggedReference` with its lock held.
+        self._lsn += 1
+        self._queue.put((self._lsn, oldval, newval))
+
+    def _run(self):
+        stop = False
+        while not stop:
+            batch = [self._queue.get()]
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            if batch[-1] is _STOP:
+                batch.pop()
+                stop = True
+
+            try:
+                self._write(batch)
+            except Exception as e:
+                with self._durable:
+                    self._error = e
+                    self._durable.notify_all()
+                return
+
+    def _write(self, batch):
+        if batch:
+            for lsn, oldval, newval in batch:
+                if self._diff is None:
+                    record = newval
+                else:
+                    record = self._diff(oldval, newval)
+
+                payload = self._serializer.dumps(record)
+                self._log_file.write(_RECORD.pack(len(payload),
+                                                  zlib.crc32(payload) &
+                                                  0xffffffff,
+                                                  lsn))
+                self._log_file.write(payload)
+
+            self._log_file.flush()
+            if self._durability != ASYNC:
+                os.fsync(self._log_file.fileno())
+
+            lsn, _, state = batch[-1]
+            if lsn - self._snapshot_lsn >= self._snapshot_every:
+                self._snapshot(state, lsn)
+
+            with self._durable:
+                self._durable_lsn = lsn
+                self._durable.notify_all()
+
+    def _snapshot(self, state, lsn):
+        payload = self._serializer.dumps(state)
+        tmp_path = self._snapshot_path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(_SNAPSHOT.pack(_MAGIC, LAYOUT_VERSION, lsn,
+                                   zlib.crc32(payload) & 0xffffffff))
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+
+        os.rename(tmp_path, self._snapshot_path)
+        dirfd = os.open(self.directory, os.O_RDONLY)
+        try:
+            os.fsync(dirfd)
+        finally:
+            os.close(dirfd)
+
+        # Every record written so far is covered by the snapshot, so the log
+        # can be compacted by simply truncating it.
+        self._log_file.truncate(0)
+        os.fsync(self._log_file.fileno())
+        self._snapshot_lsn = lsn
+
+    def _raise_error(self):
+        if self._error is not None:
+            raise IOError('DurableAtom writer failed: {0}'
+                          .format(self._error))
+
+    def swap(self, fn, *args, **kwargs):
+        '''
+        Given a mutator `fn`, calls `fn` with the atom's current state, `args`,
+        and `kwargs`. The return value of this invocation becomes the new value
+        of the atom. Returns the new value.
+
+        :param fn: A function which will be passed the current state. Should
+            return a new state. This absolutely *MUST NOT* mutate the
+            reference to the current state! If it does, this function may loop
+            indefinitely.
+        :param \\*args: Arguments to be passed to `fn`.
+        :param \\*\\*kwargs: Keyword arguments to be passed to `fn`.
+        '''
+        self._raise_error()
+        newval = super(DurableAtom, self).swap(fn, *args, **kwargs)
+        if self._durability == SYNC:
+            self.sync()
+
+        return newval
+
+    def commute(self, fn, *args, **kwargs):
+        '''
+        Like `swap`, but for a commutative `fn`, allowing concurrent updates
+        to be combined into one state transition, and therefore one record.
+        See `Atom.commute`.
+
+        :param fn: A commutative function which will be passed the current
+            state. Should return a new state.
+        :param \\*args: Arguments to be passed to `fn`.
+        :param \\*\\*kwargs: Keyword arguments to be passed to `fn`.
+        '''
+        self._raise_error()
+        newval = super(DurableAtom, self).commute(fn, *args, **kwargs)
+        if self._durability == SYNC:
+            self.sync()
+
+        return newval
+
+    def reset(self, newval):
+        '''
+        Resets the atom's value to `newval`, returning `newval`.
+
+        :param newval: The new value to set.
+        '''
+        self._raise_error()
+        super(DurableAtom, self).reset(newval)
+        if self._durability == SYNC:
+            self.sync()
+
+        return newval
+
+    def compare_and_set(self, oldval, newval):
+        '''
+        Given `oldval` and `newval`, sets the atom's value to `newval` if and
+        only if `oldval` is the atom's current value. Returns `True` upon
+        success, otherwise `False`.
+
+        :param oldval: The old expected value.
+        :param newval: The new value which will be set if and only if `oldval`
+            equals the current value.
+        '''
+        self._raise_error()
+        ret = super(DurableAtom, self).compare_and_set(oldval, newval)
+        if ret and self._durability == SYNC:
+            self.sync()
+
+        return ret
+
+    def sync(self, timeout=None):
+        '''
+        Blocks until every change committed so far has been written and
+        flushed to disk, or `timeout` seconds have passed. Returns `True` if
+        the changes are durable, otherwise `False`.
+
+        Note that in `ASYNC` mode, changes are written but not flushed.
+
+        :param timeout: The longest time to wait, in seconds, or `None` to
+            wait indefinitely.
+        '''
+        lsn = self._lsn
+        with self._durable:
+            self._durable.wait_for(lambda: self._durable_lsn >= lsn or
+                                   self._error is not None, timeout)
+
+        self._raise_error()
+        return self._durable_lsn >= lsn
+
+    def close(self):
+        '''
+        Writes out every change committed so far, stops the background
+        thread and closes the log. The atom must not be changed afterwards.
+        '''
+        if self._writer is None:
+            return
+
+        self._queue.put(_STOP)
+        self._writer.join()
+        self._writer = None
+        self._log_file.close()
+        self._raise_error()
@@ -0,0 +1,524 @@
+# -*- coding: utf-8 -*-
+'''
+atomos.metrics
+
+Counters, gauges and histograms which are cheap to record from many threads,
+exported through shared memory.
+'''
+
+import json
+import mmap
+import threading
+import time
+
+import atomos.util as util
+
+_MAGIC = b'ATOMOSM\x01'
+# The header holds the magic, a sequence number which is odd while the
+# directory is being written, and the length of the directory, which follows
+# it. Metric cells start at `_CELLS_START`.
+_HEADER_SIZE = 32
+_CELLS_START = 1 << 16
+# Cells are signed 64-bit integers.
+_CELL_MIN = -(1 << 63)
+_CELL_MAX = (1 << 63) - 1
+# How many times, and how long at most between them, a reader reads the
+# directory again while its sequence number is odd before giving up on a
+# writer which may have died mid-update.
+_DIRECTORY_RETRIES = 100
+_DIRECTORY_BACKOFF = 0.01
+
+
+def _check_int(name, value):
+    if not isinstance(value, int):
+        raise TypeError('{0} must be of type int'.format(name))
+
+
+def _check_cell(value):
+    if not _CELL_MIN <= value <= _CELL_MAX:
+        raise OverflowError('value out of 64-bit range')
+    return value
+
+
+class Counter(object):
+    '''
+    A monotonically increasing count, created by way of `Registry.counter`.
+
+    A counter is striped: every thread adds to a cell of its own, which no
+    other thread writes, so that incrementing it takes no lock and never
+    contends. Reading it sums the cells.
+    '''
+    kind = 'counter'
+
+    def __init__(self, registry, name, offset):
+        self._registry = registry
+        self.name = name
+        self._offset = offset
+
+    def __repr__(self):
+        return util.repr(__name__, self, self.get())
+
+    def _size(self):
+        return self._registry._stripes
+
+    def _entry(self):
+        return {'name': self.name, 'kind': self.kind, 'offset': self._offset}
+
+    def inc(self, n=1):
+        '''
+        Adds `n` to the count.
+
+        :param n: The amount to add.
+        '''
+        _check_int('n', n)
+        stripe = self._registry._stripe()
+        i = self._offset + stripe.index
+        cells = self._registry._cells
+        if stripe.lock is None:
+            cells[i] = _check_cell(cells[i] + n)
+        else:
+            with stripe.lock:
+                cells[i] = _check_cell(cells[i] + n)
+
+    def get(self):
+        '''
+        Returns the count.
+        '''
+        offset = self._offset
+        return sum(self._registry._cells[offset:offset + self._size()])
+
+
+class Gauge(object):
+    '''
+    A floating point value which is set rather than accumulated, created by
+    way of `Registry.gauge`. Setting it is a single store.
+    '''
+    kind = 'gauge'
+
+    def __init__(self, registry, name, offset):
+        self._registry = registry
+        self.name = name
+        self._offset = offset
+
+    def __repr__(self):
+        return util.repr(__name__, self, self.get())
+
+    def _size(self):
+        return 1
+
+    def _entry(self):
+        return {'name': self.name, 'kind': self.kind, 'offset': self._offset}
+
+    def set(self, value):
+        '''
+        Sets the value to `value`.
+
+        :param value: The value to set.
+        '''
+        self._registry._floats[self._offset] = value
+
+    def get(self):
+        '''
+        Returns the value.
+        '''
+        return self._registry._floats[self._offset]
+
+
+class HistogramSnapshot(object):
+    '''
+    The distribution recorded by a `Histogram` at one point in time.
+
+    :param count: The number of values recorded.
+    :param total: The sum of the values recorded.
+    :param buckets: A list of `(lowest, highest, count)` tuples, one for each
+        non-empty bucket, in increasing order.
+    '''
+    def __init__(self, count, total, buckets):
+        self.count = count
+        self.total = total
+        self.buckets = buckets
+
+    def __repr__(self):
+        return util.repr(__name__, self, self.count)
+
+    def mean(self):
+        '''
+        Returns the mean of the values recorded, or `None` if there are none.
+        '''
+        if not self.count:
+            return None
+
+        return self.total / float(self.count)
+
+    def percentile(self, p):
+        '''
+        Returns the highest value equivalent to the `p`th percentile of the
+        values recorded, or `None` if there are none.
+
+        :param p: The percentile, between 0 and 100.
+        '''
+        rank = p / 100.0 * self.count
+        seen = 0
+        for _, highest, count in self.buckets:
+            seen += count
+            if seen >= rank:
+                return highest
+
+        return None
+
+
+class Histogram(object):
+    '''
+    The distribution of non-negative integers, e.g. latencies in
+    microseconds, created by way of `Registry.histogram`.
+
+    Like an HDR histogram, it has a fixed set of buckets: one for each value
+    below `2 ** sub_bucket_bits`, and above that `2 ** (sub_bucket_bits - 1)`
+    for each power of two up to `max_value`, so that every value is counted
+    in a bucket no wider than `2 ** -(sub_bucket_bits - 1)` times the value.
+    Larger values are counted in the last bucket. Finding the bucket of a
+    value takes a few integer operations, and, like counters, histograms are
+    striped, so that recording a value takes no lock and never contends.
+    '''
+    kind = 'histogram'
+
+    def __init__(self, registry, name, offset, max_value, sub_bucket_bits):
+        if sub_bucket_bits < 1:
+            raise ValueError('sub_bucket_bits must be positive')
+
+        self._registry = registry
+        self.name = name
+        self._offset = offset
+        self.max_value = max_value
+        self.sub_bucket_bits = sub_bucket_bits
+        self._linear = 1 << sub_bucket_bits
+        self._half = self._linear >> 1
+        self._buckets = self._bucket(max_value) + 1
+        # Every stripe holds the bucket counts followed by the sum.
+        self._stride = self._buckets + 1
+
+    def __repr__(self):
+        return util.repr(__name__, self, self.snapshot().count)
+
+    def _size(self):
+        return self._registry._stripes * self._stride
+
+    def _entry(self):
+        return {'name': self.name, 'kind': self.kind, 'offset': self._offset,
+                'max_value': self.max_value,
+                'sub_bucket_bits': self.sub_bucket_bits}
+
+    def _bucket(self, value):
+        if value < self._linear:
+            return value
+
+        shift = value.bit_length() - self.sub_bucket_bits
+        return self._half * shift + (value >> shift)
+
+    def _bounds(self, bucket):
+        if bucket < self._linear:
+            return bucket, bucket
+
+        shift, top = divmod(bucket - self._linear, self._half)
+        shift += 1
+        top += self._half
+        return top << shift, ((top + 1) << shift) - 1
+
+    def record(self, value):
+        '''
+        Records `value`.
+
+        :param value: A non-negative integer.
+        '''
+        _check_int('value', value)
+        if value < 0:
+            raise ValueError('value must not be negative')
+
+        bucket = self._bucket(value)
+        if bucket >= self._buckets:
+            bucket = self._buckets - 1
+
+        registry = self._registry
+        stripe = registry._stripe()
+        i = self._offset + stripe.index * self._stride
+        cells = registry._cells
+        # The sum is checked before either cell is written, so that a value
+        # which overflows it is not counted in its bucket either.
+        total = i + self._buckets
+        if stripe.lock is None:
+            cells[total] = _check_cell(cells[total] + value)
+            cells[i + bucket] += 1
+        else:
+            with stripe.lock:
+                cells[total] = _check_cell(cells[total] + value)
+                cells[i + bucket] += 1
+
+    def snapshot(self):
+        '''
+        Returns a `HistogramSnapshot` of the values recorded so far.
+        '''
+        cells = self._registry._cells
+        start, end = self._offset, self._offset + self._size()
+        stride = self._stride
+        counts = [sum(cells[start + b:end:stride])
+                  for b in range(self._stride)]
+        total = counts.pop()
+        buckets = [self._bounds(b) + (count,)
+                   for b, count in enumerate(counts) if count]
+        return HistogramSnapshot(sum(counts), total, buckets)
+
+    def get(self):
+        '''
+        Returns a `HistogramSnapshot` of the values recorded so far.
+        '''
+        return self.snapshot()
+
+
+class _Stripe(object):
+    '''
+    The cell index of a thread, which it gives back to the registry once it
+    exits. Threads beyond the number of stripes share the first one, under a
+    lock.
+    '''
+    def __init__(self, registry, index, lock=None):
+        self._registry = registry
+        self.index = index
+        self.lock = lock
+
+    def __del__(self):
+        if self.lock is None:
+            self._registry._free_stripes.append(self.index)
+
+
+class Registry(object):
+    '''
+    A set of named metrics, whose values live in a memory map, so that a
+    separate process may read them without interrupting the recording one::
+
+        >>> registry = Registry('/dev/shm/myapp.metrics')
+        >>> requests = registry.counter('requests')
+        >>> requests.inc()
+        >>> latency = registry.histogram('latency_us')
+        >>> latency.record(250)
+
+    Recording takes no lock and allocates no objects of its own: every thread
+    is given a stripe of its own, i.e. its own cell in every counter and its
+    own row of buckets in every histogram, which no other thread writes and
+    which a plain store therefore updates safely. Counters and histograms sum
+    their stripes when read. Should there be more threads than `stripes`,
+    the extra ones share a stripe under a lock.
+
+    The map starts with a directory of the metrics, in JSON. A scraper reads
+    it, and the metrics, by attaching to the same file with `Registry.attach`
+    or `read`, which never write to it. Cells are read one at a time, so that
+    a snapshot of many metrics is not atomic, but each value is.
+
+    A registry belongs to one process; forked processes should create
+    registries of their own.
+
+    :param path: The file to map, or `None` for anonymous memory.
+    :param size: The size of the map, in bytes.
+    :param stripes: The number of stripes.
+    '''
+    def __init__(self, path=None, size=1 << 22, stripes=16, _readonly=False):
+        if size <= _CELLS_START:
+            raise ValueError('size must be larger than {0}'.format(
+                _CELLS_START))
+
+        self._path = path
+        self._stripes = stripes
+        self._metrics = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._free_stripes = list(range(stripes - 1, 0, -1))
+        self._shared_stripe = _Stripe(self, 0, threading.Lock())
+        self._readonly = _readonly
+
+        if path is None:
+            self._mmap = mmap.mmap(-1, size)
+        elif _readonly:
+            with open(path, 'rb') as f:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            if (len(self._mmap) <= _CELLS_START or
+                    self._mmap[:len(_MAGIC)] != _MAGIC):
+                self._mmap.close()
+                raise ValueError('{0} is not a metrics file'.format(path))
+        else:
+            with open(path, 'w+b') as f:
+                f.truncate(size)
+                self._mmap = mmap.mmap(f.fileno(), size)
+
+        self._cells = memoryview(self._mmap).cast('q')
+        self._floats = memoryview(self._mmap).cast('d')
+        self._next_offset = _CELLS_START // 8
+        if not _readonly:
+            self._mmap[:len(_MAGIC)] = _MAGIC
+            self._write_directory()
+
+    def __repr__(self):
+        return util.repr(__name__, self, sorted(self._metrics))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.close()
+
+    @classmethod
+    def attach(cls, path):
+        '''
+        Returns a read-only registry of the metrics exported to `path` by
+        another registry, e.g. in another process. Raises `RuntimeError` if
+        the directory stays mid-update, as when its writer died writing it.
+
+        :param path: The file the other registry maps.
+        '''
+        registry = cls(path, _readonly=True)
+        try:
+            directory = registry._read_directory()
+        except Exception:
+            registry.close()
+            raise
+        registry._stripes = directory['stripes']
+        for entry in directory['metrics']:
+            registry._metrics[entry['name']] = registry._from_entry(entry)
+        return registry
+
+    def close(self):
+        '''
+        Unmaps the memory. The metrics may no longer be used afterwards.
+        '''
+        self._cells.release()
+        self._floats.release()
+        self._mmap.close()
+
+    def _stripe(self):
+        try:
+            return self._local.stripe
+        except AttributeError:
+            try:
+                stripe = _Stripe(self, self._free_stripes.pop())
+            except IndexError:
+                stripe = self._shared_stripe
+            self._local.stripe = stripe
+            return stripe
+
+    def _from_entry(self, entry):
+        kind = entry['kind']
+        if kind == Counter.kind:
+            return Counter(self, entry['name'], entry['offset'])
+        if kind == Gauge.kind:
+            return Gauge(self, entry['name'], entry['offset'])
+
+        return Histogram(self, entry['name'], entry['offset'],
+                         entry['max_value'], entry['sub_bucket_bits'])
+
+    def _write_directory(self):
+        data = json.dumps({'stripes': self._stripes,
+                           'metrics': [m._entry()
+                                       for m in self._metrics.values()]},
+                          sort_keys=True).encode('utf-8')
+        if _HEADER_SIZE + len(data) > _CELLS_START:
+            raise ValueError('too many metrics')
+
+        # The sequence number is odd while the directory is being written, as
+        # in a seqlock, so that readers know to read it again.
+        self._cells[1] += 1
+        self._mmap[_HEADER_SIZE:_HEADER_SIZE + len(data)] = data
+        self._cells[2] = len(data)
+        self._cells[1] += 1
+
+    def _read_directory(self):
+        delay = 0.0001
+        for _ in range(_DIRECTORY_RETRIES):
+            seq = self._cells[1]
+            if not seq & 1:
+                length = self._cells[2]
+                data = self._mmap[_HEADER_SIZE:_HEADER_SIZE + length]
+                if self._cells[1] == seq:
+                    return json.loads(data.decode('utf-8'))
+
+            time.sleep(delay)
+            delay = min(delay * 2, _DIRECTORY_BACKOFF)
+
+        raise RuntimeError('{0}: the directory is still being written; its '
+                           'writer may have died'.format(self._path))
+
+    def _register(self, name, cls, *args):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is not None:
+                if not isinstance(metric, cls):
+                    raise ValueError('{0} is a {1}'.format(name, metric.kind))
+                return metric
+
+            if self._readonly:
+                raise KeyError(name)
+
+            metric = cls(self, name, self._next_offset, *args)
+            end = self._next_offset + metric._size()
+            if end > len(self._cells):
+                raise ValueError('registry is full')
+
+            self._metrics[name] = metric
+            try:
+                self._write_directory()
+            except ValueError:
+                del self._metrics[name]
+                raise
+
+            self._next_offset = end
+            return metric
+
+    def counter(self, name):
+        '''
+        Returns the counter named `name`, creating it if need be.
+
+        :param name: The name of the counter.
+        '''
+        return self._register(name, Counter)
+
+    def gauge(self, name):
+        '''
+        Returns the gauge named `name`, creating it if need be.
+
+        :param name: The name of the gauge.
+        '''
+        return self._register(name, Gauge)
+
+    def histogram(self, name, max_value=1 << 40, sub_bucket_bits=5):
+        '''
+        Returns the histogram named `name`, creating it if need be.
+
+        :param name: The name of the histogram.
+        :param max_value: The highest value to distinguish.
+        :param sub_bucket_bits: The precision; values are counted in buckets
+            no wider than `2 ** -(sub_bucket_bits - 1)` times the value.
+        '''
+        return self._register(name, Histogram, max_value, sub_bucket_bits)
+
+    def __getitem__(self, name):
+        return self._metrics[name]
+
+    def __contains__(self, name):
+        return name in self._metrics
+
+    def snapshot(self):
+        '''
+        Returns a dictionary of the values of every metric: an integer for
+        counters, a float for gauges, and a `HistogramSnapshot` for
+        histograms.
+        '''
+        return dict((name, metric.get())
+                    for name, metric in list(self._metrics.items()))
+
+
+def read(path):
+    '''
+    Returns a snapshot of the metrics exported to `path`, as returned by
+    `Registry.snapshot`.
+
+    :param path: The file a registry maps.
+    '''
+    with Registry.attach(path) as registry:
+        return registry.snapshot()
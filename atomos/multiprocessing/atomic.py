@@ -37,18 +37,67 @@ class _AtomicReference(atomic.AtomicReference):
         return self._value
 
 
+class _AtomicReferenceProxy(multiprocessing.managers.BaseProxy):
+    '''
+    A proxy to an `_AtomicReference` held by the manager process.
+
+    Besides forwarding the methods of the reference, this implements
+    `wait_until` locally, by way of `await_change`, so that the predicate
+    runs in the calling process and need not be picklable.
+    '''
+    _exposed_ = ('get',
+                 'get_version',
+                 'get_with_version',
+                 'get_if_changed',
+                 'await_change',
+                 'set',
+                 'get_and_set',
+                 'compare_and_set',
+                 '_proxy_value',
+                 '__repr__')
+
+    def __repr__(self):
+        return self._callmethod('__repr__')
+
+    def get(self):
+        return self._callmethod('get')
+
+    def get_version(self):
+        return self._callmethod('get_version')
+
+    def get_with_version(self):
+        return self._callmethod('get_with_version')
+
+    def get_if_changed(self, since_version):
+        return self._callmethod('get_if_changed', (since_version,))
+
+    def await_change(self, since_version, timeout=None):
+        return self._callmethod('await_change', (since_version, timeout))
+
+    def wait_until(self, pred, timeout=None):
+        return util.wait_until(self.get_with_version, self.await_change, pred,
+                               timeout)
+
+    def set(self, value):
+        return self._callmethod('set', (value,))
+
+    def get_and_set(self, value):
+        return self._callmethod('get_and_set', (value,))
+
+    def compare_and_set(self, expect, update):
+        return self._callmethod('compare_and_set', (expect, update))
+
+    def _proxy_value(self):
+        return self._callmethod('_proxy_value')
+
+
 class AtomicManager(multiprocessing.managers.BaseManager):
     pass
 
 
 AtomicManager.register('AtomicReference',
                        _AtomicReference,
-                       exposed=['get',
-                                'set',
-                                'get_and_set',
-                                'compare_and_set',
-                                '_proxy_value',
-                                '__repr__'])
+                       proxytype=_AtomicReferenceProxy)
 
 # HACK: This is a bit of a hack. Essentially we need to run a manager which
 # specifically exposes the multiprocessing version of AtomicReference. If we
@@ -81,6 +130,13 @@ class AtomicCtypesReference(object):
         '''
         self._typecode_or_type = typecode_or_type
         self._reference = multiprocessing.Value(self._typecode_or_type, value)
+        # The version, the number of processes blocked in `await_change` and
+        # the condition they wait on are all guarded by the lock of the value
+        # itself, which writers hold anyway. Writers only signal the condition
+        # while there are waiters.
+        self._version = multiprocessing.RawValue(ctypes.c_longlong)
+        self._waiters = multiprocessing.RawValue(ctypes.c_int)
+        self._changed = multiprocessing.Condition(self._reference.get_lock())
 
     def __repr__(self):
         return util.repr(__name__, self, self._reference)
@@ -92,6 +148,73 @@ class AtomicCtypesReference(object):
         with self._reference.get_lock():
             return self._reference.value
 
+    def get_version(self):
+        '''
+        Returns the version, which is bumped by every write.
+        '''
+        return self._version.value
+
+    def get_with_version(self):
+        '''
+        Returns a tuple of the value and its version.
+        '''
+        with self._reference.get_lock():
+            return self._reference.value, self._version.value
+
+    def get_if_changed(self, since_version):
+        '''
+        Returns a tuple of the value and its version if the version differs
+        from `since_version`, otherwise `None`.
+
+        :param since_version: The version last seen by the caller.
+        '''
+        value, version = self.get_with_version()
+        if version == since_version:
+            return None
+
+        return value, version
+
+    def await_change(self, since_version, timeout=None):
+        '''
+        Blocks until the version differs from `since_version`, then returns a
+        tuple of the value and its version. Returns `None` if `timeout`
+        seconds pass first.
+
+        :param since_version: The version last seen by the caller.
+        :param timeout: The longest time to wait, in seconds, or `None` to
+            wait indefinitely.
+        '''
+        with self._changed:
+            self._waiters.value += 1
+            try:
+                changed = self._changed.wait_for(
+                    lambda: self._version.value != since_version, timeout)
+            finally:
+                self._waiters.value -= 1
+
+            if not changed:
+                return None
+
+            return self._reference.value, self._version.value
+
+    def wait_until(self, pred, timeout=None):
+        '''
+        Blocks until `pred`, called with the value, returns true. Returns
+        `True` once it does, or `False` if `timeout` seconds pass first.
+
+        :param pred: A function which will be passed the value.
+        :param timeout: The longest time to wait, in seconds, or `None` to
+            wait indefinitely.
+        '''
+        return util.wait_until(self.get_with_version, self.await_change, pred,
+                               timeout)
+
+    def _signal(self):
+        # Must be called with the lock held, after every write.
+        self._version.value += 1
+        if self._waiters.value:
+            self._changed.notify_all()
+
     def set(self, value):
         '''
         Atomically sets the value to `value`.
@@ -100,6 +223,7 @@ class AtomicCtypesReference(object):
         '''
         with self._reference.get_lock():
             self._reference.value = value
+            self._signal()
             return value
 
     def get_and_set(self, value):
@@ -111,6 +235,7 @@ class AtomicCtypesReference(object):
         with self._reference.get_lock():
             oldval = self._reference.value
             self._reference.value = value
+            self._signal()
             return oldval
 
     def compare_and_set(self, expect, update):
@@ -125,6 +250,7 @@ class AtomicCtypesReference(object):
         with self._reference.get_lock():
             if self._reference.value == expect:
                 self._reference.value = update
+                self._signal()
                 return True
 
             return False
@@ -174,6 +300,7 @@ class AtomicNumber(AtomicCtypesReference):
         '''
         with self._reference.get_lock():
             self._reference.value += delta
+            self._signal()
             return self._reference.value
 
     def get_and_add(self, delta):
@@ -185,6 +312,7 @@ class AtomicNumber(AtomicCtypesReference):
         with self._reference.get_lock():
             oldval = self._reference.value
             self._reference.value += delta
+            self._signal()
             return oldval
 
     def subtract_and_get(self, delta):
@@ -195,6 +323,7 @@ class AtomicNumber(AtomicCtypesReference):
         '''
         with self._reference.get_lock():
             self._reference.value -= delta
+            self._signal()
             return self._reference.value
 
     def get_and_subtract(self, delta):
@@ -207,6 +336,7 @@ class AtomicNumber(AtomicCtypesReference):
         with self._reference.get_lock():
             oldval = self._reference.value
             self._reference.value -= delta
+            self._signal()
             return oldval
 
 
@@ -256,3 +386,19 @@ class AtomicFloat(AtomicNumber):
             raise TypeError('_value must be of type float')
 
         super(AtomicFloat, self).__setattr__(name, value)
+
+
+class AtomicBitSet(atomic.AtomicBitSet):
+    '''
+    Same as atomos.atomic.AtomicBitSet, except its words are a ctypes array
+    in shared memory and its stripes are locked with multiprocessing locks,
+    so that processes may share it.
+    '''
+    def __repr__(self):
+        return util.repr(__name__, self, self.popcount())
+
+    def _new_words(self, count):
+        return multiprocessing.RawArray(ctypes.c_uint64, count)
+
+    def _new_lock(self):
+        return multiprocessing.Lock()
@@ -0,0 +1,493 @@
+# -*- coding: utf-8 -*-
+'''
+atomos.multiprocessing.named
+
+Atomic primitives which are created and attached by name, and so may be
+shared between unrelated processes.
+'''
+
+import os
+import struct
+import sys
+import tempfile
+import zlib
+
+from multiprocessing import shared_memory
+
+import six
+
+import atomos.util as util
+
+if six.PY3:
+    long = int
+
+
+#: The version of the segment layout written by this module. Segments with a
+#: different layout version are refused rather than misread.
+LAYOUT_VERSION = 1
+
+#: The longest name, in bytes once encoded as UTF-8, an atomic may have.
+MAX_NAME_LENGTH = 40
+
+# A segment consists of a 64 byte header followed by `capacity` 64 byte slots:
+#
+#   header: magic (8s), layout version (I), capacity (I), attachments (I)
+#   slot:   name (40s), kind (c), reference count (I), value (8 bytes)
+#
+# Slots form an open addressing hash table keyed by name. A slot whose kind is
+# `_EMPTY` has never been used and ends a probe, whereas one whose kind is
+# `_FREED` was released and may be reused, but does not end a probe.
+_MAGIC = b'atomosrg'
+_HEADER = struct.Struct('<8sIII44x')
+_SLOT = struct.Struct('<40sc3xI')
+_SLOT_SIZE = 64
+_VALUE_OFFSET = 48
+_EMPTY = b'\x00'
+_FREED = b'\xff'
+
+
+def _lock_path(name):
+    directory = '/dev/shm' if os.path.isdir('/dev/shm') else \
+        tempfile.gettempdir()
+    return os.path.join(directory, name + '.lock')
+
+
+def _open_segment(name, create, size=0):
+    # The segment's lifetime is managed by the registry's reference count, so
+    # it must not be unlinked by the resource tracker when this process exits.
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name, create=create, size=size,
+                                          track=False)
+
+    segment = shared_memory.SharedMemory(name, create=create, size=size)
+    try:
+        from multiprocessing import resource_tracker
+        resource_tracker.unregister(segment._name, 'shared_memory')
+    except (ImportError, AttributeError):  # pragma: no cover
+        pass
+
+    return segment
+
+
+class Registry(object):
+    '''
+    A registry of named atomics, all of which live in a single shared memory
+    segment.
+
+    Any process which constructs a registry with the same `name` attaches the
+    same segment, regardless of how it was started, so named atomics work
+    with the `spawn` and `forkserver` start methods as well as between
+    separately launched processes::
+
+        >>> registry = Registry('myapp')
+        >>> requests = AtomicLong(registry, 'requests')
+        >>> requests.add_and_get(1)
+
+    Both the segment and its slots are reference counted: an atomic's slot is
+    released once every process has closed it, and the segment is unlinked
+    once every process has closed the registry. A process which exits without
+    closing the registry leaves the segment in place, in which case `unlink`
+    removes it.
+
+    Operations on an atomic are serialized across processes by a byte-range
+    lock on a lock file next to the segment, one byte per slot, so distinct
+    atomics do not contend with one another. Reads take no lock at all. The
+    lock file is left in place when the segment is unlinked.
+
+    Note that a process should attach a given registry only once, since
+    closing a registry releases every lock this process holds on its lock
+    file.
+
+    :param name: The name of the shared memory segment.
+    :param capacity: The number of atomics the segment can hold. Only used
+        if the segment does not exist yet.
+    '''
+    def __init__(self, name, capacity=4096):
+        self.name = name
+
+        self._lock_fd = os.open(_lock_path(name), os.O_RDWR | os.O_CREAT,
+                                0o600)
+        self._lock = util.FileLock(self._lock_fd, start=0, length=1)
+        self._segment = None
+        try:
+            with self._lock:
+                self._attach_segment(capacity)
+        except BaseException:
+            os.close(self._lock_fd)
+            raise
+
+    def __repr__(self):
+        return util.repr(__name__, self, repr(self.name))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_value, exc_type, tb):
+        self.close()
+
+    def _attach_segment(self, capacity):
+        # Must be called with the lock held.
+        try:
+            segment = _open_segment(self.name, create=True,
+                                    size=_HEADER.size + capacity * _SLOT_SIZE)
+            _HEADER.pack_into(segment.buf, 0, _MAGIC, LAYOUT_VERSION,
+                              capacity, 0)
+        except FileExistsError:
+            segment = _open_segment(self.name, create=False)
+
+        magic, version, capacity, attached = _HEADER.unpack_from(segment.buf)
+        if magic != _MAGIC or version != LAYOUT_VERSION:
+            segment.close()
+            raise ValueError('{0} is not a registry of layout version {1}'
+                             .format(self.name, LAYOUT_VERSION))
+
+        _HEADER.pack_into(segment.buf, 0, magic, version, capacity,
+                          attached + 1)
+        self._segment = segment
+        self.capacity = capacity
+
+    def _probe(self, encoded):
+        # Yields the index of every slot on `encoded`'s probe sequence.
+        start = zlib.crc32(encoded) % self.capacity
+        for i in range(self.capacity):
+            yield (start + i) % self.capacity
+
+    def _slot_offset(self, index):
+        return _HEADER.size + index * _SLOT_SIZE
+
+    def _attach(self, name, kind, initial):
+        '''
+        Attaches the atomic called `name`, creating it with the value bytes
+        `initial` if needed. Returns the index of its slot.
+        '''
+        encoded = name.encode('utf-8')
+        if len(encoded) > MAX_NAME_LENGTH:
+            raise ValueError('name longer than {0} bytes'
+                             .format(MAX_NAME_LENGTH))
+
+        buf = self._segment.buf
+        with self._lock:
+            reusable = None
+            for index in self._probe(encoded):
+                offset = self._slot_offset(index)
+                slot_name, slot_kind, refs = _SLOT.unpack_from(buf, offset)
+                if slot_kind == _EMPTY:
+                    break
+
+                if slot_kind == _FREED:
+                    if reusable is None:
+                        reusable = index
+                    continue
+
+                if slot_name.rstrip(b'\0') == encoded:
+                    if slot_kind != kind:
+                        raise TypeError('{0} holds a value of another type'
+                                        .format(name))
+
+                    _SLOT.pack_into(buf, offset, slot_name, kind, refs + 1)
+                    return index
+            else:
+                if reusable is None:
+                    raise ValueError('registry {0} is full'.format(self.name))
+
+            if reusable is not None:
+                index = reusable
+
+            offset = self._slot_offset(index)
+            _SLOT.pack_into(buf, offset, encoded, kind, 1)
+            buf[offset + _VALUE_OFFSET:offset + _VALUE_OFFSET + 8] = initial
+            return index
+
+    def _detach(self, index):
+        buf = self._segment.buf
+        offset = self._slot_offset(index)
+        with self._lock:
+            name, kind, refs = _SLOT.unpack_from(buf, offset)
+            if refs > 1:
+                _SLOT.pack_into(buf, offset, name, kind, refs - 1)
+            else:
+                _SLOT.pack_into(buf, offset, b'', _FREED, 0)
+
+    def names(self):
+        '''
+        Returns the names of the atomics currently in the registry.
+        '''
+        buf = self._segment.buf
+        names = []
+        with self._lock:
+            for index in range(self.capacity):
+                name, kind, _ = _SLOT.unpack_from(buf,
+                                                  self._slot_offset(index))
+                if kind not in (_EMPTY, _FREED):
+                    names.append(name.rstrip(b'\0').decode('utf-8'))
+
+        return names
+
+    def close(self):
+        '''
+        Detaches this process from the registry, unlinking the segment if no
+        other process remains attached. Atomics from this registry must not
+        be used afterwards.
+        '''
+        if self._segment is None:
+            return
+
+        with self._lock:
+            buf = self._segment.buf
+            magic, version, capacity, attached = _HEADER.unpack_from(buf)
+            _HEADER.pack_into(buf, 0, magic, version, capacity, attached - 1)
+            del buf
+
+            self._segment.close()
+            if attached == 1:
+                self._segment.unlink()
+
+            self._segment = None
+
+        os.close(self._lock_fd)
+
+    def unlink(self):
+        '''
+        Unlinks the segment regardless of how many processes are attached to
+        it, e.g. to clean up after processes which exited without closing it.
+        Processes which remain attached keep their mapping.
+        '''
+        with self._lock:
+            self._segment.unlink()
+
+
+class AtomicNamedReference(object):
+    '''
+    AtomicNamedReference object super type.
+
+    Contains common methods for the named atomics. Values are held as eight
+    bytes in the slot of a `Registry`.
+
+    :param registry: The registry holding the atomic.
+    :param name: The name of the atomic.
+    :param value: The initial value, used only if no atomic called `name`
+        exists in `registry` yet.
+    '''
+    _format = None
+    _kind = None
+    _value_types = object
+    _type_name = 'object'
+
+    def __init__(self, registry, name, value):
+        if not isinstance(value, self._value_types):
+            raise TypeError('_value must be of type ' + self._type_name)
+
+        self.name = name
+        self._struct = struct.Struct('<' + self._format)
+        self._registry = registry
+        self._index = registry._attach(name, self._kind, self._pack(value))
+        self._offset = registry._slot_offset(self._index) + _VALUE_OFFSET
+        self._buf = registry._segment.buf
+        self._lock = util.FileLock(registry._lock_fd, start=self._index + 1,
+                                   length=1)
+
+    def __repr__(self):
+        return util.repr(__name__, self, self.get())
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_value, exc_type, tb):
+        self.close()
+
+    def _pack(self, value):
+        try:
+            return self._struct.pack(value)
+        except struct.error:
+            raise OverflowError('{0} out of range'.format(value))
+
+    def _load(self):
+        return self._struct.unpack_from(self._buf, self._offset)[0]
+
+    def _store(self, value):
+        self._buf[self._offset:self._offset + 8] = self._pack(value)
+
+    def close(self):
+        '''
+        Detaches this atomic, releasing its slot if no other process remains
+        attached to it.
+        '''
+        if self._buf is not None:
+            self._buf = None
+            self._registry._detach(self._index)
+
+    def get(self):
+        '''
+        Returns the value.
+        '''
+        return self._load()
+
+    def set(self, value):
+        '''
+        Atomically sets the value to `value`.
+
+        :param value: The value to set.
+        '''
+        if not isinstance(value, self._value_types):
+            raise TypeError('_value must be of type ' + self._type_name)
+
+        with self._lock:
+            self._store(value)
+            return value
+
+    def get_and_set(self, value):
+        '''
+        Atomically sets the value to `value` and returns the old value.
+
+        :param value: The value to set.
+        '''
+        if not isinstance(value, self._value_types):
+            raise TypeError('_value must be of type ' + self._type_name)
+
+        with self._lock:
+            oldval = self._load()
+            self._store(value)
+            return oldval
+
+    def compare_and_set(self, expect, update):
+        '''
+        Atomically sets the value to `update` if the current value is equal to
+        `expect`.
+
+        :param expect: The expected current value.
+        :param update: The value to set if and only if `expect` equals the
+            current value.
+        '''
+        if not isinstance(update, self._value_types):
+            raise TypeError('_value must be of type ' + self._type_name)
+
+        with self._lock:
+            if self._load() == expect:
+                self._store(update)
+                return True
+
+            return False
+
+
+class AtomicBoolean(AtomicNamedReference):
+    '''
+    A named boolean value which allows atomic manipulation semantics.
+    '''
+    _format = '?7x'
+    _kind = b'?'
+    _value_types = bool
+    _type_name = 'bool'
+
+    def __init__(self, registry, name, value=False):
+        super(AtomicBoolean, self).__init__(registry, name, value)
+
+
+class AtomicNamedNumber(AtomicNamedReference):
+    '''
+    AtomicNamedNumber object super type.
+
+    Contains common methods for AtomicInteger, AtomicLong, and AtomicFloat.
+    '''
+    _delta_types = object
+
+    def add_and_get(self, delta):
+        '''
+        Atomically adds `delta` to the current value.
+
+        :param delta: The delta to add.
+        '''
+        if not isinstance(delta, self._delta_types):
+            raise TypeError('delta must be of type ' + self._type_name)
+
+        with self._lock:
+            value = self._load() + delta
+            self._store(value)
+            return value
+
+    def get_and_add(self, delta):
+        '''
+        Atomically adds `delta` to the current value and returns the old value.
+
+        :param delta: The delta to add.
+        '''
+        if not isinstance(delta, self._delta_types):
+            raise TypeError('delta must be of type ' + self._type_name)
+
+        with self._lock:
+            oldval = self._load()
+            self._store(oldval + delta)
+            return oldval
+
+    def subtract_and_get(self, delta):
+        '''
+        Atomically subtracts `delta` from the current value.
+
+        :param delta: The delta to subtract.
+        '''
+        if not isinstance(delta, self._delta_types):
+            raise TypeError('delta must be of type ' + self._type_name)
+
+        with self._lock:
+            value = self._load() - delta
+            self._store(value)
+            return value
+
+    def get_and_subtract(self, delta):
+        '''
+        Atomically subtracts `delta` from the current value and returns the
+        old value.
+
+        :param delta: The delta to subtract.
+        '''
+        if not isinstance(delta, self._delta_types):
+            raise TypeError('delta must be of type ' + self._type_name)
+
+        with self._lock:
+            oldval = self._load()
+            self._store(oldval - delta)
+            return oldval
+
+
+class AtomicInteger(AtomicNamedNumber):
+    '''
+    A named integer value which allows atomic manipulation semantics. The
+    value is held as a signed 64-bit integer.
+    '''
+    _format = 'q'
+    _kind = b'q'
+    _value_types = int
+    _delta_types = int
+    _type_name = 'int'
+
+    def __init__(self, registry, name, value=0):
+        super(AtomicInteger, self).__init__(registry, name, value)
+
+
+class AtomicLong(AtomicNamedNumber):
+    '''
+    A named long value which allows atomic manipulation semantics. The value
+    is held as a signed 64-bit integer.
+    '''
+    _format = 'q'
+    _kind = b'q'
+    _value_types = long
+    _delta_types = six.integer_types
+    _type_name = 'long'
+
+    def __init__(self, registry, name, value=long(0)):
+        super(AtomicLong, self).__init__(registry, name, value)
+
+
+class AtomicFloat(AtomicNamedNumber):
+    '''
+    A named float value which allows atomic manipulation semantics. The value
+    is held as a double.
+    '''
+    _format = 'd'
+    _kind = b'd'
+    _value_types = float
+    _delta_types = (float,) + six.integer_types
+    _type_name = 'float'
+
+    def __init__(self, registry, name, value=float(0)):
+        super(AtomicFloat, self).__init__(registry, name, value)
@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+'''
+atomos.multiprocessing.ratelimit
+
+Rate limiters whose whole state is a single atomic long.
+'''
+
+import atomos.ratelimit
+import atomos.multiprocessing.atomic as atomic
+
+
+class TokenBucket(atomos.ratelimit.TokenBucket):
+    '''
+    Same as atomos.ratelimit.TokenBucket, except uses AtomicLong from
+    atomos.multiprocessing.atomic, so that processes sharing it enforce a
+    single limit between them.
+    '''
+    _atomic_long = atomic.AtomicLong
+
+
+class SlidingWindow(atomos.ratelimit.SlidingWindow):
+    '''
+    Same as atomos.ratelimit.SlidingWindow, except uses AtomicLong from
+    atomos.multiprocessing.atomic, so that processes sharing it enforce a
+    single limit between them.
+    '''
+    _atomic_long = atomic.AtomicLong
@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+'''
+atomos.multiprocessing.ringbuffer
+
+A preallocated ring buffer in the style of the LMAX Disruptor.
+'''
+
+import multiprocessing
+
+import atomos.ringbuffer
+import atomos.multiprocessing.atomic as atomic
+
+
+class RingBuffer(atomos.ringbuffer.RingBuffer):
+    '''
+    Same as atomos.ringbuffer.RingBuffer, except its slots are a ctypes array
+    in shared memory and its sequences are AtomicLong objects from
+    atomos.multiprocessing.atomic, so that producers and readers may be in
+    different processes.
+
+    Like the atomics it is built on, a ring buffer is shared by inheriting it
+    across `fork`, and readers must therefore be created before the
+    processes using them are started.
+
+    :param size: The number of slots, rounded up to a power of two.
+    :param typecode_or_type: The ctypes type of the slots.
+    :param wait_strategy: The wait strategy, or `None` for a
+        `BlockingWaitStrategy`.
+    '''
+    _atomic_long = atomic.AtomicLong
+
+    def __init__(self, size, typecode_or_type='d', wait_strategy=None):
+        self._typecode_or_type = typecode_or_type
+        super(RingBuffer, self).__init__(size, wait_strategy=wait_strategy)
+
+    def _new_slots(self, size, factory):
+        # The slots are only accessed between claiming and publishing, or
+        # once published, which the sequences order, so they need no lock.
+        return multiprocessing.RawArray(self._typecode_or_type, size)
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+'''
+atomos.multiprocessing.sequence
+
+Generators of unique, increasing IDs.
+'''
+
+import os
+import threading
+import weakref
+
+import atomos.sequence
+import atomos.multiprocessing.atomic as atomic
+
+# Sequences whose blocks a forked child must not inherit.
+_sequences = weakref.WeakSet()
+
+
+def _after_fork():
+    for sequence in list(_sequences):
+        sequence._local = threading.local()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_after_fork)
+
+
+class Sequence(atomos.sequence.Sequence):
+    '''
+    Same as atomos.sequence.Sequence, except blocks are reserved from an
+    AtomicLong from atomos.multiprocessing.atomic, so that the sequence may be
+    shared between processes as well as threads.
+
+    A process forked while holding a block does not inherit it, since it
+    would otherwise hand out the same IDs as its parent.
+    '''
+    _atomic_long = atomic.AtomicLong
+
+    def __init__(self, start=1, block_size=100, strict=False):
+        super(Sequence, self).__init__(start=start,
+                                       block_size=block_size,
+                                       strict=strict)
+        _sequences.add(self)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_local']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._local = threading.local()
+        _sequences.add(self)
+
+    def _peek_reserved(self):
+        # Reading the value through the synchronized wrapper would take its
+        # lock, which is exactly what a sequence avoids. Reading an aligned
+        # long is atomic by itself.
+        return self._reserved._reference.get_obj().value
@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+'''
+atomos.multiprocessing.sync
+
+Synchronizers built on atomic counters.
+'''
+
+import atomos.sync
+import atomos.multiprocessing.atomic as atomic
+
+BrokenBarrierError = atomos.sync.BrokenBarrierError
+
+
+class CountDownLatch(atomos.sync.CountDownLatch):
+    '''
+    Same as atomos.sync.CountDownLatch, except uses AtomicLong from
+    atomos.multiprocessing.atomic, so that processes may wait on it.
+    '''
+    _atomic_long = atomic.AtomicLong
+
+
+class CyclicBarrier(atomos.sync.CyclicBarrier):
+    '''
+    Same as atomos.sync.CyclicBarrier, except uses AtomicLong from
+    atomos.multiprocessing.atomic, so that processes may wait at it. The
+    action runs in the process which arrives last.
+    '''
+    _atomic_long = atomic.AtomicLong
+
+
+class Phaser(atomos.sync.Phaser):
+    '''
+    Same as atomos.sync.Phaser, except uses AtomicLong from
+    atomos.multiprocessing.atomic, so that processes may be its parties.
+    '''
+    _atomic_long = atomic.AtomicLong
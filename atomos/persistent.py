@@ -0,0 +1,365 @@
+# -*- coding: utf-8 -*-
+'''
+atomos.persistent
+
+Atomic numbers which live in a memory-mapped file and so survive restarts.
+'''
+
+import mmap
+import os
+import struct
+import time
+import zlib
+
+import six
+
+import atomos.util as util
+
+if six.PY3:
+    long = int
+
+
+#: The version of the file layout written by this module. Files written with
+#: a different layout version are refused rather than misread.
+LAYOUT_VERSION = 1
+
+# A file consists of a 32 byte header followed by two 24 byte slots:
+#
+#   header: magic (8s), layout version (I), value format (c), padding
+#   slot:   sequence number (Q), value (q or d), CRC-32 of both (I), padding
+#
+# A write always goes to the slot not holding the newest value, and the newest
+# value is the one in the intact slot with the highest sequence number. A write
+# which is torn, e.g. by a crash, therefore only ever damages the older of the
+# two values, and the file stays consistent.
+_MAGIC = b'atomosmm'
+_HEADER = struct.Struct('<8sIc19x')
+_CRC = struct.Struct('<I')
+_SLOTS = (_HEADER.size, _HEADER.size + 24)
+_SIZE = _HEADER.size + 2 * 24
+
+
+class AtomicMappedNumber(object):
+    '''
+    AtomicMappedNumber object super type.
+
+    Contains common methods for AtomicInteger, AtomicLong, and AtomicFloat.
+
+    The value is kept in a memory-mapped file at `path`, which is created
+    holding `value` if it does not yet exist and otherwise opened as is, so
+    that restarting a process is only a matter of mapping the file again::
+
+        >>> requests = AtomicLong('/var/lib/myapp/requests')
+        >>> requests.add_and_get(1)
+
+    Any number of threads and processes may open the same file; writes are
+    serialized by a `util.FileLock`, while reads take no lock at all.
+
+    Every write reaches the operating system's page cache immediately, and
+    therefore survives the process crashing. Surviving the machine crashing
+    as well requires the mapping to be flushed to disk, either explicitly by
+    calling `flush` or according to `sync_interval`.
+
+    :param path: The path of the file holding the value.
+    :param value: The initial value, used only if the file does not exist.
+    :param sync_interval: How often writes are flushed to disk, in seconds.
+        `None`, the default, never flushes implicitly, `0` flushes after
+        every write and any other value flushes after a write if at least
+        that many seconds passed since the last flush.
+    '''
+    _format = None
+    _value_types = object
+    _delta_types = object
+    _type_name = 'object'
+
+    def __init__(self, path, value=0, sync_interval=None):
+        if not isinstance(value, self._value_types):
+            raise TypeError('_value must be of type ' + self._type_name)
+
+        self.path = path
+        self._sync_interval = sync_interval
+        self._last_sync = time.time()
+        self._body = struct.Struct('<Q' + self._format)
+
+        self._map = None
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            self._lock = util.FileLock(self._fd)
+            with self._lock:
+                size = os.fstat(self._fd).st_size
+                if size == 0:
+                    self._create(value)
+                elif size < _SIZE:
+                    raise ValueError('{0} is truncated'.format(path))
+
+                self._map = mmap.mmap(self._fd, _SIZE)
+            self._check_header()
+        except BaseException:
+            self.close()
+            raise
+
+    def __repr__(self):
+        return util.repr(__name__, self, self.get())
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_value, exc_type, tb):
+        self.close()
+
+    def _create(self, value):
+        header = _HEADER.pack(_MAGIC, LAYOUT_VERSION,
+                              self._format.encode('ascii'))
+        # The value is written as sequence number 1 and so, as `_write` would
+        # have it, to the second slot, which the first write then leaves be.
+        os.write(self._fd, header + b'\0' * 24 + self._slot(1, value))
+        os.fsync(self._fd)
+
+        # Make the new directory entry itself durable, too.
+        dirfd = os.open(os.path.dirname(os.path.abspath(self.path)),
+                        os.O_RDONLY)
+        try:
+            os.fsync(dirfd)
+        finally:
+            os.close(dirfd)
+
+    def _check_header(self):
+        magic, version, fmt = _HEADER.unpack_from(self._map, 0)
+        if magic != _MAGIC:
+            raise ValueError('{0} is not an atomos file'.format(self.path))
+
+        if version != LAYOUT_VERSION:
+            raise ValueError('{0} has layout version {1}, expected {2}'
+                             .format(self.path, version, LAYOUT_VERSION))
+
+        if fmt != self._format.encode('ascii'):
+            raise ValueError('{0} does not hold values of type {1}'
+                             .format(self.path, self._type_name))
+
+    def _slot(self, seq, value):
+        try:
+            body = self._body.pack(seq, value)
+        except struct.error:
+            raise OverflowError('{0} out of range'.format(value))
+
+        return body + _CRC.pack(zlib.crc32(body) & 0xffffffff) + b'\0' * 4
+
+    def _read_slots(self):
+        newest = None
+        for offset in _SLOTS:
+            body = self._map[offset:offset + self._body.size]
+            crc, = _CRC.unpack_from(self._map, offset + self._body.size)
+            if zlib.crc32(body) & 0xffffffff == crc:
+                seq, value = self._body.unpack(body)
+                if newest is None or seq > newest[0]:
+                    newest = (seq, value)
+
+        return newest
+
+    def _read(self):
+        newest = self._read_slots()
+        if newest is None:
+            # Both slots may only appear damaged because they are being
+            # written, so look again once the writers are excluded.
+            with self._lock:
+                return self._read_locked()
+
+        return newest
+
+    def _read_locked(self):
+        # Must be called with the lock held: no write can be underway, so
+        # damaged slots really are damaged.
+        newest = self._read_slots()
+        if newest is None:
+            raise ValueError('{0} is corrupt'.format(self.path))
+
+        return newest
+
+    def _write(self, seq, value):
+        # Must be called with the lock held.
+        slot = self._slot(seq, value)
+        offset = _SLOTS[seq % 2]
+        self._map[offset:offset + len(slot)] = slot
+
+        if self._sync_interval is not None:
+            now = time.time()
+            if now - self._last_sync >= self._sync_interval:
+                self._map.flush()
+                self._last_sync = now
+
+    def flush(self):
+        '''
+        Flushes the value to disk, i.e. calls `msync` on the mapping.
+        '''
+        self._map.flush()
+        self._last_sync = time.time()
+
+    def close(self):
+        '''
+        Unmaps and closes the file. Note that this does not flush it.
+        '''
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def get(self):
+        '''
+        Returns the value.
+        '''
+        return self._read()[1]
+
+    def set(self, value):
+        '''
+        Atomically sets the value to `value`.
+
+        :param value: The value to set.
+        '''
+        if not isinstance(value, self._value_types):
+            raise TypeError('_value must be of type ' + self._type_name)
+
+        with self._lock:
+            seq, _ = self._read_locked()
+            self._write(seq + 1, value)
+            return value
+
+    def get_and_set(self, value):
+        '''
+        Atomically sets the value to `value` and returns the old value.
+
+        :param value: The value to set.
+        '''
+        if not isinstance(value, self._value_types):
+            raise TypeError('_value must be of type ' + self._type_name)
+
+        with self._lock:
+            seq, oldval = self._read_locked()
+            self._write(seq + 1, value)
+            return oldval
+
+    def compare_and_set(self, expect, update):
+        '''
+        Atomically sets the value to `update` if the current value is equal to
+        `expect`.
+
+        :param expect: The expected current value.
+        :param update: The value to set if and only if `expect` equals the
+            current value.
+        '''
+        if not isinstance(update, self._value_types):
+            raise TypeError('_value must be of type ' + self._type_name)
+
+        with self._lock:
+            seq, value = self._read_locked()
+            if value == expect:
+                self._write(seq + 1, update)
+                return True
+
+            return False
+
+    def add_and_get(self, delta):
+        '''
+        Atomically adds `delta` to the current value.
+
+        :param delta: The delta to add.
+        '''
+        if not isinstance(delta, self._delta_types):
+            raise TypeError('delta must be of type ' + self._type_name)
+
+        with self._lock:
+            seq, value = self._read_locked()
+            value += delta
+            self._write(seq + 1, value)
+            return value
+
+    def get_and_add(self, delta):
+        '''
+        Atomically adds `delta` to the current value and returns the old value.
+
+        :param delta: The delta to add.
+        '''
+        if not isinstance(delta, self._delta_types):
+            raise TypeError('delta must be of type ' + self._type_name)
+
+        with self._lock:
+            seq, oldval = self._read_locked()
+            self._write(seq + 1, oldval + delta)
+            return oldval
+
+    def subtract_and_get(self, delta):
+        '''
+        Atomically subtracts `delta` from the current value.
+
+        :param delta: The delta to subtract.
+        '''
+        if not isinstance(delta, self._delta_types):
+            raise TypeError('delta must be of type ' + self._type_name)
+
+        with self._lock:
+            seq, value = self._read_locked()
+            value -= delta
+            self._write(seq + 1, value)
+            return value
+
+    def get_and_subtract(self, delta):
+        '''
+        Atomically subtracts `delta` from the current value and returns the
+        old value.
+
+        :param delta: The delta to subtract.
+        '''
+        if not isinstance(delta, self._delta_types):
+            raise TypeError('delta must be of type ' + self._type_name)
+
+        with self._lock:
+            seq, oldval = self._read_locked()
+            self._write(seq + 1, oldval - delta)
+            return oldval
+
+
+class AtomicInteger(AtomicMappedNumber):
+    '''
+    An integer value, persisted in a file, which allows atomic manipulation
+    semantics. The value is stored as a signed 64-bit integer.
+    '''
+    _format = 'q'
+    _value_types = int
+    _delta_types = int
+    _type_name = 'int'
+
+    def __init__(self, path, value=0, sync_interval=None):
+        super(AtomicInteger, self).__init__(path, value=value,
+                                            sync_interval=sync_interval)
+
+
+class AtomicLong(AtomicMappedNumber):
+    '''
+    A long value, persisted in a file, which allows atomic manipulation
+    semantics. The value is stored as a signed 64-bit integer.
+    '''
+    _format = 'q'
+    _value_types = long
+    _delta_types = six.integer_types
+    _type_name = 'long'
+
+    def __init__(self, path, value=long(0), sync_interval=None):
+        super(AtomicLong, self).__init__(path, value=value,
+                                         sync_interval=sync_interval)
+
+
+class AtomicFloat(AtomicMappedNumber):
+    '''
+    A float value, persisted in a file, which allows atomic manipulation
+    semantics. The value is stored as a double.
+    '''
+    _format = 'd'
+    _value_types = float
+    _delta_types = (float,) + six.integer_types
+    _type_name = 'float'
+
+    def __init__(self, path, value=float(0), sync_interval=None):
+        super(AtomicFloat, self).__init__(path, value=value,
+                                          sync_interval=sync_interval)
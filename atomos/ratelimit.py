@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+'''
+atomos.ratelimit
+
+Rate limiters whose whole state is a single atomic long.
+'''
+
+import time
+
+import atomos.atomic as atomic
+import atomos.util as util
+
+# A monotonic clock, in nanoseconds. On Linux it is shared by all processes.
+_clock = time.monotonic_ns
+
+# A sliding window packs the number of its current window, modulo
+# `2 ** _WINDOW_BITS`, and the counts of that and the previous window into a
+# non-negative 63-bit integer.
+_COUNT_BITS = 19
+_COUNT_MASK = (1 << _COUNT_BITS) - 1
+_WINDOW_BITS = 63 - 2 * _COUNT_BITS
+_WINDOW_MASK = (1 << _WINDOW_BITS) - 1
+
+
+class TokenBucket(object):
+    '''
+    A token bucket, which admits `rate` tokens per second on average and
+    bursts of up to `burst` tokens at once.
+
+    Rather than a count of tokens and the time of the last refill, which
+    would have to be changed together, the bucket keeps the time at which it
+    will be full again, as in the generic cell rate algorithm. Acquiring
+    tokens pushes that time back, with a single compare-and-set of an
+    `AtomicLong`, and fails if it would end up more than a burst's worth of
+    tokens in the future::
+
+        >>> limiter = TokenBucket(100, burst=10)
+        >>> limiter.try_acquire(5)
+        True
+
+    :param rate: The number of tokens admitted per second.
+    :param burst: The number of tokens the bucket holds, by default a
+        second's worth.
+    '''
+    _atomic_long = atomic.AtomicLong
+
+    def __init__(self, rate, burst=None):
+        if rate <= 0:
+            raise ValueError('rate must be positive')
+
+        if burst is None:
+            burst = max(rate, 1)
+
+        self.rate = rate
+        self.burst = burst
+        # The time one token takes to refill, and that the whole bucket does,
+        # in nanoseconds.
+        self._interval = int(1e9 / rate)
+        self._tolerance = int(burst * 1e9 / rate)
+        # The time the bucket will be full again. It starts out full.
+        self._full_at = self._atomic_long(0)
+
+    def __repr__(self):
+        return util.repr(__name__, self, self.tokens)
+
+    @property
+    def tokens(self):
+        '''
+        The number of tokens currently available.
+        '''
+        pending = max(self._full_at.get() - _clock(), 0)
+        return (self._tolerance - pending) // self._interval
+
+    def _try_acquire(self, n):
+        # Returns 0 if `n` tokens were acquired, otherwise how long to wait
+        # for them to be available, in nanoseconds.
+        increment = n * self._interval
+        while True:
+            now = _clock()
+            full_at = self._full_at.get()
+            new_full_at = max(full_at, now) + increment
+            wait = new_full_at - now - self._tolerance
+            if wait > 0:
+                return wait
+
+            if self._full_at.compare_and_set(full_at, new_full_at):
+                return 0
+
+    def try_acquire(self, n=1):
+        '''
+        Acquires `n` tokens if they are available. Returns `True` if they
+        were, otherwise `False`.
+
+        :param n: The number of tokens to acquire.
+        '''
+        if n > self.burst:
+            return False
+
+        return self._try_acquire(n) == 0
+
+    def acquire(self, n=1, timeout=None):
+        '''
+        Acquires `n` tokens, sleeping until they are available. Returns
+        `True` once they were acquired, or `False` if they would not be
+        available within `timeout` seconds.
+
+        :param n: The number of tokens to acquire.
+        :param timeout: The longest time to wait, in seconds, or `None` to
+            wait indefinitely.
+        '''
+        if n > self.burst:
+            raise ValueError('n must not exceed the burst')
+
+        deadline = None if timeout is None else _clock() + timeout * 1e9
+        while True:
+            wait = self._try_acquire(n)
+            if not wait:
+                return True
+
+            if deadline is not None and _clock() + wait > deadline:
+                return False
+
+            time.sleep(wait / 1e9)
+
+
+class SlidingWindow(object):
+    '''
+    A sliding window counter, which admits at most `limit` permits in any
+    `window` seconds.
+
+    As is usual, the count over the sliding window is estimated from the
+    counts of the current fixed window and the previous one, the latter
+    weighted by how much of it the sliding window still overlaps. Both counts
+    and the number of the current window are packed into one `AtomicLong`,
+    so that acquiring permits is a single compare-and-set::
+
+        >>> limiter = SlidingWindow(100, window=1.0)
+        >>> limiter.try_acquire(5)
+        True
+
+    Each count takes 19 bits, so that `limit` must be below `2 ** 19`, and
+    window numbers are kept modulo `2 ** 25`. Should a limiter lie idle for
+    a multiple of that many windows exactly, it mistakes its old counts for
+    current ones for a window.
+
+    :param limit: The number of permits admitted per window.
+    :param window: The length of the window, in seconds.
+    '''
+    _atomic_long = atomic.AtomicLong
+
+    def __init__(self, limit, window=1.0):
+        if not 0 < limit <= _COUNT_MASK:
+            raise ValueError('limit must be between 1 and {0}'.format(
+                _COUNT_MASK))
+
+        self.limit = limit
+        self.window = window
+        self._window_ns = int(window * 1e9)
+        self._epoch = _clock()
+        self._state = self._atomic_long(0)
+
+    def __repr__(self):
+        return util.repr(__name__, self, self.count)
+
+    def _current(self, state, now):
+        # Returns the packed number of the current window, how far into it
+        # `now` is, and the counts of it and the previous window.
+        number, offset = divmod(now - self._epoch, self._window_ns)
+        number &= _WINDOW_MASK
+        window = state >> (2 * _COUNT_BITS)
+        previous = (state >> _COUNT_BITS) & _COUNT_MASK
+        current = state & _COUNT_MASK
+        if window != number:
+            if window == (number - 1) & _WINDOW_MASK:
+                previous = current
+            else:
+                previous = 0
+            current = 0
+
+        weight = 1 - offset / float(self._window_ns)
+        return number, previous * weight + current, previous, current
+
+    @property
+    def count(self):
+        '''
+        The estimated number of permits acquired over the sliding window.
+        '''
+        return self._current(self._state.get(), _clock())[1]
+
+    def try_acquire(self, n=1):
+        '''
+        Acquires `n` permits if the sliding window admits them. Returns `True`
+        if it did, otherwise `False`.
+
+        :param n: The number of permits to acquire.
+        '''
+        while True:
+            state = self._state.get()
+            number, count, previous, current = self._current(state, _clock())
+            if count + n > self.limit:
+                return False
+
+            update = ((number << (2 * _COUNT_BITS)) |
+                      (previous << _COUNT_BITS) | (current + n))
+            if self._state.compare_and_set(state, update):
+                return True
@@ -0,0 +1,361 @@
+# -*- coding: utf-8 -*-
+'''
+atomos.ringbuffer
+
+A preallocated ring buffer in the style of the LMAX Disruptor.
+'''
+
+import time
+
+import atomos.atomic as atomic
+import atomos.util as util
+
+
+class BusySpinWaitStrategy(object):
+    '''
+    Waits for a sequence by checking for it in a tight loop.
+
+    This has the lowest latency, but keeps a core busy while waiting, and with
+    the GIL keeps the thread being waited for from running until the
+    interpreter switches threads. It is therefore only suited to free-threaded
+    builds with a core to spare for every waiting thread.
+    '''
+    def _idle(self, tries):
+        pass
+
+    def wait_for(self, sequence, dependents, timeout=None):
+        '''
+        Blocks until every one of `dependents`, atomic sequences, has reached
+        `sequence`. Returns the lowest of their values once they have, or
+        `None` if `timeout` seconds pass first.
+
+        :param sequence: The sequence to wait for.
+        :param dependents: The atomic sequences to wait on.
+        :param timeout: The longest time to wait, in seconds, or `None` to
+            wait indefinitely.
+        '''
+        deadline = None if timeout is None else time.monotonic() + timeout
+        tries = 0
+        while True:
+            available = min(d.get() for d in dependents)
+            if available >= sequence:
+                return available
+
+            if deadline is not None and time.monotonic() >= deadline:
+                return None
+
+            tries += 1
+            self._idle(tries)
+
+
+class YieldingWaitStrategy(BusySpinWaitStrategy):
+    '''
+    Waits for a sequence by checking for it in a loop, yielding the processor
+    to other threads after the first `spin_tries` checks.
+
+    Yielding lets the thread being waited for run, at the cost of a somewhat
+    higher latency than spinning. With the GIL, spinning would only keep it
+    from running, so that this yields right away.
+
+    :param spin_tries: The number of checks before yielding.
+    '''
+    def __init__(self, spin_tries=100):
+        self._spin_tries = spin_tries
+
+    def _idle(self, tries):
+        if tries > self._spin_tries or not util.FREE_THREADED:
+            time.sleep(0)
+
+
+class BlockingWaitStrategy(object):
+    '''
+    Waits for a sequence by blocking on the atomic sequences, by way of their
+    `wait_until`, until they reach it.
+
+    This uses no processor while waiting, but waking up a blocked thread
+    takes far longer than a spinning one noticing the change. Writes to the
+    sequences wake up the threads blocked on them. It is the default.
+    '''
+    def wait_for(self, sequence, dependents, timeout=None):
+        '''
+        Blocks until every one of `dependents`, atomic sequences, has reached
+        `sequence`. Returns the lowest of their values once they have, or
+        `None` if `timeout` seconds pass first.
+
+        :param sequence: The sequence to wait for.
+        :param dependents: The atomic sequences to wait on.
+        :param timeout: The longest time to wait, in seconds, or `None` to
+            wait indefinitely.
+        '''
+        available = min(d.get() for d in dependents)
+        if available >= sequence:
+            return available
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        # Sequences only ever increase, so that once each has reached
+        # `sequence` in turn, they all have.
+        for d in dependents:
+            remaining = None
+            if deadline is not None:
+                remaining = max(deadline - time.monotonic(), 0)
+
+            if not d.wait_until(lambda value: value >= sequence, remaining):
+                return None
+
+        return min(d.get() for d in dependents)
+
+
+class RingBuffer(object):
+    '''
+    A bounded buffer of preallocated slots, which producers fill and any
+    number of readers consume, in the style of the LMAX Disruptor.
+
+    Unlike a `queue.Queue`, a ring buffer allocates nothing per value and
+    takes no lock: it is coordinated by `AtomicLong` sequences alone.
+    Producers claim slots by advancing a shared claim sequence, fill them,
+    and then publish them by advancing the cursor. Every reader sees every
+    published value, in order, and moves its own sequence along as it
+    consumes them::
+
+        >>> ring = RingBuffer(1024)
+        >>> reader = ring.new_reader()
+        >>> ring.publish_all(['foo', 'bar'])
+        >>> reader.read()
+        ['foo', 'bar']
+
+    Claiming and publishing work on batches of slots, and readers consume
+    every value available at once, so that the sequences are advanced once
+    per batch rather than once per value.
+
+    A reader may depend on other readers, in which case it only sees values
+    which those have consumed, e.g. so that values are journalled before they
+    are processed. Producers never overwrite a slot before every reader has
+    consumed it, and wait for that should the buffer be full.
+
+    How producers and readers wait is up to the wait strategy:
+    `BlockingWaitStrategy`, the default, `YieldingWaitStrategy` or
+    `BusySpinWaitStrategy`.
+
+    :param size: The number of slots, rounded up to a power of two.
+    :param factory: A function returning the initial value of a slot, e.g. to
+        preallocate mutable events, or `None` to fill slots with `None`.
+    :param wait_strategy: The wait strategy, or `None` for a
+        `BlockingWaitStrategy`.
+    '''
+    _atomic_long = atomic.AtomicLong
+
+    def __init__(self, size, factory=None, wait_strategy=None):
+        if size < 1:
+            raise ValueError('size must be positive')
+
+        capacity = 1
+        while capacity < size:
+            capacity *= 2
+
+        self._size = capacity
+        self._mask = capacity - 1
+        self._slots = self._new_slots(capacity, factory)
+        self._wait_strategy = wait_strategy or BlockingWaitStrategy()
+        # The next sequence to be claimed, and the last one published.
+        self._claimed = self._atomic_long(0)
+        self._cursor = self._atomic_long(-1)
+        # The sequences of the readers, which producers must not overtake,
+        # and the lowest of them seen last, so that producers need not check
+        # them for every claim.
+        self._gating = ()
+        self._gating_cache = -1
+
+    def __repr__(self):
+        return util.repr(__name__, self, self._cursor.get())
+
+    def __len__(self):
+        return self._size
+
+    def _new_slots(self, size, factory):
+        if factory is None:
+            return [None] * size
+
+        return [factory() for _ in range(size)]
+
+    def __getitem__(self, sequence):
+        return self._slots[sequence & self._mask]
+
+    def __setitem__(self, sequence, value):
+        self._slots[sequence & self._mask] = value
+
+    @property
+    def cursor(self):
+        '''
+        The last published sequence, or -1 if none has been published.
+        '''
+        return self._cursor.get()
+
+    def new_reader(self, depends_on=()):
+        '''
+        Returns a new `Reader`, which will see the values published from now
+        on, once every one of `depends_on` has consumed them.
+
+        :param depends_on: The readers the new reader depends on.
+        '''
+        reader = Reader(self, depends_on)
+        self._gating = self._gating + (reader._sequence,)
+        return reader
+
+    def remove_reader(self, reader):
+        '''
+        Removes `reader`, so that producers no longer wait for it.
+
+        :param reader: The reader to remove.
+        '''
+        self._gating = tuple(s for s in self._gating
+                             if s is not reader._sequence)
+
+    def claim(self, n=1):
+        '''
+        Claims the next `n` slots and returns the sequence of the first. The
+        slots must then be filled, by way of `ring[sequence] = value`, and
+        published with `publish`. Blocks while the buffer is full.
+
+        :param n: The number of slots to claim.
+        '''
+        if not 0 < n <= self._size:
+            raise ValueError('n must be between 1 and the size')
+
+        first = self._claimed.get_and_add(n)
+        wrap_point = first + n - 1 - self._size
+        if wrap_point > self._gating_cache and self._gating:
+            self._gating_cache = self._wait_strategy.wait_for(wrap_point,
+                                                              self._gating)
+        return first
+
+    def publish(self, first, n=1):
+        '''
+        Publishes the `n` slots claimed starting at `first`, making them
+        visible to readers. Slots are published in the order they were
+        claimed, so that this waits for producers which claimed earlier slots
+        to publish them first.
+
+        :param first: The sequence returned by `claim`.
+        :param n: The number of slots claimed.
+        '''
+        if self._cursor.get() != first - 1:
+            self._wait_strategy.wait_for(first - 1, (self._cursor,))
+
+        self._cursor.set(first + n - 1)
+
+    def publish_all(self, values):
+        '''
+        Claims, fills and publishes one slot for each of `values`, as a
+        single batch.
+
+        :param values: A sequence of values, no longer than the buffer.
+        '''
+        n = len(values)
+        if not n:
+            return
+
+        first = self.claim(n)
+        slots, mask = self._slots, self._mask
+        for i, value in enumerate(values, first):
+            slots[i & mask] = value
+        self.publish(first, n)
+
+    def offer(self, value):
+        '''
+        Claims, fills and publishes a single slot.
+
+        :param value: The value to publish.
+        '''
+        first = self.claim()
+        self._slots[first & self._mask] = value
+        self.publish(first)
+
+
+class Reader(object):
+    '''
+    A consumer of the values published to a `RingBuffer`, created by way of
+    its `new_reader`. A reader is meant to be used by a single thread.
+
+    :param ring: The ring buffer to read.
+    :param depends_on: The readers which must consume values first.
+    '''
+    def __init__(self, ring, depends_on=()):
+        self._ring = ring
+        # The last sequence consumed.
+        self._sequence = ring._atomic_long(ring.cursor)
+        self._barrier = (ring._cursor,) + tuple(r._sequence
+                                                for r in depends_on)
+
+    def __repr__(self):
+        return util.repr(__name__, self, self._sequence.get())
+
+    @property
+    def sequence(self):
+        '''
+        The last sequence consumed.
+        '''
+        return self._sequence.get()
+
+    def _available(self, max_n, timeout):
+        first = self._sequence.get() + 1
+        last = self._ring._wait_strategy.wait_for(first, self._barrier,
+                                                  timeout)
+        if last is None:
+            return first, first - 1
+
+        if max_n is not None:
+            last = min(last, first + max_n - 1)
+
+        return first, last
+
+    def read(self, max_n=None, timeout=None):
+        '''
+        Waits for values to be available, then consumes up to `max_n` of them
+        and returns them as a list, oldest first. Returns an empty list if
+        `timeout` seconds pass first.
+
+        The values remain in their slots until they are overwritten. Mutable
+        values, as preallocated by a factory, may be changed by producers as
+        soon as they have been read, and should be handled with `process`
+        instead.
+
+        :param max_n: The most values to consume, or `None` to consume all of
+            those available.
+        :param timeout: The longest time to wait, in seconds, `0` not to wait
+            at all, or `None` to wait indefinitely.
+        '''
+        first, last = self._available(max_n, timeout)
+        if last < first:
+            return []
+
+        ring = self._ring
+        slots, mask = ring._slots, ring._mask
+        values = [slots[i & mask] for i in range(first, last + 1)]
+        self._sequence.set(last)
+        return values
+
+    def process(self, fn, max_n=None, timeout=None):
+        '''
+        Waits for values to be available, then calls `fn(value, sequence,
+        end_of_batch)` for up to `max_n` of them, oldest first, and only
+        then consumes them. Returns the number of values processed, or `0`
+        if `timeout` seconds pass first.
+
+        :param fn: A function which will be passed each value, its sequence
+            and whether it is the last of the batch.
+        :param max_n: The most values to process, or `None` to process all of
+            those available.
+        :param timeout: The longest time to wait, in seconds, `0` not to wait
+            at all, or `None` to wait indefinitely.
+        '''
+        first, last = self._available(max_n, timeout)
+        if last < first:
+            return 0
+
+        ring = self._ring
+        slots, mask = ring._slots, ring._mask
+        for i in range(first, last + 1):
+            fn(slots[i & mask], i, i == last)
+
+        self._sequence.set(last)
+        return last - first + 1
@@ -0,0 +1,398 @@
+# -*- coding: utf-8 -*-
+'''
+atomos.sync
+
+Synchronizers built on atomic counters.
+'''
+
+import threading
+
+import atomos.atomic as atomic
+import atomos.util as util
+
+BrokenBarrierError = threading.BrokenBarrierError
+
+# A phaser packs its state into a non-negative 63-bit integer: the number of
+# parties yet to arrive, the number of registered parties, the phase, modulo
+# `2 ** 22`, and whether it has terminated.
+_PARTY_BITS = 20
+_PARTY_MASK = (1 << _PARTY_BITS) - 1
+_PHASE_SHIFT = 2 * _PARTY_BITS
+_PHASE_MASK = (1 << 22) - 1
+_TERMINATED = 1 << 62
+
+
+class CountDownLatch(object):
+    '''
+    A latch which threads may wait on until it has been counted down to zero.
+
+    The count is an `AtomicLong`. Counting down is a compare-and-set, and
+    waiting threads park on the count, by way of its `wait_until`, rather
+    than polling it::
+
+        >>> ready = CountDownLatch(3)
+        >>> ready.count_down()
+        >>> ready.wait(timeout=1)
+        False
+
+    A latch cannot be reset; see `CyclicBarrier` for that.
+
+    :param count: The number of times `count_down` must be called before
+        waiting threads are released.
+    '''
+    _atomic_long = atomic.AtomicLong
+
+    def __init__(self, count):
+        if count < 0:
+            raise ValueError('count must not be negative')
+
+        self._count = self._atomic_long(count)
+
+    def __repr__(self):
+        return util.repr(__name__, self, self.count)
+
+    @property
+    def count(self):
+        '''
+        The current count.
+        '''
+        return self._count.get()
+
+    def count_down(self):
+        '''
+        Decrements the count, releasing every waiting thread should it reach
+        zero. Does nothing if the count already is zero.
+        '''
+        while True:
+            count = self._count.get()
+            if count == 0:
+                return
+
+            if self._count.compare_and_set(count, count - 1):
+                return
+
+    def wait(self, timeout=None):
+        '''
+        Blocks until the count reaches zero. Returns `True` once it does, or
+        `False` if `timeout` seconds pass first.
+
+        :param timeout: The longest time to wait, in seconds, or `None` to
+            wait indefinitely.
+        '''
+        if self._count.get() == 0:
+            return True
+
+        return self._count.wait_until(lambda count: count == 0, timeout)
+
+
+class CyclicBarrier(object):
+    '''
+    A barrier which `parties` threads wait at until all of them have arrived,
+    and which may then be used again.
+
+    Arrivals are counted by one `AtomicLong`, which is never reset: the
+    `n`th arrival overall belongs to generation `n // parties`. The last
+    arrival of a generation runs `action`, if given, and then advances a
+    second `AtomicLong`, the generation, which the others park on::
+
+        >>> barrier = CyclicBarrier(2)
+        >>> barrier.wait()
+
+    As with `threading.Barrier`, should a thread time out, or `action`
+    raise, the barrier is broken: the threads waiting at it, and any arriving
+    later, raise `BrokenBarrierError` until it is `reset`.
+
+    :param parties: The number of threads which must arrive.
+    :param action: A function which the last thread to arrive calls before
+        the others are released.
+    :param timeout: The default timeout of `wait`.
+    '''
+    _atomic_long = atomic.AtomicLong
+
+    def __init__(self, parties, action=None, timeout=None):
+        if parties < 1:
+            raise ValueError('parties must be positive')
+
+        self.parties = parties
+        self._action = action
+        self._timeout = timeout
+        self._arrivals = self._atomic_long(0)
+        # Twice the number of the current generation, plus one should it be
+        # broken.
+        self._generation = self._atomic_long(0)
+
+    def __repr__(self):
+        return util.repr(__name__, self, self.n_waiting)
+
+    @property
+    def n_waiting(self):
+        '''
+        The number of threads waiting at the barrier.
+        '''
+        generation = self._generation.get() >> 1
+        return max(self._arrivals.get() - generation * self.parties, 0)
+
+    @property
+    def broken(self):
+        '''
+        Whether the barrier is broken.
+        '''
+        return bool(self._generation.get() & 1)
+
+    def _break(self, generation):
+        self._generation.compare_and_set(generation << 1,
+                                         (generation << 1) | 1)
+
+    def _await(self, pred, timeout):
+        # Waits until `pred` holds for the generation, or the barrier breaks,
+        # and returns the generation. Should `timeout` pass first, breaks the
+        # barrier, unless `pred` came to hold meanwhile.
+        if not self._generation.wait_until(
+                lambda value: pred(value) or value & 1, timeout):
+            while True:
+                value = self._generation.get()
+                if pred(value) or value & 1 or \
+                        self._generation.compare_and_set(value, value | 1):
+                    break
+
+        return self._generation.get()
+
+    def wait(self, timeout=None):
+        '''
+        Waits until every party has arrived, and returns the order of the
+        calling thread's arrival, from `0` to `parties - 1`. Raises
+        `BrokenBarrierError` should the barrier be, or become, broken.
+
+        :param timeout: The longest time to wait, in seconds, by default the
+            barrier's timeout.
+        '''
+        if timeout is None:
+            timeout = self._timeout
+
+        if self._generation.get() & 1:
+            raise BrokenBarrierError
+
+        generation, index = divmod(self._arrivals.get_and_add(1),
+                                   self.parties)
+        expected = generation << 1
+        if index == self.parties - 1:
+            # The previous generation may not have started this one yet,
+            # should its last arrival still be running `action`.
+            if self._await(lambda value: value >= expected, timeout) & 1:
+                raise BrokenBarrierError
+
+            if self._action is not None:
+                try:
+                    self._action()
+                except BaseException:
+                    self._break(generation)
+                    raise
+
+            if not self._generation.compare_and_set(expected,
+                                                    (generation + 1) << 1):
+                raise BrokenBarrierError
+            return index
+
+        # The generation may still be behind this thread's, too, so wait for
+        # it to move past this thread's, rather than merely change.
+        value = self._await(lambda value: value > expected, timeout)
+        if value & 1 and value <= expected | 1:
+            raise BrokenBarrierError
+
+        return index
+
+    def abort(self):
+        '''
+        Breaks the barrier, so that waiting and arriving threads raise
+        `BrokenBarrierError`.
+        '''
+        self._break(self._generation.get() >> 1)
+
+    def reset(self):
+        '''
+        Breaks the current generation, releasing the threads waiting at it
+        with `BrokenBarrierError`, and starts a new one. It must not be
+        called while threads are arriving.
+        '''
+        generation = self._generation.get() >> 1
+        self._break(generation)
+        self._arrivals.set((generation + 1) * self.parties)
+        self._generation.set((generation + 1) << 1)
+
+
+class Phaser(object):
+    '''
+    A reusable barrier with a varying number of parties, which advances
+    through numbered phases, in the style of Java's `Phaser`.
+
+    Parties `register`, and in each phase `arrive`, possibly deregistering
+    as they do. Once every registered party has arrived, the phaser advances
+    to the next phase, and the threads waiting for that, by way of
+    `await_advance` or `arrive_and_await_advance`, are released::
+
+        >>> phaser = Phaser(1)
+        >>> phaser.arrive_and_await_advance()
+        1
+
+    The phase, the number of registered parties and the number yet to
+    arrive are packed into one `AtomicLong`, so that every operation is a
+    single compare-and-set, and waiting threads park on it. Phases count up
+    to `2 ** 22` and then wrap around to zero, and there may be at most
+    `2 ** 20 - 1` parties.
+
+    Once the last party deregisters, or `force_termination` is called, the
+    phaser terminates: it no longer advances, and its methods return a
+    negative phase.
+
+    :param parties: The number of parties registered to begin with.
+    '''
+    _atomic_long = atomic.AtomicLong
+
+    def __init__(self, parties=0):
+        if not 0 <= parties <= _PARTY_MASK:
+            raise ValueError('parties must be between 0 and {0}'.format(
+                _PARTY_MASK))
+
+        self._state = self._atomic_long((parties << _PARTY_BITS) | parties)
+
+    def __repr__(self):
+        return util.repr(__name__, self, self.phase)
+
+    @staticmethod
+    def _phase(state):
+        if state & _TERMINATED:
+            return -1
+
+        return (state >> _PHASE_SHIFT) & _PHASE_MASK
+
+    @property
+    def phase(self):
+        '''
+        The current phase, or `-1` if the phaser has terminated.
+        '''
+        return self._phase(self._state.get())
+
+    @property
+    def registered_parties(self):
+        '''
+        The number of registered parties.
+        '''
+        return (self._state.get() >> _PARTY_BITS) & _PARTY_MASK
+
+    @property
+    def unarrived_parties(self):
+        '''
+        The number of registered parties yet to arrive in the current phase.
+        '''
+        return self._state.get() & _PARTY_MASK
+
+    @property
+    def terminated(self):
+        '''
+        Whether the phaser has terminated.
+        '''
+        return bool(self._state.get() & _TERMINATED)
+
+    def register(self, parties=1):
+        '''
+        Registers `parties` more parties, which must arrive in the current
+        phase, too. Returns the current phase.
+
+        :param parties: The number of parties to register.
+        '''
+        while True:
+            state = self._state.get()
+            if state & _TERMINATED:
+                return -1
+
+            registered = (state >> _PARTY_BITS) & _PARTY_MASK
+            if registered + parties > _PARTY_MASK:
+                raise ValueError('too many parties')
+
+            update = state + (parties << _PARTY_BITS) + parties
+            if self._state.compare_and_set(state, update):
+                return self._phase(state)
+
+    def _arrive(self, deregister):
+        while True:
+            state = self._state.get()
+            if state & _TERMINATED:
+                return -1
+
+            phase = (state >> _PHASE_SHIFT) & _PHASE_MASK
+            registered = (state >> _PARTY_BITS) & _PARTY_MASK
+            unarrived = state & _PARTY_MASK
+            if unarrived == 0:
+                raise ValueError('no parties are yet to arrive')
+
+            if deregister:
+                registered -= 1
+            unarrived -= 1
+
+            if unarrived:
+                update = (phase << _PHASE_SHIFT |
+                          registered << _PARTY_BITS | unarrived)
+            elif registered:
+                # The last party to arrive advances the phaser.
+                update = (((phase + 1) & _PHASE_MASK) << _PHASE_SHIFT |
+                          registered << _PARTY_BITS | registered)
+            else:
+                update = state | _TERMINATED
+
+            if self._state.compare_and_set(state, update):
+                return phase
+
+    def arrive(self):
+        '''
+        Arrives without waiting for the other parties. Returns the phase
+        arrived in.
+        '''
+        return self._arrive(False)
+
+    def arrive_and_deregister(self):
+        '''
+        Arrives and deregisters without waiting for the other parties.
+        Returns the phase arrived in.
+        '''
+        return self._arrive(True)
+
+    def await_advance(self, phase, timeout=None):
+        '''
+        Blocks until the phaser advances from `phase`, and returns the new
+        phase. Returns straight away if the current phase is another one
+        already. Returns `None` if `timeout` seconds pass first.
+
+        :param phase: The phase to wait to advance from, as returned by
+            `arrive`.
+        :param timeout: The longest time to wait, in seconds, or `None` to
+            wait indefinitely.
+        '''
+        if phase < 0:
+            return phase
+
+        phase_of = self._phase
+        if not self._state.wait_until(lambda state: phase_of(state) != phase,
+                                      timeout):
+            return None
+
+        return self.phase
+
+    def arrive_and_await_advance(self, timeout=None):
+        '''
+        Arrives and blocks until the other parties have, too. Returns the new
+        phase, or `None` if `timeout` seconds pass first.
+
+        :param timeout: The longest time to wait, in seconds, or `None` to
+            wait indefinitely.
+        '''
+        return self.await_advance(self.arrive(), timeout)
+
+    def force_termination(self):
+        '''
+        Terminates the phaser, releasing every waiting thread.
+        '''
+        while True:
+            state = self._state.get()
+            if state & _TERMINATED or self._state.compare_and_set(
+                    state, state | _TERMINATED):
+                return
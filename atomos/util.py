@@ -6,9 +6,26 @@ Utility functions.
 '''
 from __future__ import absolute_import
 import functools
+import os
+import sysconfig
 import threading
+import time
+import weakref
 from multiprocessing import Value, Lock
 
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+#: Whether this is a free-threaded (PEP 703) build of CPython, i.e. one which
+#: may run Python code in several threads at once. Atomos uses this to choose
+#: between strategies which are equally safe, but scale differently.
+FREE_THREADED = bool(sysconfig.get_config_var('Py_GIL_DISABLED'))
+
+_get_ident = threading.get_ident
+_clock = time.perf_counter
+
 
 def repr(module, instance, value):
     repr_fmt = '<{m}.{cls}({val}) object at {addr}>'
@@ -38,6 +55,39 @@ def synchronized(fn):
     return decorated
 
 
+def wait_until(get_with_version, await_change, pred, timeout=None):
+    '''
+    Blocks until `pred` returns true for the value of a versioned reference,
+    given by way of its `get_with_version` and `await_change` methods, which
+    is how atoms and atomics implement `wait_until`. Returns `True` once it
+    does, or `False` if `timeout` seconds pass first.
+
+    :param get_with_version: A function returning the value and its version.
+    :param await_change: A function which, given a version and a timeout,
+        blocks until the version changes and returns the new value and
+        version, or `None` on timeout.
+    :param pred: A function which will be passed the value.
+    :param timeout: The longest time to wait, in seconds, or `None` to wait
+        indefinitely.
+    '''
+    deadline = None if timeout is None else time.monotonic() + timeout
+    value, version = get_with_version()
+    while not pred(value):
+        remaining = None
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+
+        changed = await_change(version, remaining)
+        if changed is None:
+            return False
+
+        value, version = changed
+
+    return True
+
+
 class ReadersWriterLock(object):
     '''
     A readers-writer lock.
@@ -77,10 +127,13 @@ class ReadersWriterLock(object):
     Note that obtaining the write lock implies that there are no readers and in
     fact an attempt to acquire it will block until all the readers have
     released the lock.
+
+    Both are built from mutexes of `lock_type`, by default `threading.Lock`.
+    Passing `AdaptiveLock` instead makes threads spin briefly before parking.
     '''
-    def __init__(self):
-        self._reader_lock = threading.Lock()
-        self._writer_lock = threading.Lock()
+    def __init__(self, lock_type=threading.Lock):
+        self._reader_lock = lock_type()
+        self._writer_lock = lock_type()
 
         self._reader_count = 0
 
@@ -124,29 +177,93 @@ class ReadersWriterLock(object):
 
         self.shared = SharedLock()
 
-        class ExclusiveLock(object):
-            def acquire(inner):
-                '''
-                Acquires the exclusive lock, prevents acquisition of the shared
-                lock.
-                '''
-                self._writer_lock.acquire()
-
-            def release(inner):
-                '''
-                Releases the exclusive lock, allows acquistion of the shared
-                lock.
-                '''
-                self._writer_lock.release()
-
-            def __enter__(inner):
-                inner.acquire()
-                return inner
+        # The exclusive lock is the writer lock itself. Mutexes already
+        # provide `acquire`, `release` and the context manager protocol,
+        # `threading.Lock` natively, so wrapping them would only add overhead
+        # to every write.
+        self.exclusive = self._writer_lock
 
-            def __exit__(inner, exc_value, exc_type, tb):
-                inner.release()
 
-        self.exclusive = ExclusiveLock()
+class AdaptiveLock(object):
+    '''
+    A mutex which spins briefly before parking.
+
+    Acquiring a contended `threading.Lock` parks the thread in the kernel,
+    and waking it again takes far longer than the critical sections of the
+    atomics last. An adaptive lock instead first retries for a while, in the
+    hope that the holder is about to release it, and only parks if that
+    fails. It keeps a moving average of how long contended acquisitions
+    waited, and spins for at most twice that, so that it stops spinning for
+    locks held long.
+
+    Only contended acquisitions are timed. An uncontended one is a single
+    attempt on the underlying `threading.Lock`, and releasing is that lock's
+    own `release`, so that the lock costs little more than a
+    `threading.Lock` while uncontended.
+
+    With the GIL, a spinning thread would keep the holder from running, so it
+    yields the GIL between attempts rather than spinning outright, which is
+    still far cheaper than parking. It therefore pays off on free-threaded
+    builds mostly: with the GIL, critical sections this short are rarely
+    contended at all. Like a `threading.Lock`, it may be released by a
+    thread other than the one which acquired it.
+
+    :param max_spin: The longest time to spin, in seconds.
+    '''
+    def __init__(self, max_spin=50e-6):
+        self._lock = threading.Lock()
+        self._max_spin = max_spin
+        # The average time contended acquisitions waited for, in seconds.
+        self._wait_time = 0.0
+        # Releasing needs no bookkeeping, so use the underlying lock's.
+        self.release = self._lock.release
+        self.locked = self._lock.locked
+
+    def acquire(self, blocking=True, timeout=-1):
+        '''
+        Acquires the lock, spinning and then blocking until it is available
+        unless `blocking` is false. Returns `True` if the lock was acquired.
+
+        :param blocking: Whether to wait for the lock.
+        :param timeout: The longest time to wait, in seconds, or `-1` to wait
+            indefinitely.
+        '''
+        lock = self._lock
+        if lock.acquire(False):
+            return True
+
+        if not blocking:
+            return False
+
+        start = _clock()
+        spin = min(2 * self._wait_time, self._max_spin)
+        if timeout >= 0:
+            spin = min(spin, timeout)
+        deadline = start + spin
+        while True:
+            if not FREE_THREADED:
+                time.sleep(0)
+
+            if lock.acquire(False):
+                break
+
+            if _clock() >= deadline:
+                if timeout >= 0:
+                    timeout = max(timeout - spin, 0)
+                if not lock.acquire(True, timeout):
+                    return False
+                break
+
+        waited = _clock() - start
+        self._wait_time += (waited - self._wait_time) / 8
+        return True
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_value, exc_type, tb):
+        self._lock.release()
 
 
 class ReadersWriterLockMultiprocessing(object):
@@ -224,3 +341,223 @@ class ReadersWriterLockMultiprocessing(object):
                 inner.release()
 
         self.exclusive = ExclusiveLock()
+
+
+class BiasedLock(object):
+    '''
+    A readers-writer lock biased towards the first thread to use it.
+
+    Many locks are only ever taken by one thread. A biased lock lets that
+    thread, its owner, skip the underlying `ReadersWriterLock` altogether:
+    acquiring and releasing it merely flags whether the owner is inside a
+    critical section. It has the same `shared` and `exclusive` interface as
+    `ReadersWriterLock`::
+
+        >>> lock = BiasedLock()
+        >>> with lock.exclusive:
+        ...     pass
+
+    The first time any other thread acquires the lock, it revokes the bias:
+    it waits for the owner to leave its current critical section, if any,
+    and from then on every thread, the owner included, uses the underlying
+    lock. Revocation is permanent, since a lock shared once is likely to be
+    shared again, and costs the revoking thread at most one critical section
+    of the owner.
+
+    Revocations are counted, per lock by `revoked`, which is `True` once the
+    bias was revoked, and across all locks by `BiasedLock.revocations`. An
+    `on_revoke` function may be given as well, which is called with the lock,
+    the owner's thread identifier and the revoking thread's identifier.
+
+    Note that a biased lock is slower than a `ReadersWriterLock` for any
+    thread but the owner, and that acquiring its exclusive side costs the
+    owner more than acquiring a `threading.Lock` would. It pays off where
+    the owner mostly takes the shared side.
+
+    :param on_revoke: An optional function called upon revocation.
+    '''
+    #: The number of biased locks revoked so far, in this process.
+    revocations = 0
+    _revocations_lock = threading.Lock()
+
+    def __init__(self, on_revoke=None):
+        self._lock = ReadersWriterLock()
+        self._claim_lock = threading.Lock()
+        self._on_revoke = on_revoke
+
+        # The identifier of the owning thread, whether the bias still holds,
+        # how deep the owner is in critical sections, and whether another
+        # thread is revoking the bias. The owner announces itself by way of
+        # `_depth` before checking `_revoking`, and the revoker announces
+        # itself by way of `_revoking` before checking `_depth`, so that at
+        # least one of them notices the other.
+        self._owner = None
+        self._biased = True
+        self._depth = 0
+        self._revoking = False
+
+        self.shared = _BiasedSide(self, self._lock.shared)
+        self.exclusive = _BiasedSide(self, self._lock.exclusive)
+
+    @property
+    def revoked(self):
+        '''
+        Whether the bias was revoked.
+        '''
+        return not self._biased
+
+    def _claim(self, ident):
+        # Called on the slow path, while the bias holds. Returns `True` if
+        # the calling thread may take the fast path, having become the owner.
+        if self._owner is None:
+            with self._claim_lock:
+                if self._owner is None:
+                    self._owner = ident
+
+        if self._owner == ident:
+            self._depth += 1
+            if not self._revoking:
+                return True
+
+            self._depth -= 1
+
+        self._revoke(ident)
+        return False
+
+    def _revoke(self, ident):
+        with self._claim_lock:
+            if not self._biased:
+                return
+
+            self._revoking = True
+            while self._depth:
+                time.sleep(0)
+            self._biased = False
+
+        with BiasedLock._revocations_lock:
+            BiasedLock.revocations += 1
+
+        if self._on_revoke is not None:
+            self._on_revoke(self, self._owner, ident)
+
+
+class _BiasedSide(object):
+    # The shared or exclusive side of a `BiasedLock`. The owner's fast path is
+    # spelled out in `__enter__` and `__exit__`, rather than calling helpers,
+    # since every call counts at this scale.
+    def __init__(self, lock, inner):
+        self._lock = lock
+        self._inner = inner
+
+    def __enter__(self):
+        lock = self._lock
+        if lock._biased:
+            if lock._owner == _get_ident():
+                lock._depth += 1
+                if not lock._revoking:
+                    return self
+
+                lock._depth -= 1
+
+            if lock._claim(_get_ident()):
+                return self
+
+        self._inner.acquire()
+        return self
+
+    def __exit__(self, exc_value, exc_type, tb):
+        lock = self._lock
+        # A revocation waits for the owner to leave, so the bias still holds
+        # if this is the owner leaving a section entered on the fast path.
+        if lock._biased and lock._depth and lock._owner == _get_ident():
+            lock._depth -= 1
+        else:
+            self._inner.release()
+
+    def acquire(self):
+        '''
+        Acquires the lock.
+        '''
+        self.__enter__()
+
+    def release(self):
+        '''
+        Releases the lock.
+        '''
+        self.__exit__(None, None, None)
+
+
+class FileLock(object):
+    '''
+    An exclusive lock on an open file, shared between threads and processes.
+
+    Unlike the locks provided by `multiprocessing`, a file lock does not need
+    to be inherited: any process which opens the same file contends for the
+    same lock. It is built from a POSIX record lock, which excludes other
+    processes, and a `threading.Lock`, which excludes other threads of this
+    process, since record locks are held per process. The latter is shared by
+    every `FileLock` on the same file within a process. Record locks are not
+    inherited across `fork`, so parent and child exclude each other as well.
+
+    Note that closing any descriptor of a file releases all the record locks
+    this process holds on it. A file should therefore not be closed while
+    another `FileLock` on it may be held.
+
+    Note that this requires `fcntl` and is therefore not available on
+    Windows.
+
+    A `FileLock` may also cover only a range of bytes of the file, in which
+    case it excludes only the locks whose ranges overlap it. A single file can
+    thereby provide many independent locks. (Within a process, threads are
+    only excluded by locks on the very same range, so ranges should either be
+    identical or disjoint.)
+
+    :param fd: The file descriptor of the file to lock.
+    :param start: The offset of the first byte to lock.
+    :param length: The number of bytes to lock, `0` meaning all bytes from
+        `start` onwards.
+    '''
+    _thread_locks = weakref.WeakValueDictionary()
+    _thread_locks_lock = threading.Lock()
+
+    def __init__(self, fd, start=0, length=0):
+        if fcntl is None:  # pragma: no cover
+            raise NotImplementedError('FileLock requires fcntl')
+
+        self._fd = fd
+        self._start = start
+        self._length = length
+
+        stat = os.fstat(fd)
+        key = (stat.st_dev, stat.st_ino, start, length)
+        with self._thread_locks_lock:
+            self._lock = self._thread_locks.get(key)
+            if self._lock is None:
+                self._lock = self._thread_locks[key] = threading.Lock()
+
+    def acquire(self):
+        '''
+        Acquires the lock, blocking until it is available.
+        '''
+        self._lock.acquire()
+        try:
+            fcntl.lockf(self._fd, fcntl.LOCK_EX, self._length, self._start)
+        except BaseException:
+            self._lock.release()
+            raise
+
+    def release(self):
+        '''
+        Releases the lock.
+        '''
+        try:
+            fcntl.lockf(self._fd, fcntl.LOCK_UN, self._length, self._start)
+        finally:
+            self._lock.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_value, exc_type, tb):
+        self.release()
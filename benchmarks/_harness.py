@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+'''
+benchmarks._harness
+
+Shared command line harness for the benchmark scripts.
+
+Each script describes its benchmarks as `(name, stmt, namespace)` triples and
+hands them to `run`. Results are reported in nanoseconds per operation, using
+the best of several repeats, and may be written out as JSON so that they can
+be compared across releases, e.g.::
+
+    $ python benchmarks/bench_atomic.py --json bench-0.3.1.json
+'''
+from __future__ import print_function
+
+import argparse
+import json
+import platform
+import sys
+import timeit
+
+import atomos.__about__ as about
+
+
+def parser(description):
+    '''
+    Returns an argument parser carrying the options common to every
+    benchmark script.
+
+    :param description: The description of the benchmark script.
+    '''
+    p = argparse.ArgumentParser(description=description)
+    p.add_argument('-n', '--number', type=int, default=100000,
+                   help='operations per repeat (default: %(default)s)')
+    p.add_argument('-r', '--repeat', type=int, default=5,
+                   help='number of repeats (default: %(default)s)')
+    p.add_argument('-k', '--filter', default='',
+                   help='only run benchmarks whose name contains this')
+    p.add_argument('--json', metavar='PATH',
+                   help='also write the results to PATH as JSON')
+    return p
+
+
+def environment():
+    '''
+    Returns a description of the interpreter the benchmarks ran on.
+    '''
+    return {'atomos': about.__version__,
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'machine': platform.machine()}
+
+
+def report(results, args):
+    '''
+    Prints `results`, a list of `(name, value, unit)` triples, and writes them
+    to `args.json` if requested.
+
+    :param results: The results to report.
+    :param args: The parsed command line arguments.
+    '''
+    width = max([len(name) for name, _, _ in results] or [0])
+    for name, value, unit in results:
+        print('{0:<{1}}  {2:>12.1f} {3}'.format(name, width, value, unit))
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'environment': environment(),
+                       'results': [{'name': name, 'value': value,
+                                    'unit': unit}
+                                   for name, value, unit in results]},
+                      f, indent=2, sort_keys=True)
+
+
+def run(benchmarks, args):
+    '''
+    Times each of `benchmarks`, a list of `(name, stmt, namespace)` triples,
+    and reports the results in nanoseconds per operation.
+
+    :param benchmarks: The benchmarks to run.
+    :param args: The parsed command line arguments.
+    '''
+    results = []
+    for name, stmt, namespace in benchmarks:
+        if args.filter not in name:
+            continue
+
+        timer = timeit.Timer(stmt, globals=namespace)
+        best = min(timer.repeat(repeat=args.repeat, number=args.number))
+        results.append((name, best / args.number * 1e9, 'ns/op'))
+
+    report(results, args)
+    return results
+
+
+if __name__ == '__main__':
+    sys.exit('This module is not meant to be run directly.')
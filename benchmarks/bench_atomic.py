@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+'''
+benchmarks.bench_atomic
+
+Single-threaded microbenchmarks for every operation of the atomic primitives
+in `atomos.atomic`.
+'''
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import atomos.atomic as atomic  # noqa: E402
+
+import _harness  # noqa: E402
+
+
+def benchmarks():
+    '''
+    Returns the `(name, stmt, namespace)` triples to time.
+    '''
+    cases = [('AtomicInteger', atomic.AtomicInteger, 0, 1),
+             ('AtomicLong', atomic.AtomicLong, 0, 1),
+             ('AtomicFloat', atomic.AtomicFloat, 0.0, 1.0)]
+    bools = [('AtomicBoolean', atomic.AtomicBoolean)]
+
+    # When the compiled extension is in use, time the pure Python
+    # implementations alongside it.
+    if atomic.AtomicInteger is not atomic._PyAtomicInteger:
+        cases += [('py:AtomicInteger', atomic._PyAtomicInteger, 0, 1),
+                  ('py:AtomicLong', atomic._PyAtomicLong, 0, 1)]
+        bools += [('py:AtomicBoolean', atomic._PyAtomicBoolean)]
+
+    triples = []
+    for name, cls, zero, one in cases:
+        ns = {'ref': cls(zero), 'zero': zero, 'one': one}
+        triples.extend([
+            (name + '.get', 'ref.get()', ns),
+            (name + '.set', 'ref.set(zero)', ns),
+            (name + '.get_and_set', 'ref.get_and_set(zero)', ns),
+            (name + '.compare_and_set', 'ref.compare_and_set(zero, zero)', ns),
+            (name + '.add_and_get', 'ref.add_and_get(one)', ns),
+            (name + '.get_and_add', 'ref.get_and_add(one)', ns),
+            (name + '.subtract_and_get', 'ref.subtract_and_get(one)', ns),
+            (name + '.get_and_subtract', 'ref.get_and_subtract(one)', ns),
+        ])
+
+    for name, cls in bools:
+        ns = {'ref': cls(False)}
+        triples.extend([
+            (name + '.get', 'ref.get()', ns),
+            (name + '.set', 'ref.set(False)', ns),
+            (name + '.get_and_set', 'ref.get_and_set(False)', ns),
+            (name + '.compare_and_set',
+             'ref.compare_and_set(False, False)', ns),
+        ])
+
+    ns = {'ref': atomic.AtomicReference({})}
+    triples.extend([
+        ('AtomicReference.get', 'ref.get()', ns),
+        ('AtomicReference.set', 'ref.set(None)', ns),
+        ('AtomicReference.get_and_set', 'ref.get_and_set(None)', ns),
+        ('AtomicReference.compare_and_set',
+         'ref.compare_and_set(None, None)', ns),
+    ])
+    return triples
+
+
+def main(argv=None):
+    args = _harness.parser(__doc__).parse_args(argv)
+    _harness.run(benchmarks(), args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+'''
+benchmarks.bench_concurrent
+
+Producer/consumer throughput of `atomos.concurrent.ConcurrentQueue`, compared
+with `queue.Queue` and with the pattern it replaces, an `Atom` holding a
+`collections.deque` which is copied on every change.
+
+Each run starts `--threads` producers and as many consumers. Every producer
+offers `--number` items, singly or in batches of `--batch`, and consumers
+take items until all have been consumed. The aggregate throughput, in items
+per second, is reported for each implementation.
+'''
+import collections
+import os
+import queue
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import atomos.atom as atom  # noqa: E402
+import atomos.concurrent as concurrent  # noqa: E402
+
+import _harness  # noqa: E402
+
+
+class AtomDeque(object):
+    '''
+    The copy-on-write pattern: an atom holding a deque.
+    '''
+    def __init__(self):
+        self._state = atom.Atom(collections.deque())
+
+    def offer(self, value):
+        def append(d):
+            d = collections.deque(d)
+            d.append(value)
+            return d
+        self._state.swap(append)
+
+    def offer_all(self, values):
+        def extend(d):
+            d = collections.deque(d)
+            d.extend(values)
+            return d
+        self._state.swap(extend)
+
+    def drain(self, max_n):
+        while True:
+            d = self._state.deref()
+            if not d:
+                return []
+
+            rest = collections.deque(d)
+            values = [rest.popleft() for _ in range(min(max_n, len(rest)))]
+            if self._state.compare_and_set(d, rest):
+                return values
+
+
+class StdlibQueue(object):
+    '''
+    `queue.Queue`, adapted to the interface above.
+    '''
+    def __init__(self):
+        self._queue = queue.Queue()
+
+    def offer(self, value):
+        self._queue.put(value)
+
+    def offer_all(self, values):
+        for value in values:
+            self._queue.put(value)
+
+    def drain(self, max_n):
+        values = []
+        try:
+            while len(values) < max_n:
+                values.append(self._queue.get_nowait())
+        except queue.Empty:
+            pass
+        return values
+
+
+def targets():
+    '''
+    Returns `(name, factory)` pairs.
+    '''
+    return [('ConcurrentQueue', concurrent.ConcurrentQueue),
+            ('queue.Queue', StdlibQueue),
+            ('Atom(deque)', AtomDeque)]
+
+
+def throughput(factory, thread_count, number, batch):
+    '''
+    Returns the items per second moved from `thread_count` producers, each
+    offering `number` items, to `thread_count` consumers.
+    '''
+    q = factory()
+    total = thread_count * number
+    consumed = [0]
+    consumed_lock = threading.Lock()
+    barrier = threading.Barrier(2 * thread_count + 1)
+
+    def producer():
+        barrier.wait()
+        if batch == 1:
+            for i in range(number):
+                q.offer(i)
+        else:
+            for i in range(0, number, batch):
+                q.offer_all(range(i, min(i + batch, number)))
+
+    def consumer():
+        barrier.wait()
+        while consumed[0] < total:
+            n = len(q.drain(max(batch, 1)))
+            if n:
+                with consumed_lock:
+                    consumed[0] += n
+
+    threads = [threading.Thread(target=producer) for _ in range(thread_count)]
+    threads += [threading.Thread(target=consumer)
+                for _ in range(thread_count)]
+    for t in threads:
+        t.start()
+
+    barrier.wait()
+    start = time.perf_counter()
+    for t in threads:
+        t.join()
+
+    return total / (time.perf_counter() - start)
+
+
+def main(argv=None):
+    p = _harness.parser(__doc__)
+    p.set_defaults(number=2000)
+    p.add_argument('--threads', type=int, default=4,
+                   help='producers, and consumers (default: %(default)s)')
+    p.add_argument('--batch', type=int, default=1,
+                   help='items per offer_all, 1 to offer singly '
+                        '(default: %(default)s)')
+    args = p.parse_args(argv)
+
+    results = []
+    for name, factory in targets():
+        if args.filter not in name:
+            continue
+
+        best = max(throughput(factory, args.threads, args.number, args.batch)
+                   for _ in range(args.repeat))
+        results.append(('{0} x{1}'.format(name, args.threads), best / 1e3,
+                        'Kitems/s'))
+
+    _harness.report(results, args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+'''
+benchmarks.bench_locks
+
+Cost of the lock types an `AtomicReference` may use, in three cases:
+
+* single-threaded: one thread reads and writes the reference,
+* handoff: the reference is created and used by one thread, then handed to
+  another, which goes on using it (for a biased lock, after a revocation),
+* contended: `--threads` threads read and write it concurrently.
+
+Every case performs `--number` operations, alternating `get` and `set`,
+and reports nanoseconds per operation, using the best of several repeats.
+'''
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import atomos.atomic as atomic  # noqa: E402
+import atomos.util as util  # noqa: E402
+
+import _harness  # noqa: E402
+
+
+def lock_types():
+    '''
+    Returns `(name, lock_type)` pairs.
+    '''
+    return [('ReadersWriterLock', util.ReadersWriterLock),
+            ('BiasedLock', util.BiasedLock),
+            ('AdaptiveLock', util.AdaptiveLock)]
+
+
+def work(ref, number):
+    for _ in range(number // 2):
+        ref.set(ref.get())
+
+
+def in_thread(fn, *args):
+    t = threading.Thread(target=fn, args=args)
+    t.start()
+    t.join()
+
+
+def single_threaded(lock_type, number, threads):
+    ref = atomic.AtomicReference({}, lock_type=lock_type)
+    start = time.perf_counter()
+    work(ref, number)
+    return time.perf_counter() - start
+
+
+def handoff(lock_type, number, threads):
+    ref = atomic.AtomicReference({}, lock_type=lock_type)
+    start = time.perf_counter()
+    in_thread(work, ref, number // 2)
+    in_thread(work, ref, number // 2)
+    return time.perf_counter() - start
+
+
+def contended(lock_type, number, threads):
+    ref = atomic.AtomicReference({}, lock_type=lock_type)
+    workers = [threading.Thread(target=work, args=(ref, number // threads))
+               for _ in range(threads)]
+    start = time.perf_counter()
+    for t in workers:
+        t.start()
+
+    for t in workers:
+        t.join()
+
+    return time.perf_counter() - start
+
+
+def main(argv=None):
+    p = _harness.parser(__doc__)
+    p.add_argument('--threads', type=int, default=4,
+                   help='threads in the contended case (default: '
+                        '%(default)s)')
+    args = p.parse_args(argv)
+
+    results = []
+    for case in (single_threaded, handoff, contended):
+        for name, lock_type in lock_types():
+            label = '{0} {1}'.format(case.__name__, name)
+            if args.filter not in label:
+                continue
+
+            best = min(case(lock_type, args.number, args.threads)
+                       for _ in range(args.repeat))
+            results.append((label, best / args.number * 1e9, 'ns/op'))
+
+    _harness.report(results, args)
+
+
+if __name__ == '__main__':
+    main()
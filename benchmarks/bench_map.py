@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+'''
+benchmarks.bench_map
+
+Write throughput of `atomos.concurrent.ConcurrentMap`, compared with an
+`Atom` holding a dictionary which is copied on every change, from one writer
+thread up to `--max-threads` (16 by default).
+
+Every writer performs `--number` increments of random keys out of `--keys`,
+and the aggregate throughput is reported alongside the speedup over a single
+writer. Writes to an atom all contend on one compare-and-set and each copies
+the whole dictionary; writes to the map only contend within a segment.
+'''
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import atomos.atom as atom  # noqa: E402
+import atomos.concurrent as concurrent  # noqa: E402
+
+import _harness  # noqa: E402
+
+
+def add(old, new):
+    return old + new
+
+
+def targets(key_count):
+    '''
+    Returns `(name, factory)` pairs, where `factory` returns a function
+    incrementing a key of a fresh, pre-populated map.
+    '''
+    def concurrent_map():
+        m = concurrent.ConcurrentMap()
+        for key in range(key_count):
+            m[key] = 0
+        return lambda key: m.merge(key, 1, add)
+
+    def atom_dict():
+        state = atom.Atom(dict.fromkeys(range(key_count), 0))
+
+        def inc(d, key):
+            d = d.copy()
+            d[key] += 1
+            return d
+        return lambda key: state.swap(inc, key)
+
+    return [('ConcurrentMap.merge', concurrent_map),
+            ('Atom(dict).swap', atom_dict)]
+
+
+def throughput(fn, thread_count, number, key_count):
+    '''
+    Returns the aggregate operations per second achieved by `thread_count`
+    threads, each calling `fn` with `number` random keys.
+    '''
+    barrier = threading.Barrier(thread_count + 1)
+
+    def worker(keys):
+        barrier.wait()
+        for key in keys:
+            fn(key)
+
+    threads = [threading.Thread(target=worker,
+                                args=([random.randrange(key_count)
+                                       for _ in range(number)],))
+               for _ in range(thread_count)]
+    for t in threads:
+        t.start()
+
+    barrier.wait()
+    start = time.perf_counter()
+    for t in threads:
+        t.join()
+
+    return thread_count * number / (time.perf_counter() - start)
+
+
+def main(argv=None):
+    p = _harness.parser(__doc__)
+    p.set_defaults(number=5000)
+    p.add_argument('--max-threads', type=int, default=16,
+                   help='largest writer count (default: %(default)s)')
+    p.add_argument('--keys', type=int, default=1000,
+                   help='number of keys (default: %(default)s)')
+    args = p.parse_args(argv)
+
+    counts = [1]
+    while counts[-1] * 2 <= args.max_threads:
+        counts.append(counts[-1] * 2)
+
+    results = []
+    for name, factory in targets(args.keys):
+        if args.filter not in name:
+            continue
+
+        base = None
+        for count in counts:
+            best = max(throughput(factory(), count, args.number, args.keys)
+                       for _ in range(args.repeat))
+            base = base or best
+            label = '{0} x{1}'.format(name, count)
+            results.append((label, best / 1e3, 'Kops/s'))
+            results.append((label + ' speedup', best / base, 'x'))
+
+    _harness.report(results, args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+'''
+benchmarks.bench_ringbuffer
+
+Throughput and latency of `atomos.ringbuffer.RingBuffer`, with each wait
+strategy, compared with `queue.Queue`, moving values from one producer
+thread to one consumer thread.
+
+For throughput, the producer publishes `--number` values in batches of
+`--batch`, and the consumer reads whatever is available. For latency, the
+producer publishes a tenth as many timestamps, one at a time, pausing in
+between so that the consumer is always waiting, and the median and 99th
+percentile time from publishing a value to reading it are reported.
+'''
+import os
+import queue
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import atomos.ringbuffer as ringbuffer  # noqa: E402
+
+import _harness  # noqa: E402
+
+
+class Ring(object):
+    '''
+    A ring buffer with a single reader.
+    '''
+    def __init__(self, wait_strategy):
+        self._ring = ringbuffer.RingBuffer(1024, wait_strategy=wait_strategy)
+        self._reader = self._ring.new_reader()
+
+    def put_all(self, values):
+        self._ring.publish_all(values)
+
+    def get_all(self):
+        return self._reader.read()
+
+
+class StdlibQueue(object):
+    '''
+    `queue.Queue`, adapted to the interface above.
+    '''
+    def __init__(self):
+        self._queue = queue.Queue(1024)
+
+    def put_all(self, values):
+        for value in values:
+            self._queue.put(value)
+
+    def get_all(self):
+        values = [self._queue.get()]
+        try:
+            while True:
+                values.append(self._queue.get_nowait())
+        except queue.Empty:
+            pass
+        return values
+
+
+def targets():
+    '''
+    Returns `(name, factory)` pairs.
+    '''
+    return [('RingBuffer(blocking)',
+             lambda: Ring(ringbuffer.BlockingWaitStrategy())),
+            ('RingBuffer(yielding)',
+             lambda: Ring(ringbuffer.YieldingWaitStrategy())),
+            ('RingBuffer(busy-spin)',
+             lambda: Ring(ringbuffer.BusySpinWaitStrategy())),
+            ('queue.Queue', StdlibQueue)]
+
+
+def run_pair(produce, consume):
+    consumer = threading.Thread(target=consume)
+    consumer.start()
+    start = time.perf_counter()
+    produce()
+    consumer.join()
+    return time.perf_counter() - start
+
+
+def throughput(factory, number, batch):
+    '''
+    Returns the values per second moved from one producer to one consumer.
+    '''
+    q = factory()
+
+    def produce():
+        for i in range(0, number, batch):
+            q.put_all(range(i, min(i + batch, number)))
+
+    def consume():
+        n = 0
+        while n < number:
+            n += len(q.get_all())
+
+    return number / run_pair(produce, consume)
+
+
+def latency(factory, number):
+    '''
+    Returns the median and 99th percentile latency, in seconds.
+    '''
+    q = factory()
+    latencies = []
+
+    def produce():
+        for _ in range(number):
+            q.put_all([time.perf_counter()])
+            time.sleep(0.0001)
+
+    def consume():
+        while len(latencies) < number:
+            for sent in q.get_all():
+                latencies.append(time.perf_counter() - sent)
+
+    run_pair(produce, consume)
+    latencies.sort()
+    n = len(latencies)
+    return latencies[n // 2], latencies[n * 99 // 100]
+
+
+def main(argv=None):
+    p = _harness.parser(__doc__)
+    p.set_defaults(number=20000, repeat=3)
+    p.add_argument('--batch', type=int, default=16,
+                   help='values per batch in the throughput run (default: '
+                        '%(default)s)')
+    args = p.parse_args(argv)
+
+    results = []
+    for name, factory in targets():
+        if args.filter not in name:
+            continue
+
+        best = max(throughput(factory, args.number, args.batch)
+                   for _ in range(args.repeat))
+        results.append(('{0} throughput'.format(name), best / 1e3,
+                        'Kitems/s'))
+
+        median, p99 = min(latency(factory, args.number // 10)
+                          for _ in range(args.repeat))
+        results.append(('{0} latency p50'.format(name), median * 1e6, 'us'))
+        results.append(('{0} latency p99'.format(name), p99 * 1e6, 'us'))
+
+    _harness.report(results, args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+'''
+benchmarks.bench_scaling
+
+Thread-scaling benchmark for reads and writes of the atomic primitives and
+atoms, from one thread up to `--max-threads` (32 by default).
+
+Every thread performs `--number` operations against one shared object, and
+the aggregate throughput is reported alongside the speedup over a single
+thread. On a free-threaded build reads should scale close to linearly with
+the number of cores; with the GIL they cannot scale at all.
+'''
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import atomos.atom as atom  # noqa: E402
+import atomos.atomic as atomic  # noqa: E402
+import atomos.util as util  # noqa: E402
+
+import _harness  # noqa: E402
+
+
+def targets():
+    '''
+    Returns `(name, fn)` pairs, where `fn` performs one operation.
+    '''
+    ref = atomic.AtomicReference({'foo': 'bar'})
+    integer = atomic.AtomicInteger()
+    state = atom.Atom({'foo': 'bar'})
+    return [('AtomicReference.get', ref.get),
+            ('AtomicInteger.get', integer.get),
+            ('Atom.deref', state.deref),
+            ('AtomicInteger.add_and_get', lambda: integer.add_and_get(1))]
+
+
+def throughput(fn, thread_count, number):
+    '''
+    Returns the aggregate operations per second achieved by `thread_count`
+    threads, each calling `fn` `number` times.
+    '''
+    barrier = threading.Barrier(thread_count + 1)
+
+    def worker():
+        barrier.wait()
+        for _ in range(number):
+            fn()
+
+    threads = [threading.Thread(target=worker) for _ in range(thread_count)]
+    for t in threads:
+        t.start()
+
+    barrier.wait()
+    start = time.perf_counter()
+    for t in threads:
+        t.join()
+
+    return thread_count * number / (time.perf_counter() - start)
+
+
+def main(argv=None):
+    p = _harness.parser(__doc__)
+    p.add_argument('--max-threads', type=int, default=32,
+                   help='largest thread count (default: %(default)s)')
+    args = p.parse_args(argv)
+
+    counts = [1]
+    while counts[-1] * 2 <= args.max_threads:
+        counts.append(counts[-1] * 2)
+
+    print('free-threaded build: {0}'.format(util.FREE_THREADED))
+
+    results = []
+    for name, fn in targets():
+        if args.filter not in name:
+            continue
+
+        base = None
+        for count in counts:
+            best = max(throughput(fn, count, args.number)
+                       for _ in range(args.repeat))
+            base = base or best
+            label = '{0} x{1}'.format(name, count)
+            results.append((label, best / 1e6, 'Mops/s'))
+            results.append((label + ' speedup', best / base, 'x'))
+
+    _harness.report(results, args)
+
+
+if __name__ == '__main__':
+    main()
@@ -11,9 +11,10 @@ Links
 * `development version <https://github.com/maxcountryman/atomos>`_
 '''
 
+import platform
 import sys
 
-from setuptools import setup, find_packages
+from setuptools import setup, find_packages, Extension
 from setuptools.command.test import test as TestCommand
 
 
@@ -29,6 +30,15 @@ dev_requires = ['pyflakes', 'pep8', 'pylint', 'check-manifest',
 dev_requires.append(tests_require)
 
 
+# The compiled speedups are optional: should they fail to build, atomos falls
+# back to its pure Python implementations.
+ext_modules = []
+if platform.python_implementation() == 'CPython' and sys.version_info >= (3,):
+    ext_modules.append(Extension('atomos._speedups',
+                                 sources=['atomos/_speedups.c'],
+                                 optional=True))
+
+
 class PyTest(TestCommand):
     def finalize_options(self):
         TestCommand.finalize_options(self)
@@ -51,15 +61,20 @@ setup(name=about['__title__'],
       keywords='atom atomic concurrency lock',
       url='https://github.com/maxcountryman/atomos',
       packages=find_packages(exclude=['docs', 'tests']),
+      ext_modules=ext_modules,
+      python_requires='>=3.8',
       long_description=__doc__,
       classifiers=['Development Status :: 5 - Production/Stable',
                    'Intended Audience :: Developers',
                    'Programming Language :: Python',
-                   'Programming Language :: Python :: 2',
-                   'Programming Language :: Python :: 2.7',
                    'Programming Language :: Python :: 3',
-                   'Programming Language :: Python :: 3.3',
-                   'Programming Language :: Python :: 3.4',
+                   'Programming Language :: Python :: 3 :: Only',
+                   'Programming Language :: Python :: 3.8',
+                   'Programming Language :: Python :: 3.9',
+                   'Programming Language :: Python :: 3.10',
+                   'Programming Language :: Python :: 3.11',
+                   'Programming Language :: Python :: 3.12',
+                   'Programming Language :: Python :: 3.13',
                    'Topic :: Utilities',
                    'License :: OSI Approved :: BSD License'],
       cmdclass={'test': PyTest},
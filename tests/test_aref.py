@@ -54,3 +54,20 @@ def test_aref_notify_watches(aref):
     for k in watches:
         assert k in watched
         assert watched[k] == {'old': old, 'new': new, 'ref': aref}
+
+
+def test_aref_watches_copy_on_write(aref):
+    def watch(k, ref, old, new):
+        pass
+
+    watches = aref.get_watches()
+    aref.add_watch('foo', watch)
+
+    assert watches == {}
+    assert aref.get_watches() == {'foo': watch}
+
+    watches = aref.get_watches()
+    aref.remove_watch('foo')
+
+    assert watches == {'foo': watch}
+    assert aref.get_watches() == {}
@@ -3,8 +3,11 @@
 tests.test_atom
 '''
 
+import gc
 import multiprocessing
 import threading
+import time
+import weakref
 
 import pytest
 
@@ -94,3 +97,260 @@ def test_concurrent_compare_and_set(atom, proc_count=10, loop_count=1000):
         p.join()
 
     assert atom.deref() == successes.value
+
+
+def test_atom_reset_notifies_old_value():
+    atom = atomos.atom.Atom('foo')
+    notified = []
+    atom.add_watch('w', lambda k, ref, old, new: notified.append((old, new)))
+
+    atom.reset('bar')
+
+    assert notified == [('foo', 'bar')]
+
+
+def test_atom_deref_if_changed(atom):
+    atom, _ = atom
+    atom.reset('foo')
+    state, version = atom.deref_with_version()
+    assert state == 'foo'
+    assert atom.deref_if_changed(version) is None
+
+    atom.swap(lambda s: s + 'bar')
+    assert atom.deref_if_changed(version) == ('foobar', version + 1)
+
+    assert atom.compare_and_set('foo', 'baz') is False
+    assert atom.deref_if_changed(version + 1) is None
+
+
+def test_atom_wait_until(atom):
+    atom, proc = atom
+    atom.reset(0)
+
+    def inc():
+        for _ in range(3):
+            atom.swap(lambda n: n + 1)
+
+    p = proc(target=inc)
+    p.start()
+    assert atom.wait_until(lambda n: n == 3, timeout=10) is True
+    p.join()
+
+    state, version = atom.deref_with_version()
+    assert atom.await_change(version, timeout=0.01) is None
+    assert atom.wait_until(lambda n: n > 3, timeout=0.01) is False
+
+
+def test_atom_swap_in():
+    clients = {'foo': {'conns': 0}, 'bar': {'conns': 5}}
+    state = atomos.atom.Atom({'clients': clients, 'other': {}})
+    old = state.deref()
+
+    new = state.swap_in(['clients', 'foo', 'conns'], lambda n, d: n + d, 2)
+    assert new == {'clients': {'foo': {'conns': 2}, 'bar': {'conns': 5}},
+                   'other': {}}
+
+    # Only the dictionaries along the path are copied.
+    assert old['clients']['foo'] == {'conns': 0}
+    assert new['other'] is old['other']
+    assert new['clients']['bar'] is old['clients']['bar']
+
+    new = state.swap_in(['clients', 'baz', 'conns'],
+                        lambda n: 1 if n is None else n + 1)
+    assert new['clients']['baz'] == {'conns': 1}
+
+
+def test_atom_assoc_in_dissoc_in():
+    state = atomos.atom.Atom({})
+    assert state.assoc_in(('a', 'b'), 1) == {'a': {'b': 1}}
+    assert state.assoc_in(('a', 'c'), 2) == {'a': {'b': 1, 'c': 2}}
+    assert state.dissoc_in(('a', 'b')) == {'a': {'c': 2}}
+    assert state.dissoc_in(('x', 'y')) == {'a': {'c': 2}}
+
+    # Removing a missing key leaves the state alone altogether.
+    watched = []
+    state.add_watch('w', lambda k, ref, old, new: watched.append(new))
+    old, version = state.deref_with_version()
+    assert state.dissoc_in(('x',)) is old
+    assert state.dissoc_in(('a', 'x', 'y')) is old
+    assert state.deref_with_version() == (old, version)
+    assert watched == []
+
+    state.dissoc_in(('a', 'c'))
+    assert watched == [{'a': {}}]
+
+    with pytest.raises(ValueError):
+        state.dissoc_in(())
+
+
+def test_cursor():
+    state = atomos.atom.Atom({'clients': {'foo': {'conns': 0}}})
+    watched = []
+    state.add_watch('w', lambda k, ref, old, new: watched.append(new))
+
+    foo = state.cursor(['clients', 'foo'])
+    assert foo.deref() == {'conns': 0}
+    assert foo.swap(lambda c: dict(c, conns=c['conns'] + 1)) == {'conns': 1}
+
+    conns = foo.cursor(['conns'])
+    assert conns.deref() == 1
+    assert conns.reset(10) == 10
+    assert state.deref() == {'clients': {'foo': {'conns': 10}}}
+    assert len(watched) == 2
+
+    assert state.cursor(['clients', 'bar', 'conns']).deref() is None
+
+
+def test_derive():
+    calls = []
+
+    def total(a, b):
+        calls.append((a, b))
+        return a + b
+
+    a, b = atomos.atom.Atom(1), atomos.atom.Atom(2)
+    derived = atomos.atom.derive(total, a, b)
+    assert calls == []
+
+    assert derived.deref() == 3
+    assert derived.deref() == 3
+    assert len(calls) == 1
+
+    # Changes invalidate the cache, but nothing is recomputed until read.
+    a.reset(10)
+    b.swap(lambda n: n + 1)
+    assert len(calls) == 1
+    assert derived.deref() == 13
+    assert len(calls) == 2
+
+    with pytest.raises(AttributeError):
+        derived.swap
+
+
+def test_derive_watches():
+    state = atomos.atom.Atom({'clients': set(['foo'])})
+    clients = atomos.atom.derive(lambda s: sorted(s['clients']), state)
+    count = atomos.atom.derive(len, clients)
+
+    changes = []
+    count.add_watch('w', lambda k, ref, old, new: changes.append((old, new)))
+
+    state.swap(lambda s: {'clients': s['clients'] | set(['bar'])})
+    state.swap(lambda s: {'clients': s['clients'] | set(['bar'])})
+    assert clients.deref() == ['bar', 'foo']
+    assert changes == [(1, 2)]
+
+
+def test_derive_chained_is_lazy():
+    calls = []
+
+    def inc(n):
+        calls.append(n)
+        return n + 1
+
+    state = atomos.atom.Atom(0)
+    first = atomos.atom.derive(inc, state)
+    second = atomos.atom.derive(inc, first)
+    for n in range(5):
+        state.reset(n + 1)
+    assert calls == []
+    assert first.get_watches() == {}
+
+    assert second.deref() == 7
+    assert calls == [5, 6]
+
+    # With a watch on the end of the chain, both are computed eagerly.
+    changes = []
+    second.add_watch('w', lambda k, ref, old, new: changes.append(new))
+    state.reset(10)
+    assert changes == [12]
+    assert calls == [5, 6, 10, 11]
+
+    del first, second
+    gc.collect()
+    state.reset(11)
+    assert state.get_watches() == {}
+
+
+def _reset_atom(atom, value):
+    atom.reset(value)
+
+
+def test_derive_other_process():
+    state = atomos.multiprocessing.atom.Atom(1)
+    derived = atomos.atom.derive(lambda n: n * 2, state)
+    assert derived.deref() == 2
+
+    # Watches do not see changes made by other processes, but the version
+    # the cache is keyed on does.
+    p = multiprocessing.Process(target=_reset_atom, args=(state, 5))
+    p.start()
+    p.join()
+    assert derived.deref() == 10
+    assert derived.deref_with_version()[1] == (state.deref_with_version()[1],)
+
+
+def test_derive_unused_is_collected():
+    state = atomos.atom.Atom(0)
+    derived = weakref.ref(atomos.atom.derive(lambda n: n, state))
+    gc.collect()
+    assert derived() is None
+
+    state.reset(1)
+    assert state.get_watches() == {}
+
+
+def test_atom_commute():
+    state = atomos.atom.Atom(frozenset())
+    notifications = []
+    state.add_watch('w', lambda k, ref, old, new: notifications.append(new))
+
+    assert state.commute(lambda s, x: s | frozenset([x]), 'foo') == \
+        frozenset(['foo'])
+    assert notifications == [frozenset(['foo'])]
+
+    with pytest.raises(ZeroDivisionError):
+        state.commute(lambda s: 1 / 0)
+    assert state.deref() == frozenset(['foo'])
+    assert len(notifications) == 1
+
+
+def test_atom_commute_combines(thread_count=4):
+    state = atomos.atom.Atom(0)
+    notifications = []
+    state.add_watch('w', lambda k, ref, old, new: notifications.append(new))
+
+    # With the combiner busy, commutes queue up, and are then applied as one.
+    state._combiner.acquire()
+    threads = [threading.Thread(target=state.commute, args=(lambda n: n + 1,))
+               for _ in range(thread_count)]
+    for t in threads:
+        t.start()
+
+    while len(state._commutes) < thread_count:
+        time.sleep(0.001)
+
+    state._combiner.release()
+    for t in threads:
+        t.join()
+
+    assert state.deref() == thread_count
+    assert notifications == [thread_count]
+
+
+def test_concurrent_commute(thread_count=8, loop_count=1000):
+    state = atomos.atom.Atom(0)
+
+    def inc_for_loop_count():
+        for _ in range(loop_count):
+            state.commute(lambda n: n + 1)
+
+    threads = [threading.Thread(target=inc_for_loop_count)
+               for _ in range(thread_count)]
+    for t in threads:
+        t.start()
+
+    for t in threads:
+        t.join()
+
+    assert state.deref() == thread_count * loop_count
@@ -5,12 +5,14 @@ tests.test_atomic
 
 import multiprocessing
 import threading
+import time
 import ctypes
 
 import pytest
 
 import atomos.atomic
 import atomos.multiprocessing.atomic
+import atomos.util
 
 
 refs = [(atomos.atomic.AtomicReference({}), threading.Thread),
@@ -31,13 +33,25 @@ class TestNumberP(atomos.multiprocessing.atomic.AtomicNumber):
         self._value = value
 
 
+# The pure Python integer and boolean types, plus the compiled ones when the
+# optional extension is available. Tests over these run against both backends.
+speedups = atomos.atomic.AtomicInteger is not atomos.atomic._PyAtomicInteger
+
+int_types = [atomos.atomic._PyAtomicInteger, atomos.atomic._PyAtomicLong]
+bool_types = [atomos.atomic._PyAtomicBoolean]
+if speedups:
+    int_types += [atomos.atomic.AtomicInteger, atomos.atomic.AtomicLong]
+    bool_types += [atomos.atomic.AtomicBoolean]
+
+
 numbers = [(TestNumberT(), threading.Thread),
            (TestNumberP(), multiprocessing.Process)]
+numbers += [(cls(), threading.Thread) for cls in int_types]
 
 
-ints = [(atomos.atomic.AtomicInteger(), threading.Thread),
-        (atomos.multiprocessing.atomic.AtomicInteger(),
-         multiprocessing.Process)]
+ints = [(cls(), threading.Thread) for cls in int_types]
+ints += [(atomos.multiprocessing.atomic.AtomicInteger(),
+          multiprocessing.Process)]
 
 
 @pytest.fixture(params=refs)
@@ -158,3 +172,348 @@ def test_concurrent_atomic_ref(atomic_reference,
         p.join()
 
     assert atomic_reference.get()['count'] == proc_count * loop_count
+
+
+@pytest.mark.parametrize('cls, value, bad_value, bad_delta', [
+    (cls, 1, 1.0, 1.0) for cls in int_types
+] + [
+    (atomos.atomic.AtomicFloat, 1.0, 1, '1'),
+])
+def test_atomic_number_type_guarantees(cls, value, bad_value, bad_delta):
+    with pytest.raises(TypeError):
+        cls(bad_value)
+
+    atomic_number = cls(value)
+
+    for method in ('set', 'get_and_set'):
+        with pytest.raises(TypeError):
+            getattr(atomic_number, method)(bad_value)
+
+    with pytest.raises(TypeError):
+        atomic_number.compare_and_set(value, bad_value)
+
+    for method in ('add_and_get', 'get_and_add',
+                   'subtract_and_get', 'get_and_subtract'):
+        with pytest.raises(TypeError):
+            getattr(atomic_number, method)(bad_delta)
+
+    assert atomic_number.get() == value
+    assert type(atomic_number.get()) is type(value)
+
+    atomic_number.add_and_get(1)
+    assert type(atomic_number.get()) is type(value)
+
+
+@pytest.mark.parametrize('cls', bool_types)
+def test_atomic_boolean_type_guarantees(cls):
+    with pytest.raises(TypeError):
+        cls(1)
+
+    atomic_bool = cls()
+
+    for method in ('set', 'get_and_set'):
+        with pytest.raises(TypeError):
+            getattr(atomic_bool, method)(1)
+
+    with pytest.raises(TypeError):
+        atomic_bool.compare_and_set(False, 1)
+
+    assert atomic_bool.get() is False
+    assert atomic_bool.compare_and_set(False, True) is True
+    assert atomic_bool.get() is True
+
+
+@pytest.mark.parametrize('cls', int_types + bool_types)
+def test_atomic_repr(cls):
+    ref = cls()
+    assert repr(ref) == '<atomos.atomic.{0}({1!r}) object at {2}>'.format(
+        cls.__name__, ref.get(), hex(id(ref)))
+
+
+@pytest.mark.parametrize('cls', int_types + bool_types)
+def test_atomic_isinstance(cls):
+    ref = cls()
+    assert isinstance(ref, atomos.atomic.AtomicReference)
+    if cls in int_types:
+        assert isinstance(ref, atomos.atomic.AtomicNumber)
+
+
+@pytest.mark.parametrize('cls', int_types)
+def test_atomic_number_keywords(cls):
+    ref = cls()
+    assert ref.set(value=1) == 1
+    assert ref.get_and_set(value=2) == 1
+    assert ref.compare_and_set(expect=2, update=3) is True
+    assert ref.compare_and_set(3, update=4) is True
+    assert ref.add_and_get(delta=2) == 6
+    assert ref.get_and_add(delta=2) == 6
+    assert ref.subtract_and_get(delta=1) == 7
+    assert ref.get_and_subtract(delta=1) == 7
+    assert ref.get_if_changed(since_version=0) == (6, 8)
+
+    with pytest.raises(TypeError):
+        ref.set(1, value=1)
+
+    with pytest.raises(TypeError):
+        ref.compare_and_set(expect=6)
+
+
+@pytest.mark.parametrize('cls', bool_types)
+def test_atomic_boolean_keywords(cls):
+    ref = cls()
+    assert ref.set(value=True) is True
+    assert ref.get_and_set(value=False) is True
+    assert ref.compare_and_set(expect=False, update=True) is True
+    assert ref.get_if_changed(since_version=0) == (True, 3)
+
+    with pytest.raises(TypeError):
+        ref.set(flag=True)
+
+
+@pytest.mark.skipif(not speedups, reason='compiled extension not built')
+def test_speedups_overflow():
+    atomic_long = atomos.atomic.AtomicLong(2 ** 63 - 1)
+
+    with pytest.raises(OverflowError):
+        atomic_long.add_and_get(1)
+
+    with pytest.raises(OverflowError):
+        atomic_long.set(2 ** 63)
+
+    assert atomic_long.get() == 2 ** 63 - 1
+    assert atomic_long.compare_and_set(2 ** 64, 0) is False
+    assert atomic_long.compare_and_set(float(2 ** 62), 0) is False
+    assert atomic_long.compare_and_set(2 ** 63 - 1.0, 0) is False
+    assert atomic_long.compare_and_set(2 ** 63 - 1, 0) is True
+    assert atomic_long.get_and_subtract(2 ** 63 - 1) == 0
+    assert atomic_long.get() == -(2 ** 63 - 1)
+
+
+@pytest.mark.skipif(not speedups, reason='compiled extension not built')
+def test_speedups_lock_type():
+    for cls, py_cls in ((atomos.atomic.AtomicInteger,
+                         atomos.atomic._PyAtomicInteger),
+                        (atomos.atomic.AtomicLong,
+                         atomos.atomic._PyAtomicLong),
+                        (atomos.atomic.AtomicBoolean,
+                         atomos.atomic._PyAtomicBoolean)):
+        # The compiled types take no lock, so given a lock type the pure
+        # Python ones are constructed instead.
+        assert type(cls()) is cls
+        assert type(cls(lock_type=None)) is cls
+        ref = cls(lock_type=atomos.util.BiasedLock)
+        assert type(ref) is py_cls
+        assert isinstance(ref._lock, atomos.util.BiasedLock)
+
+    class Subclass(atomos.atomic.AtomicLong):
+        pass
+
+    with pytest.raises(TypeError):
+        Subclass(lock_type=atomos.util.BiasedLock)
+
+
+def test_atomic_reference_compare_and_set_identity():
+    class NeverEqual(object):
+        def __eq__(self, other):
+            return False
+
+    value = NeverEqual()
+    atomic_reference = atomos.atomic.AtomicReference(value)
+
+    assert atomic_reference.compare_and_set(NeverEqual(), None) is False
+    assert atomic_reference.compare_and_set(value, None) is True
+    assert atomic_reference.get() is None
+
+
+def test_atomic_reference_versions(atomic_reference):
+    atomic_reference, _ = atomic_reference
+    value, version = atomic_reference.get_with_version()
+    assert atomic_reference.get_version() == version
+    assert atomic_reference.get_if_changed(version) is None
+
+    atomic_reference.set({'foo': 'bar'})
+    assert atomic_reference.get_if_changed(version) == ({'foo': 'bar'},
+                                                        version + 1)
+
+    assert atomic_reference.compare_and_set({}, None) is False
+    assert atomic_reference.get_version() == version + 1
+
+    assert atomic_reference.compare_and_set({'foo': 'bar'}, {}) is True
+    assert atomic_reference.get_and_set({}) == {}
+    assert atomic_reference.get_with_version() == ({}, version + 3)
+
+
+@pytest.mark.parametrize('cls', int_types + bool_types)
+def test_atomic_versions(cls):
+    ref = cls()
+    value, version = ref.get_with_version()
+    assert (value, version) == (ref.get(), 0)
+    assert ref.get_if_changed(0) is None
+
+    if isinstance(value, bool):
+        ref.set(True)
+        assert ref.compare_and_set(False, False) is False
+        assert ref.get_and_set(False) is True
+    else:
+        ref.add_and_get(2)
+        assert ref.compare_and_set(0, 1) is False
+        assert ref.get_and_subtract(1) == 2
+
+    assert ref.get_if_changed(0) == (ref.get(), 2)
+    assert ref.get_version() == 2
+
+
+waitable_ints = [(cls, threading.Thread) for cls in int_types]
+waitable_ints += [(atomos.multiprocessing.atomic.AtomicInteger,
+                   multiprocessing.Process)]
+
+
+@pytest.mark.parametrize('cls, proc', waitable_ints)
+def test_atomic_wait_until(cls, proc):
+    counter = cls(3)
+
+    def count_down():
+        for _ in range(3):
+            time.sleep(0.01)
+            counter.subtract_and_get(1)
+
+    p = proc(target=count_down)
+    p.start()
+    assert counter.wait_until(lambda n: n == 0, timeout=10) is True
+    p.join()
+
+    assert counter.get() == 0
+    assert counter.wait_until(lambda n: n == 1, timeout=0.01) is False
+
+
+@pytest.mark.parametrize('cls, proc', waitable_ints)
+def test_atomic_await_change(cls, proc):
+    counter = cls()
+    value, version = counter.get_with_version()
+    assert counter.await_change(version, timeout=0.01) is None
+
+    p = proc(target=counter.set, args=(1,))
+    p.start()
+    assert counter.await_change(version, timeout=10) == (1, version + 1)
+    p.join()
+
+
+@pytest.mark.parametrize('cls', bool_types)
+def test_atomic_boolean_wait_until(cls):
+    flag = cls()
+    t = threading.Timer(0.01, flag.set, args=(True,))
+    t.start()
+    assert flag.wait_until(lambda v: v, timeout=10) is True
+    t.join()
+
+
+def test_atomic_reference_wait_until(atomic_reference):
+    atomic_reference, proc = atomic_reference
+
+    p = proc(target=atomic_reference.set, args=({'foo': 'bar'},))
+    p.start()
+    assert atomic_reference.wait_until(lambda v: 'foo' in v,
+                                       timeout=10) is True
+    p.join()
+
+    assert atomic_reference.wait_until(lambda v: 'baz' in v,
+                                       timeout=0.01) is False
+
+
+def test_atomic_stamped_reference():
+    class Node(object):
+        def __eq__(self, other):
+            return True
+
+    a, b = Node(), Node()
+    ref = atomos.atomic.AtomicStampedReference(a, 0)
+    assert ref.get() == (a, 0)
+
+    # References are compared by identity, stamps by value.
+    assert ref.compare_and_set(b, b, 0, 1) is False
+    assert ref.compare_and_set(a, b, 1, 1) is False
+    assert ref.compare_and_set(a, b, 0, 1) is True
+    assert ref.get_reference() is b
+    assert ref.get_stamp() == 1
+
+    # A -> B -> A is told apart by its stamp.
+    ref.set(a, 2)
+    assert ref.compare_and_set(a, b, 0, 1) is False
+
+    assert ref.attempt_stamp(b, 3) is False
+    assert ref.attempt_stamp(a, 3) is True
+    assert ref.get_and_set(None, 4) == (a, 3)
+    assert ref.get_with_version() == ((None, 4), 4)
+
+    with pytest.raises(TypeError):
+        ref.set(a, 'stamp')
+
+
+def test_atomic_markable_reference():
+    a, b = object(), object()
+    ref = atomos.atomic.AtomicMarkableReference(a)
+    assert ref.get() == (a, False)
+
+    assert ref.compare_and_set(a, b, True, False) is False
+    assert ref.attempt_mark(b, True) is False
+    assert ref.attempt_mark(a, True) is True
+    assert ref.is_marked() is True
+    assert ref.compare_and_set(a, b, True, False) is True
+    assert ref.get_reference() is b
+
+    with pytest.raises(TypeError):
+        ref.set(a, 1)
+
+
+bitsets = [(atomos.atomic.AtomicBitSet, threading.Thread),
+           (atomos.multiprocessing.atomic.AtomicBitSet,
+            multiprocessing.Process)]
+
+
+@pytest.mark.parametrize('cls, _', bitsets)
+def test_atomic_bit_set(cls, _):
+    bits = cls(130, stripes=3)
+    assert len(bits._locks) == 4
+    assert len(bits) == 130
+    assert bits.popcount() == 0
+
+    assert bits.test_and_set(129) is False
+    assert bits.test_and_set(129) is True
+    assert 129 in bits
+    assert bits.get(0) is False
+
+    assert bits.set_many([5, 64, 129, 5, 3]) == [5, 64, 3]
+    assert bits.popcount() == 4
+    assert bits.clear(64) is True
+    assert bits.clear(64) is False
+    assert bits.popcount() == 3
+
+    with pytest.raises(IndexError):
+        bits.test_and_set(130)
+
+    with pytest.raises(IndexError):
+        bits.get(-1)
+
+
+def set_bits(bits, indices, added):
+    for i in indices:
+        if not bits.test_and_set(i):
+            with added.get_lock():
+                added.value += 1
+
+
+@pytest.mark.parametrize('cls, proc', bitsets)
+def test_atomic_bit_set_test_and_set(cls, proc, count=4, size=2000):
+    # Every bit is claimed by exactly one of the workers racing for it.
+    bits = cls(size)
+    added = multiprocessing.Value('i', 0)
+    workers = [proc(target=set_bits, args=(bits, range(size), added))
+               for _ in range(count)]
+    for w in workers:
+        w.start()
+
+    for w in workers:
+        w.join()
+
+    assert added.value == size
+    assert bits.popcount() == size
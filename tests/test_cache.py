@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+'''
+tests.test_cache
+'''
+
+import threading
+import time
+
+import pytest
+
+import atomos.cache
+
+
+def test_cache():
+    cache = atomos.cache.Cache(maxsize=10)
+    assert cache.get('foo') is None
+    assert cache.get('foo', 'bar') == 'bar'
+
+    cache.put('foo', 'bar')
+    assert cache.get('foo') == 'bar'
+    assert 'foo' in cache
+    assert len(cache) == 1
+
+    assert cache.get_or_load('baz', lambda key: key * 2) == 'bazbaz'
+    assert cache.get_or_load('baz', lambda key: 1 / 0) == 'bazbaz'
+
+    cache.invalidate('foo')
+    assert 'foo' not in cache
+    cache.clear()
+    assert len(cache) == 0
+
+    assert cache.stats() == {'hits': 2, 'misses': 3, 'loads': 1,
+                             'evictions': 0}
+
+    with pytest.raises(ValueError):
+        atomos.cache.Cache(maxsize=0)
+
+
+def test_cache_eviction():
+    cache = atomos.cache.Cache(maxsize=4)
+    for key in range(4):
+        cache.put(key, key)
+
+    # Reading a key makes it the most recently used.
+    assert cache.get(0) == 0
+    cache.put(4, 4)
+    assert 1 not in cache
+    assert all(key in cache for key in (0, 2, 3, 4))
+    assert cache.stats()['evictions'] == 1
+
+    # Larger caches stay bounded, too.
+    cache = atomos.cache.Cache(maxsize=100)
+    for key in range(1000):
+        cache.put(key, key)
+    assert len(cache) == 100
+    assert cache.stats()['evictions'] == 900
+
+
+def test_cache_ttl():
+    cache = atomos.cache.Cache(ttl=0.05)
+    cache.put('foo', 'bar')
+    cache.put('baz', 'qux', ttl=60)
+    assert cache.get('foo') == 'bar'
+
+    time.sleep(0.1)
+    assert cache.get('foo') is None
+    assert cache.get('baz') == 'qux'
+    assert len(cache) == 1
+
+
+def test_cache_get_or_load_recheck():
+    cache = atomos.cache.Cache()
+    cache.put('foo', 'bar')
+    cache.put('baz', 'qux', ttl=0.01)
+    time.sleep(0.02)
+
+    # Have the lock-free lookup miss, as it would should another thread add
+    # the entry right after. The entry found under the lock is a hit, unless
+    # it expired.
+    cache._lookup = lambda segment, key: None
+    assert cache.get_or_load('foo', lambda key: 1 / 0) == 'bar'
+    assert cache.get_or_load('baz', lambda key: key * 2) == 'bazbaz'
+    assert cache.stats() == {'hits': 1, 'misses': 1, 'loads': 1,
+                             'evictions': 0}
+
+
+def test_cache_single_flight(thread_count=10):
+    cache = atomos.cache.Cache()
+    calls = []
+    release = threading.Event()
+
+    def load(key):
+        calls.append(key)
+        release.wait()
+        return key.upper()
+
+    results = []
+    threads = [threading.Thread(
+        target=lambda: results.append(cache.get_or_load('foo', load)))
+        for _ in range(thread_count)]
+    for t in threads:
+        t.start()
+
+    time.sleep(0.05)
+    release.set()
+    for t in threads:
+        t.join()
+
+    assert calls == ['foo']
+    assert results == ['FOO'] * thread_count
+
+
+def test_cache_load_error():
+    cache = atomos.cache.Cache(loader=lambda key: 1 / 0)
+    with pytest.raises(ZeroDivisionError):
+        cache.get_or_load('foo')
+
+    # Nothing is cached for failed loads.
+    assert 'foo' not in cache
+    assert cache.get_or_load('foo', lambda key: 'bar') == 'bar'
+
+
+def test_cached():
+    calls = []
+
+    @atomos.cache.cached(maxsize=10)
+    def square(n, offset=0):
+        calls.append(n)
+        return n * n + offset
+
+    assert square(3) == 9
+    assert square(3) == 9
+    assert square(3, offset=1) == 10
+    assert calls == [3, 3]
+    assert square.cache.stats()['hits'] == 1
+
+    @atomos.cache.cached(key=lambda d: d['id'])
+    def name(d):
+        return d['name']
+
+    assert name({'id': 1, 'name': 'foo'}) == 'foo'
+    assert name({'id': 1, 'name': 'bar'}) == 'foo'
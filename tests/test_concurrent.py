@@ -0,0 +1,215 @@
+# -*- coding: utf-8 -*-
+'''
+tests.test_concurrent
+'''
+
+import threading
+
+import pytest
+
+import atomos.concurrent
+
+
+def test_stack():
+    stack = atomos.concurrent.ConcurrentStack()
+    assert stack.is_empty() is True
+    assert stack.pop() is None
+    assert stack.pop('empty') == 'empty'
+
+    stack.push(1)
+    stack.push_all([2, 3, 4])
+    assert stack.peek() == 4
+    assert stack.pop() == 4
+    assert stack.drain(2) == [3, 2]
+    assert stack.drain() == [1]
+    assert stack.drain() == []
+    assert stack.is_empty() is True
+
+
+def test_queue():
+    queue = atomos.concurrent.ConcurrentQueue()
+    assert queue.is_empty() is True
+    assert queue.poll() is None
+    assert queue.poll('empty') == 'empty'
+
+    queue.offer(1)
+    queue.offer_all([2, 3, 4])
+    queue.offer_all([])
+    assert queue.peek() == 1
+    assert queue.poll() == 1
+    assert queue.drain(2) == [2, 3]
+    queue.offer(5)
+    assert queue.drain() == [4, 5]
+    assert queue.drain() == []
+    assert queue.is_empty() is True
+
+
+def test_queue_releases_values():
+    class Value(object):
+        pass
+
+    queue = atomos.concurrent.ConcurrentQueue()
+    queue.offer(Value())
+    queue.poll()
+    assert queue._head.get().value is None
+
+
+def test_concurrent_stack(thread_count=8, loop_count=1000):
+    stack = atomos.concurrent.ConcurrentStack()
+    popped = []
+
+    def worker(n):
+        for i in range(loop_count):
+            stack.push((n, i))
+            if i % 2:
+                stack.push_all([(n, i, 'a'), (n, i, 'b')])
+            popped.append(stack.pop())
+
+    threads = [threading.Thread(target=worker, args=(n,))
+               for n in range(thread_count)]
+    for t in threads:
+        t.start()
+
+    for t in threads:
+        t.join()
+
+    popped.extend(stack.drain())
+    assert len(popped) == len(set(popped)) == thread_count * loop_count * 2
+
+
+def test_concurrent_queue(thread_count=4, loop_count=1000):
+    queue = atomos.concurrent.ConcurrentQueue()
+    consumed = []
+    done = threading.Event()
+
+    def producer(n):
+        for i in range(0, loop_count, 2):
+            queue.offer((n, i))
+            queue.offer_all([(n, i + 1)])
+
+    def consumer():
+        while not done.is_set() or not queue.is_empty():
+            consumed.extend(queue.drain(10))
+
+    producers = [threading.Thread(target=producer, args=(n,))
+                 for n in range(thread_count)]
+    consumers = [threading.Thread(target=consumer)
+                 for _ in range(thread_count)]
+    for t in producers + consumers:
+        t.start()
+
+    for t in producers:
+        t.join()
+
+    done.set()
+    for t in consumers:
+        t.join()
+
+    assert len(consumed) == len(set(consumed)) == thread_count * loop_count
+
+
+def test_queue_peek_during_poll():
+    queue = atomos.concurrent.ConcurrentQueue()
+    queue.offer_all(['foo', 'bar'])
+    head = queue._head
+    polled = []
+
+    class PollingHead(object):
+        # Has another consumer poll right after `peek` first read the head.
+        def get(self):
+            value = head.get()
+            queue._head = head
+            polled.append(queue.poll())
+            return value
+
+    queue._head = PollingHead()
+    assert queue.peek() == 'bar'
+    assert polled == ['foo']
+
+
+def test_map():
+    m = atomos.concurrent.ConcurrentMap(concurrency_level=3)
+    assert len(m._tables) == 4
+    assert m.get('foo') is None
+    assert m.get('foo', 'default') == 'default'
+
+    assert m.put('foo', 1) is None
+    assert m.put('foo', 2) == 1
+    assert m.put_if_absent('foo', 3) == 2
+    assert m.put_if_absent('bar', 3) is None
+    assert m['bar'] == 3
+    assert 'bar' in m
+    assert len(m) == 2
+
+    assert m.compute('foo', lambda k, v: v + 1) == 3
+    assert m.compute('baz', lambda k, v: k if v is None else v) == 'baz'
+    assert m.compute('baz', lambda k, v: None) is None
+    assert 'baz' not in m
+
+    calls = []
+    assert m.compute_if_absent('qux', lambda k: calls.append(k) or [k]) == \
+        ['qux']
+    assert m.compute_if_absent('qux', lambda k: calls.append(k) or []) == \
+        ['qux']
+    assert calls == ['qux']
+
+    assert m.compute_if_present('nope', lambda k, v: 1) is None
+    assert 'nope' not in m
+    assert m.compute_if_present('qux', lambda k, v: None) is None
+    assert 'qux' not in m
+
+    def add(old, new):
+        return old + new
+
+    assert m.merge('n', 1, add) == 1
+    assert m.merge('n', 1, add) == 2
+    assert m.merge('n', 1, lambda old, new: None) is None
+    assert 'n' not in m
+
+    assert sorted(m.items()) == [('bar', 3), ('foo', 3)]
+    assert sorted(m) == ['bar', 'foo']
+    assert sorted(m.values()) == [3, 3]
+
+    del m['foo']
+    assert m.remove('foo') is None
+    with pytest.raises(KeyError):
+        m['foo']
+    with pytest.raises(KeyError):
+        del m['foo']
+    with pytest.raises(ValueError):
+        m['foo'] = None
+
+
+def test_map_iteration_during_changes():
+    m = atomos.concurrent.ConcurrentMap()
+    for i in range(100):
+        m[i] = i
+
+    seen = []
+    for key in m:
+        m[key + 1000] = key
+        seen.append(key)
+
+    assert set(range(100)) <= set(seen)
+
+
+def test_concurrent_map(thread_count=8, loop_count=1000):
+    m = atomos.concurrent.ConcurrentMap()
+
+    def add(old, new):
+        return old + new
+
+    def worker():
+        for i in range(loop_count):
+            m.merge(i % 10, 1, add)
+            m.compute('total', lambda k, v: (v or 0) + 1)
+
+    threads = [threading.Thread(target=worker) for _ in range(thread_count)]
+    for t in threads:
+        t.start()
+
+    for t in threads:
+        t.join()
+
+    assert m['total'] == thread_count * loop_count
+    assert [m[i] for i in range(10)] == [thread_count * loop_count // 10] * 10
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+'''
+tests.test_delay
+'''
+
+import threading
+import time
+
+import pytest
+
+import atomos.delay
+
+
+def test_delay():
+    calls = []
+
+    def compute(a, b=0):
+        calls.append((a, b))
+        return a + b
+
+    d = atomos.delay.Delay(compute, 1, b=2)
+    assert d.realized() is False
+    assert calls == []
+
+    assert d.deref() == 3
+    assert d.deref() == 3
+    assert d.realized() is True
+    assert calls == [(1, 2)]
+
+
+def test_delay_none():
+    d = atomos.delay.Delay(lambda: None)
+    assert d.deref() is None
+    assert d.realized() is True
+
+
+def test_delay_error():
+    calls = []
+
+    def fail():
+        calls.append(1)
+        raise ValueError('foo')
+
+    d = atomos.delay.Delay(fail)
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            d.deref()
+
+    # The function is not retried.
+    assert calls == [1]
+    assert d.realized() is True
+
+
+def test_delay_threads(thread_count=10):
+    calls = []
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.05)
+        return 'foo'
+
+    d = atomos.delay.Delay(compute)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(d.deref()))
+               for _ in range(thread_count)]
+    for t in threads:
+        t.start()
+
+    for t in threads:
+        t.join()
+
+    assert calls == [1]
+    assert results == ['foo'] * thread_count
+
+
+def test_promise():
+    p = atomos.delay.Promise()
+    assert p.realized() is False
+    assert p.deref(timeout=0.01) is None
+    assert p.deref(timeout=0.01, default='bar') == 'bar'
+
+    assert p.deliver('foo') is True
+    assert p.deliver('bar') is False
+    assert p.realized() is True
+    assert p.deref() == 'foo'
+
+
+def test_promise_threads(thread_count=10):
+    p = atomos.delay.Promise()
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(p.deref()))
+               for _ in range(thread_count)]
+    for t in threads:
+        t.start()
+
+    p.deliver(42)
+    for t in threads:
+        t.join()
+
+    assert results == [42] * thread_count
@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+'''
+tests.test_durable
+'''
+
+import json
+import os
+import threading
+
+import pytest
+
+import atomos.durable
+
+
+durabilities = [atomos.durable.ASYNC,
+                atomos.durable.BATCHED,
+                atomos.durable.SYNC]
+
+
+def inc(n):
+    return n + 1
+
+
+@pytest.mark.parametrize('durability', durabilities)
+def test_durable_atom_recovers(tmp_path, durability):
+    directory = str(tmp_path / 'state')
+
+    with atomos.durable.DurableAtom(directory, 0,
+                                    durability=durability) as atom:
+        for _ in range(10):
+            atom.swap(inc)
+
+        assert atom.compare_and_set(10, 20) is True
+        assert atom.compare_and_set(10, 30) is False
+
+    with atomos.durable.DurableAtom(directory, 0) as atom:
+        assert atom.deref() == 20
+        atom.reset(5)
+
+    with atomos.durable.DurableAtom(directory, 0) as atom:
+        assert atom.deref() == 5
+
+
+def test_durable_atom_sync(tmp_path):
+    directory = str(tmp_path / 'state')
+    atom = atomos.durable.DurableAtom(directory, 0)
+
+    atom.swap(inc)
+    assert atom.sync() is True
+
+    # Recovery only needs what is on disk, even with the atom still open.
+    state, lsn = atom._recover(None)
+    assert (state, lsn) == (1, 1)
+
+    atom.close()
+
+
+def test_durable_atom_snapshots(tmp_path):
+    directory = str(tmp_path / 'state')
+
+    with atomos.durable.DurableAtom(directory, 0, snapshot_every=4) as atom:
+        for _ in range(10):
+            atom.swap(inc)
+            atom.sync()
+
+    assert os.path.exists(os.path.join(directory, 'snapshot'))
+    assert os.path.getsize(os.path.join(directory, 'wal')) < \
+        10 * atomos.durable._RECORD.size
+
+    with atomos.durable.DurableAtom(directory, 0) as atom:
+        assert atom.deref() == 10
+
+
+def test_durable_atom_torn_record(tmp_path):
+    directory = str(tmp_path / 'state')
+
+    with atomos.durable.DurableAtom(directory, 0) as atom:
+        atom.reset(1)
+        atom.reset(2)
+
+    wal = os.path.join(directory, 'wal')
+    size = os.path.getsize(wal)
+    with open(wal, 'r+b') as f:
+        f.truncate(size - 1)
+
+    with atomos.durable.DurableAtom(directory, 0) as atom:
+        assert atom.deref() == 1
+        atom.reset(3)
+
+    with atomos.durable.DurableAtom(directory, 0) as atom:
+        assert atom.deref() == 3
+
+
+def test_durable_atom_deltas(tmp_path):
+    directory = str(tmp_path / 'state')
+
+    def diff(old, new):
+        return [[k, v] for k, v in new.items() if old.get(k) != v]
+
+    def patch(state, delta):
+        state = state.copy()
+        state.update(delta)
+        return state
+
+    def open_atom():
+        return atomos.durable.DurableAtom(directory, {}, serializer=JSON,
+                                          diff=diff, patch=patch,
+                                          snapshot_every=3)
+
+    with open_atom() as atom:
+        for i in range(5):
+            atom.swap(lambda s, i: dict(s, **{str(i): i}), i)
+
+    with open_atom() as atom:
+        assert atom.deref() == {'0': 0, '1': 1, '2': 2, '3': 3, '4': 4}
+
+
+class JSON(object):
+    @staticmethod
+    def dumps(obj):
+        return json.dumps(obj).encode('utf-8')
+
+    @staticmethod
+    def loads(data):
+        return json.loads(data.decode('utf-8'))
+
+
+def test_concurrent_durable_atom(tmp_path, thread_count=10, loop_count=100):
+    directory = str(tmp_path / 'state')
+
+    with atomos.durable.DurableAtom(directory, 0, snapshot_every=50) as atom:
+        def inc_for_loop_count():
+            for _ in range(loop_count):
+                atom.swap(inc)
+
+        threads = [threading.Thread(target=inc_for_loop_count)
+                   for _ in range(thread_count)]
+        for t in threads:
+            t.start()
+
+        for t in threads:
+            t.join()
+
+    with atomos.durable.DurableAtom(directory, 0) as atom:
+        assert atom.deref() == thread_count * loop_count
+
+
+def test_durable_atom_arguments(tmp_path):
+    with pytest.raises(ValueError):
+        atomos.durable.DurableAtom(str(tmp_path), durability='never')
+
+    with pytest.raises(ValueError):
+        atomos.durable.DurableAtom(str(tmp_path), diff=lambda a, b: b)
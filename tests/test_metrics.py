@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+'''
+tests.test_metrics
+'''
+
+import threading
+
+import pytest
+
+import atomos.metrics
+
+
+def run_threads(fn, thread_count):
+    threads = [threading.Thread(target=fn) for _ in range(thread_count)]
+    for t in threads:
+        t.start()
+
+    for t in threads:
+        t.join()
+
+
+def test_counter_and_gauge():
+    with atomos.metrics.Registry() as registry:
+        requests = registry.counter('requests')
+        assert registry.counter('requests') is requests
+        requests.inc()
+        requests.inc(41)
+        assert requests.get() == 42
+
+        load = registry.gauge('load')
+        load.set(0.5)
+        assert load.get() == 0.5
+
+        with pytest.raises(ValueError):
+            registry.gauge('requests')
+
+        assert registry.snapshot() == {'requests': 42, 'load': 0.5}
+
+
+@pytest.mark.parametrize('thread_count', [4, 32])
+def test_counter_threads(thread_count, loop_count=1000):
+    # With more threads than stripes, the extra ones share a stripe.
+    with atomos.metrics.Registry(stripes=8) as registry:
+        counter = registry.counter('requests')
+        histogram = registry.histogram('latency')
+
+        def record():
+            for i in range(loop_count):
+                counter.inc()
+                histogram.record(i)
+
+        run_threads(record, thread_count)
+        assert counter.get() == thread_count * loop_count
+
+        snapshot = histogram.snapshot()
+        assert snapshot.count == thread_count * loop_count
+        assert snapshot.total == thread_count * sum(range(loop_count))
+
+        # Stripes of exited threads are reused.
+        assert len(registry._free_stripes) == 7
+
+
+def test_histogram():
+    with atomos.metrics.Registry() as registry:
+        histogram = registry.histogram('latency', max_value=1 << 20,
+                                       sub_bucket_bits=3)
+        assert histogram.snapshot().percentile(50) is None
+
+        for value in range(1, 101):
+            histogram.record(value)
+        histogram.record(1 << 30)
+
+        snapshot = histogram.snapshot()
+        assert snapshot.count == 101
+        assert snapshot.mean() == (5050 + (1 << 30)) / 101.0
+        # Values are counted in buckets no wider than a quarter of the value.
+        assert 50 <= snapshot.percentile(50) <= 50 * 1.25
+        assert snapshot.buckets[0] == (1, 1, 1)
+        # Values beyond the maximum are counted in the last bucket.
+        lowest, highest, count = snapshot.buckets[-1]
+        assert lowest <= 1 << 20 <= highest
+        assert count == 1
+
+        with pytest.raises(ValueError):
+            histogram.record(-1)
+
+
+def test_invalid_values():
+    with atomos.metrics.Registry() as registry:
+        counter = registry.counter('requests')
+        histogram = registry.histogram('latency')
+        with pytest.raises(TypeError):
+            counter.inc(1.5)
+        with pytest.raises(TypeError):
+            histogram.record(1.5)
+
+        counter.inc((1 << 63) - 1)
+        with pytest.raises(OverflowError):
+            counter.inc()
+        assert counter.get() == (1 << 63) - 1
+
+        histogram.record((1 << 63) - 1)
+        with pytest.raises(OverflowError):
+            histogram.record(1)
+        # The value which overflowed the sum is not counted.
+        assert histogram.snapshot().count == 1
+
+
+def test_attach_dead_writer(tmpdir, monkeypatch):
+    path = str(tmpdir.join('metrics'))
+    with atomos.metrics.Registry(path) as registry:
+        # A writer which died while writing the directory leaves its
+        # sequence number odd.
+        registry._cells[1] += 1
+        registry._mmap.flush()
+        monkeypatch.setattr(atomos.metrics, '_DIRECTORY_RETRIES', 3)
+        with pytest.raises(RuntimeError):
+            atomos.metrics.Registry.attach(path)
+
+
+def test_export(tmpdir):
+    path = str(tmpdir.join('metrics'))
+    with atomos.metrics.Registry(path) as registry:
+        registry.counter('requests').inc(3)
+        registry.histogram('latency').record(250)
+
+        with atomos.metrics.Registry.attach(path) as scraper:
+            assert scraper['requests'].get() == 3
+            with pytest.raises(KeyError):
+                scraper.counter('errors')
+
+        # Metrics registered afterwards are exported too.
+        registry.gauge('load').set(1.5)
+        snapshot = atomos.metrics.read(path)
+        assert snapshot['requests'] == 3
+        assert snapshot['load'] == 1.5
+        assert snapshot['latency'].count == 1
+
+    other = tmpdir.join('other')
+    other.write('other')
+    with pytest.raises(ValueError):
+        atomos.metrics.read(str(other))
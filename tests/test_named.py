@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+'''
+tests.test_named
+'''
+
+import multiprocessing
+import os
+import uuid
+
+import pytest
+
+from multiprocessing import shared_memory
+
+import atomos.multiprocessing.named as named
+
+
+@pytest.fixture
+def registry_name():
+    name = 'atomos-test-' + uuid.uuid4().hex[:8]
+    yield name
+    os.unlink(named._lock_path(name))
+
+
+@pytest.fixture
+def registry(registry_name):
+    registry = named.Registry(registry_name, capacity=8)
+    yield registry
+    registry.close()
+
+
+@pytest.mark.parametrize('cls, zero, one', [
+    (named.AtomicInteger, 0, 1),
+    (named.AtomicLong, 0, 1),
+    (named.AtomicFloat, 0.0, 1.0),
+])
+def test_named_number_operations(registry, cls, zero, one):
+    number = cls(registry, 'number')
+
+    assert number.get() == zero
+    assert number.add_and_get(one) == one
+    assert number.get_and_add(one) == one
+    assert number.subtract_and_get(one) == one
+    assert number.get_and_subtract(one) == one
+    assert number.set(one) == one
+    assert number.get_and_set(zero) == one
+    assert number.compare_and_set(one, zero) is False
+    assert number.compare_and_set(zero, one) is True
+    assert number.get() == one
+    assert type(number.get()) is type(one)
+
+    with pytest.raises(TypeError):
+        number.add_and_get('1')
+
+
+def test_named_boolean(registry):
+    flag = named.AtomicBoolean(registry, 'flag')
+
+    assert flag.get() is False
+    assert flag.compare_and_set(False, True) is True
+    assert flag.get() is True
+
+    with pytest.raises(TypeError):
+        flag.set(1)
+
+
+def test_named_atomics_share_slots(registry):
+    a = named.AtomicLong(registry, 'shared', value=10)
+    b = named.AtomicLong(registry, 'shared', value=20)
+
+    assert b.get() == 10
+    a.add_and_get(1)
+    assert b.get() == 11
+    assert registry.names() == ['shared']
+
+    with pytest.raises(TypeError):
+        named.AtomicFloat(registry, 'shared')
+
+    a.close()
+    assert registry.names() == ['shared']
+    assert b.add_and_get(1) == 12
+
+    b.close()
+    assert registry.names() == []
+
+    # A released slot starts over.
+    with named.AtomicLong(registry, 'shared', value=5) as c:
+        assert c.get() == 5
+
+
+def test_named_registry_capacity(registry):
+    atomics = [named.AtomicInteger(registry, str(i)) for i in range(8)]
+
+    with pytest.raises(ValueError):
+        named.AtomicInteger(registry, 'one too many')
+
+    # Released slots are reused.
+    atomics.pop().close()
+    named.AtomicInteger(registry, 'one too many')
+
+    with pytest.raises(ValueError):
+        named.AtomicInteger(registry, 'x' * (named.MAX_NAME_LENGTH + 1))
+
+
+def test_named_registry_unlinked_on_close(registry_name):
+    named.Registry(registry_name).close()
+
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(registry_name)
+
+
+def increment(registry_name, loop_count):
+    with named.Registry(registry_name) as registry:
+        with named.AtomicLong(registry, 'counter') as counter:
+            for _ in range(loop_count):
+                counter.add_and_get(1)
+
+
+@pytest.mark.parametrize('method', ['fork', 'spawn'])
+def test_concurrent_named_atomic(registry, method, proc_count=4,
+                                 loop_count=200):
+    ctx = multiprocessing.get_context(method)
+    counter = named.AtomicLong(registry, 'counter')
+
+    processes = []
+    for _ in range(proc_count):
+        p = ctx.Process(target=increment, args=(registry.name, loop_count))
+        processes.append(p)
+        p.start()
+
+    for p in processes:
+        p.join()
+        assert p.exitcode == 0
+
+    assert counter.get() == proc_count * loop_count
@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+'''
+tests.test_persistent
+'''
+
+import multiprocessing
+import struct
+import threading
+
+import pytest
+
+import atomos.persistent
+
+
+number_types = [(atomos.persistent.AtomicInteger, 0, 1),
+                (atomos.persistent.AtomicLong, 0, 1),
+                (atomos.persistent.AtomicFloat, 0.0, 1.0)]
+
+
+@pytest.fixture(params=number_types)
+def mapped_number(request, tmp_path):
+    cls, zero, one = request.param
+    number = cls(str(tmp_path / 'number'))
+    yield number, zero, one
+    number.close()
+
+
+def test_mapped_number_operations(mapped_number):
+    number, zero, one = mapped_number
+
+    assert number.get() == zero
+    assert number.add_and_get(one) == one
+    assert number.get_and_add(one) == one
+    assert number.subtract_and_get(one) == one
+    assert number.get_and_subtract(one) == one
+    assert number.get() == zero
+    assert number.set(one) == one
+    assert number.get_and_set(zero) == one
+    assert number.compare_and_set(one, zero) is False
+    assert number.compare_and_set(zero, one) is True
+    assert number.get() == one
+    assert type(number.get()) is type(one)
+
+
+def test_mapped_number_type_guarantees(mapped_number):
+    number, zero, one = mapped_number
+
+    with pytest.raises(TypeError):
+        number.set('1')
+
+    with pytest.raises(TypeError):
+        number.add_and_get('1')
+
+    assert number.get() == zero
+
+
+def test_mapped_number_persists(tmp_path):
+    path = str(tmp_path / 'counter')
+
+    with atomos.persistent.AtomicLong(path, value=41) as counter:
+        assert counter.add_and_get(1) == 42
+
+    with atomos.persistent.AtomicLong(path, value=0) as counter:
+        assert counter.get() == 42
+        counter.flush()
+
+
+def test_mapped_number_sync_interval(tmp_path):
+    path = str(tmp_path / 'counter')
+
+    with atomos.persistent.AtomicLong(path, sync_interval=0) as counter:
+        for _ in range(3):
+            counter.add_and_get(1)
+
+    with atomos.persistent.AtomicLong(path) as counter:
+        assert counter.get() == 3
+
+
+def test_mapped_number_overflow(tmp_path):
+    path = str(tmp_path / 'counter')
+
+    with atomos.persistent.AtomicLong(path, value=2 ** 63 - 1) as counter:
+        with pytest.raises(OverflowError):
+            counter.add_and_get(1)
+
+        assert counter.get() == 2 ** 63 - 1
+
+
+def test_mapped_number_torn_write(tmp_path):
+    path = str(tmp_path / 'counter')
+
+    with atomos.persistent.AtomicLong(path) as counter:
+        counter.set(1)
+        counter.set(2)
+
+    # Simulate a crash part way through the write of the newest value, which
+    # was the third write and so went to the second slot. The value written
+    # before it must be recovered.
+    with open(path, 'r+b') as f:
+        f.seek(atomos.persistent._SLOTS[1] + 8)
+        f.write(struct.pack('<q', 3))
+
+    with atomos.persistent.AtomicLong(path) as counter:
+        assert counter.get() == 1
+        assert counter.add_and_get(1) == 2
+
+    with atomos.persistent.AtomicLong(path) as counter:
+        assert counter.get() == 2
+
+
+def test_mapped_number_torn_first_write(tmp_path):
+    path = str(tmp_path / 'counter')
+
+    with atomos.persistent.AtomicLong(path, value=5) as counter:
+        counter.set(6)
+
+    # The first write after the file was created went to the slot the
+    # initial value was not written to, which therefore survives it tearing.
+    with open(path, 'r+b') as f:
+        f.seek(atomos.persistent._SLOTS[0] + 8)
+        f.write(struct.pack('<q', 7))
+
+    with atomos.persistent.AtomicLong(path) as counter:
+        assert counter.get() == 5
+
+
+def test_mapped_number_corrupt(tmp_path):
+    path = str(tmp_path / 'counter')
+    atomos.persistent.AtomicLong(path).close()
+
+    with open(path, 'r+b') as f:
+        for offset in atomos.persistent._SLOTS:
+            f.seek(offset + 8)
+            f.write(struct.pack('<q', 7))
+
+    with atomos.persistent.AtomicLong(path) as counter:
+        with pytest.raises(ValueError):
+            counter.get()
+        # Mutators hold the lock already, and must not wait for it again.
+        with pytest.raises(ValueError):
+            counter.add_and_get(1)
+
+
+def test_mapped_number_layout_checks(tmp_path):
+    path = str(tmp_path / 'counter')
+    atomos.persistent.AtomicLong(path).close()
+
+    with pytest.raises(ValueError):
+        atomos.persistent.AtomicFloat(path)
+
+    with open(path, 'r+b') as f:
+        f.seek(8)
+        f.write(struct.pack('<I', atomos.persistent.LAYOUT_VERSION + 1))
+
+    with pytest.raises(ValueError):
+        atomos.persistent.AtomicLong(path)
+
+    with open(path, 'r+b') as f:
+        f.write(b'notatoms')
+
+    with pytest.raises(ValueError):
+        atomos.persistent.AtomicLong(path)
+
+
+@pytest.mark.parametrize('proc', [threading.Thread, multiprocessing.Process])
+def test_concurrent_mapped_number(tmp_path, proc, proc_count=10,
+                                  loop_count=200):
+    path = str(tmp_path / 'counter')
+
+    def inc():
+        # Each worker opens the file itself, as an unrelated process would.
+        with atomos.persistent.AtomicLong(path) as counter:
+            for _ in range(loop_count):
+                counter.add_and_get(1)
+
+    atomos.persistent.AtomicLong(path).close()
+
+    processes = []
+    for _ in range(proc_count):
+        p = proc(target=inc)
+        processes.append(p)
+        p.start()
+
+    for p in processes:
+        p.join()
+
+    with atomos.persistent.AtomicLong(path) as counter:
+        assert counter.get() == proc_count * loop_count
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+'''
+tests.test_ratelimit
+'''
+
+import threading
+import multiprocessing
+
+import pytest
+
+import atomos.ratelimit
+import atomos.multiprocessing.ratelimit
+
+
+def test_token_bucket():
+    limiter = atomos.ratelimit.TokenBucket(1, burst=10)
+    assert limiter.tokens == 10
+    assert limiter.try_acquire(4) is True
+    assert limiter.try_acquire(6) is True
+    assert limiter.try_acquire() is False
+    assert limiter.try_acquire(11) is False
+    assert limiter.acquire(timeout=0.1) is False
+
+    with pytest.raises(ValueError):
+        limiter.acquire(11)
+
+    with pytest.raises(ValueError):
+        atomos.ratelimit.TokenBucket(0)
+
+
+def test_token_bucket_refill():
+    limiter = atomos.ratelimit.TokenBucket(100, burst=1)
+    assert limiter.try_acquire() is True
+    assert limiter.try_acquire() is False
+    # A token refills after a hundredth of a second.
+    assert limiter.acquire(timeout=1) is True
+
+
+def test_sliding_window():
+    limiter = atomos.ratelimit.SlidingWindow(10, window=60)
+    assert limiter.try_acquire(4) is True
+    assert limiter.try_acquire(6) is True
+    assert limiter.try_acquire() is False
+    assert limiter.count == 10
+
+    with pytest.raises(ValueError):
+        atomos.ratelimit.SlidingWindow(1 << 19)
+
+
+def test_sliding_window_slides():
+    limiter = atomos.ratelimit.SlidingWindow(10, window=60)
+    state = limiter._state.get()
+    assert limiter.try_acquire(10) is True
+
+    # Half way into the next window, half of the previous one still counts.
+    limiter._epoch -= int(90e9)
+    assert limiter.count == pytest.approx(5, abs=0.01)
+    assert limiter.try_acquire(6) is False
+    assert limiter.try_acquire(5) is True
+
+    # Two windows on, nothing does.
+    limiter._epoch -= int(120e9)
+    assert limiter.count == 0
+    assert limiter._state.get() != state
+
+
+# Limiters which admit 100 permits at first, and then none for a long time.
+limiters = [lambda module: module.TokenBucket(1e-3, burst=100),
+            lambda module: module.SlidingWindow(100, window=600)]
+
+
+@pytest.mark.parametrize('factory', limiters)
+def test_limit_threads(factory, thread_count=8, loop_count=200):
+    limiter = factory(atomos.ratelimit)
+    admitted = []
+
+    def acquire():
+        for _ in range(loop_count):
+            if limiter.try_acquire():
+                admitted.append(1)
+
+    threads = [threading.Thread(target=acquire) for _ in range(thread_count)]
+    for t in threads:
+        t.start()
+
+    for t in threads:
+        t.join()
+
+    assert len(admitted) == 100
+
+
+def _acquire(limiter, loop_count, admitted):
+    for _ in range(loop_count):
+        if limiter.try_acquire():
+            with admitted.get_lock():
+                admitted.value += 1
+
+
+@pytest.mark.parametrize('factory', limiters)
+def test_limit_multiprocessing(factory, process_count=4, loop_count=50):
+    limiter = factory(atomos.multiprocessing.ratelimit)
+    admitted = multiprocessing.Value('i', 0)
+
+    processes = [multiprocessing.Process(target=_acquire,
+                                         args=(limiter, loop_count, admitted))
+                 for _ in range(process_count)]
+    for p in processes:
+        p.start()
+
+    for p in processes:
+        p.join()
+
+    assert admitted.value == 100
@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+'''
+tests.test_ringbuffer
+'''
+
+import threading
+import multiprocessing
+
+import pytest
+
+import atomos.ringbuffer
+import atomos.multiprocessing.ringbuffer
+
+wait_strategies = [atomos.ringbuffer.BlockingWaitStrategy(),
+                   atomos.ringbuffer.YieldingWaitStrategy()]
+
+
+def test_ring_buffer():
+    ring = atomos.ringbuffer.RingBuffer(3)
+    assert len(ring) == 4
+    assert ring.cursor == -1
+
+    reader = ring.new_reader()
+    assert reader.read(timeout=0) == []
+
+    ring.offer('foo')
+    ring.publish_all(['bar', 'baz'])
+    assert ring.cursor == 2
+    assert reader.read(max_n=2) == ['foo', 'bar']
+    assert reader.read() == ['baz']
+    assert reader.sequence == 2
+
+    first = ring.claim(2)
+    ring[first] = 'spam'
+    ring[first + 1] = 'eggs'
+    ring.publish(first, 2)
+
+    seen = []
+    assert reader.process(lambda *args: seen.append(args)) == 2
+    assert seen == [('spam', 3, False), ('eggs', 4, True)]
+
+    with pytest.raises(ValueError):
+        ring.claim(5)
+
+
+def test_ring_buffer_factory():
+    ring = atomos.ringbuffer.RingBuffer(2, factory=dict)
+    reader = ring.new_reader()
+
+    first = ring.claim()
+    ring[first]['foo'] = 'bar'
+    ring.publish(first)
+    reader.process(lambda event, sequence, end: event.clear())
+    assert ring[first] == {}
+
+
+def test_ring_buffer_full():
+    ring = atomos.ringbuffer.RingBuffer(2)
+    reader = ring.new_reader()
+    ring.publish_all([1, 2])
+
+    # The producer waits for the reader to free a slot.
+    t = threading.Thread(target=ring.offer, args=(3,))
+    t.start()
+    t.join(0.05)
+    assert t.is_alive()
+    assert ring.cursor == 1
+
+    assert reader.read(max_n=1) == [1]
+    t.join()
+    assert reader.read() == [2, 3]
+
+    # Removed readers no longer hold producers up.
+    ring.remove_reader(reader)
+    ring.publish_all([4, 5])
+    ring.offer(6)
+    assert ring.cursor == 5
+
+
+@pytest.mark.parametrize('wait_strategy', wait_strategies)
+def test_ring_buffer_threads(wait_strategy, producer_count=4, loop_count=500):
+    ring = atomos.ringbuffer.RingBuffer(64, wait_strategy=wait_strategy)
+    journal = ring.new_reader()
+    handler = ring.new_reader(depends_on=[journal])
+    total = producer_count * loop_count
+    journalled, handled = [], []
+
+    def produce(p):
+        for i in range(0, loop_count, 5):
+            ring.publish_all([(p, j) for j in range(i, i + 5)])
+
+    def consume(reader, out, check=None):
+        while len(out) < total:
+            for value in reader.read(timeout=1):
+                if check is not None:
+                    # A dependent reader only sees consumed values.
+                    assert reader.sequence <= journal.sequence
+                out.append(value)
+
+    consumers = [threading.Thread(target=consume, args=(journal, journalled)),
+                 threading.Thread(target=consume,
+                                  args=(handler, handled, True))]
+    producers = [threading.Thread(target=produce, args=(p,))
+                 for p in range(producer_count)]
+    for t in consumers + producers:
+        t.start()
+
+    for t in consumers + producers:
+        t.join()
+
+    assert handled == journalled
+    assert sorted(handled) == sorted((p, i) for p in range(producer_count)
+                                     for i in range(loop_count))
+    # Values of each producer stay in order.
+    for p in range(producer_count):
+        assert [i for q, i in handled if q == p] == list(range(loop_count))
+
+
+def _produce(ring, count):
+    for i in range(count):
+        ring.offer(float(i))
+
+
+def test_ring_buffer_multiprocessing(loop_count=200):
+    ring = atomos.multiprocessing.ringbuffer.RingBuffer(16)
+    reader = ring.new_reader()
+
+    p = multiprocessing.Process(target=_produce, args=(ring, loop_count))
+    p.start()
+    values = []
+    while len(values) < loop_count:
+        values.extend(reader.read(timeout=5))
+    p.join()
+
+    assert values == [float(i) for i in range(loop_count)]
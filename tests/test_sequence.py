@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+'''
+tests.test_sequence
+'''
+
+import threading
+import multiprocessing
+
+import pytest
+
+import atomos.sequence
+import atomos.multiprocessing.sequence
+
+
+def test_sequence():
+    ids = atomos.sequence.Sequence(start=10, block_size=3)
+    assert [ids.next() for _ in range(5)] == [10, 11, 12, 13, 14]
+    assert next(ids) == 15
+    assert ids._reserved.get() == 16
+
+    with pytest.raises(ValueError):
+        atomos.sequence.Sequence(block_size=0)
+
+
+@pytest.mark.parametrize('strict', [False, True])
+def test_sequence_threads(strict, thread_count=8, loop_count=1000):
+    ids = atomos.sequence.Sequence(block_size=16, strict=strict)
+    issued = [[] for _ in range(thread_count)]
+
+    def take(out):
+        for _ in range(loop_count):
+            out.append(ids.next())
+
+    threads = [threading.Thread(target=take, args=(out,)) for out in issued]
+    for t in threads:
+        t.start()
+
+    for t in threads:
+        t.join()
+
+    every = [i for out in issued for i in out]
+    assert len(set(every)) == thread_count * loop_count
+    for out in issued:
+        assert out == sorted(out)
+
+
+def test_sequence_strict():
+    ids = atomos.sequence.Sequence(block_size=100, strict=True)
+    other = []
+    assert ids.next() == 1
+
+    t = threading.Thread(target=lambda: other.append(ids.next()))
+    t.start()
+    t.join()
+    assert other == [101]
+
+    # The other thread reserved a newer block, so this one gives up its own.
+    assert ids.next() == 201
+
+
+def _take(ids, count, out):
+    for _ in range(count):
+        out.put(ids.next())
+
+
+def test_sequence_multiprocessing(process_count=4, loop_count=100):
+    ids = atomos.multiprocessing.sequence.Sequence(block_size=8)
+    assert ids.next() == 1
+
+    out = multiprocessing.Queue()
+    processes = [multiprocessing.Process(target=_take,
+                                         args=(ids, loop_count, out))
+                 for _ in range(process_count)]
+    for p in processes:
+        p.start()
+
+    every = [out.get() for _ in range(process_count * loop_count)]
+    for p in processes:
+        p.join()
+
+    # Forked children do not reuse the block of their parent.
+    every.append(ids.next())
+    assert len(set(every)) == len(every)
+    assert 1 not in every
@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+'''
+tests.test_snapshot
+'''
+
+import threading
+
+import pytest
+
+import atomos
+import atomos.atom
+import atomos.atomic
+
+
+def test_snapshot():
+    count = atomos.atomic.AtomicInteger(1)
+    config = atomos.atomic.AtomicReference({'foo': 'bar'})
+    state = atomos.atom.Atom([])
+
+    assert atomos.snapshot(count, config, state) == (1, {'foo': 'bar'}, [])
+    assert atomos.snapshot(state) == ([],)
+    assert atomos.snapshot() == ()
+
+    with pytest.raises(TypeError):
+        atomos.snapshot(count, object())
+
+
+@pytest.mark.parametrize('cls', [atomos.atomic._PyAtomicInteger,
+                                 atomos.atomic.AtomicInteger])
+def test_snapshot_is_consistent(cls, loop_count=2000):
+    # The writer always bumps `first` before `second`, so that a consistent
+    # view never has `second` ahead of `first`, where reading one after the
+    # other may.
+    first, second = cls(), atomos.atom.Atom(0)
+    done = threading.Event()
+
+    def writer():
+        for _ in range(loop_count):
+            first.add_and_get(1)
+            second.swap(lambda n: n + 1)
+        done.set()
+
+    t = threading.Thread(target=writer)
+    t.start()
+    while not done.is_set():
+        a, b = atomos.snapshot(first, second)
+        assert a - b in (0, 1)
+    t.join()
+
+    assert atomos.snapshot(first, second) == (loop_count, loop_count)
@@ -0,0 +1,219 @@
+# -*- coding: utf-8 -*-
+'''
+tests.test_sync
+'''
+
+import threading
+import time
+import multiprocessing
+
+import pytest
+
+import atomos.sync
+import atomos.multiprocessing.sync
+
+
+def start(target, count, args=()):
+    threads = [threading.Thread(target=target, args=args)
+               for _ in range(count)]
+    for t in threads:
+        t.start()
+    return threads
+
+
+def test_count_down_latch(thread_count=5):
+    latch = atomos.sync.CountDownLatch(thread_count)
+    assert latch.wait(timeout=0.01) is False
+
+    for t in start(latch.count_down, thread_count):
+        t.join()
+
+    assert latch.count == 0
+    assert latch.wait() is True
+    latch.count_down()
+    assert latch.count == 0
+
+    with pytest.raises(ValueError):
+        atomos.sync.CountDownLatch(-1)
+
+
+def test_count_down_latch_wakes_waiters(thread_count=5):
+    latch = atomos.sync.CountDownLatch(1)
+    released = []
+    threads = start(lambda: released.append(latch.wait()), thread_count)
+    latch.count_down()
+    for t in threads:
+        t.join()
+
+    assert released == [True] * thread_count
+
+
+def test_cyclic_barrier(thread_count=4, loop_count=20):
+    actions = []
+    barrier = atomos.sync.CyclicBarrier(
+        thread_count, action=lambda: actions.append(len(actions)))
+    indices = []
+    lock = threading.Lock()
+
+    def work():
+        for _ in range(loop_count):
+            index = barrier.wait(timeout=5)
+            with lock:
+                indices.append(index)
+
+    for t in start(work, thread_count):
+        t.join()
+
+    assert actions == list(range(loop_count))
+    assert sorted(indices) == sorted(list(range(thread_count)) * loop_count)
+    assert barrier.n_waiting == 0
+    assert barrier.broken is False
+
+
+def test_cyclic_barrier_broken():
+    barrier = atomos.sync.CyclicBarrier(2)
+    with pytest.raises(atomos.sync.BrokenBarrierError):
+        barrier.wait(timeout=0.01)
+    assert barrier.broken is True
+
+    # Later arrivals fail, too, until the barrier is reset.
+    with pytest.raises(atomos.sync.BrokenBarrierError):
+        barrier.wait()
+
+    barrier.reset()
+    assert barrier.broken is False
+    threads = start(barrier.wait, 1)
+    barrier.wait(timeout=5)
+    threads[0].join()
+
+    # A failing action breaks the barrier.
+    barrier = atomos.sync.CyclicBarrier(1, action=lambda: 1 / 0)
+    with pytest.raises(ZeroDivisionError):
+        barrier.wait()
+    assert barrier.broken is True
+
+
+def test_cyclic_barrier_slow_action():
+    running = []
+    calls = []
+
+    def action():
+        running.append(None)
+        calls.append(len(running))
+        time.sleep(0.2)
+        running.pop()
+
+    barrier = atomos.sync.CyclicBarrier(2, action=action)
+    errors = []
+
+    def wait():
+        try:
+            barrier.wait(timeout=5)
+        except atomos.sync.BrokenBarrierError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=wait) for _ in range(4)]
+    for thread in threads[:2]:
+        thread.start()
+    while not calls:
+        time.sleep(0.001)
+
+    # The third and fourth threads arrive while the action of the first
+    # generation is running. Both must wait for their own generation, and
+    # the fourth must not run the action before the first one finished.
+    threads[2].start()
+    threads[3].start()
+    while barrier._arrivals.get() < 4:
+        time.sleep(0.001)
+    assert threads[2].is_alive()
+    assert threads[3].is_alive()
+
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert calls == [1, 1]
+    assert barrier.broken is False
+    assert barrier.n_waiting == 0
+
+
+def test_phaser():
+    phaser = atomos.sync.Phaser()
+    assert phaser.phase == 0
+    with pytest.raises(ValueError):
+        phaser.arrive()
+
+    assert phaser.register(2) == 0
+    assert phaser.registered_parties == 2
+    assert phaser.arrive() == 0
+    assert phaser.unarrived_parties == 1
+    assert phaser.await_advance(0, timeout=0.01) is None
+
+    assert phaser.arrive_and_deregister() == 0
+    assert phaser.phase == 1
+    assert phaser.await_advance(0) == 1
+    assert phaser.registered_parties == 1
+
+    assert phaser.arrive_and_deregister() == 1
+    assert phaser.terminated is True
+    assert phaser.phase == -1
+    assert phaser.register() == -1
+    assert phaser.arrive() == -1
+
+
+def test_phaser_threads(thread_count=4, loop_count=20):
+    phaser = atomos.sync.Phaser(thread_count)
+    phases = [[] for _ in range(thread_count)]
+
+    def work(out):
+        for _ in range(loop_count):
+            out.append(phaser.arrive_and_await_advance(timeout=5))
+        phaser.arrive_and_deregister()
+
+    threads = [threading.Thread(target=work, args=(out,)) for out in phases]
+    for t in threads:
+        t.start()
+
+    for t in threads:
+        t.join()
+
+    assert phases == [list(range(1, loop_count + 1))] * thread_count
+    assert phaser.terminated is True
+
+
+def test_phaser_force_termination():
+    phaser = atomos.sync.Phaser(2)
+    results = []
+    threads = start(lambda: results.append(phaser.arrive_and_await_advance()),
+                    1)
+    phaser.force_termination()
+    threads[0].join()
+    assert results == [-1]
+
+
+def _work(latch, barrier, phaser, loop_count):
+    latch.count_down()
+    for _ in range(loop_count):
+        barrier.wait(timeout=10)
+        phaser.arrive_and_await_advance(timeout=10)
+
+
+def test_sync_multiprocessing(process_count=3, loop_count=5):
+    latch = atomos.multiprocessing.sync.CountDownLatch(process_count)
+    barrier = atomos.multiprocessing.sync.CyclicBarrier(process_count + 1)
+    phaser = atomos.multiprocessing.sync.Phaser(process_count + 1)
+
+    processes = [multiprocessing.Process(target=_work,
+                                         args=(latch, barrier, phaser,
+                                               loop_count))
+                 for _ in range(process_count)]
+    for p in processes:
+        p.start()
+
+    assert latch.wait(timeout=10) is True
+    for i in range(loop_count):
+        barrier.wait(timeout=10)
+        assert phaser.arrive_and_await_advance(timeout=10) == i + 1
+
+    for p in processes:
+        p.join()
+        assert p.exitcode == 0
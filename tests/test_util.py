@@ -3,9 +3,11 @@
 tests.test_util
 '''
 
+import importlib.util
 import threading
 import multiprocessing
 
+import atomos.atomic
 import atomos.util
 
 
@@ -149,3 +151,158 @@ def test_readers_writer_lock_multiprocessing(acquire_shared_count=10):
 
     assert p.is_alive() is False
     assert lock._reader_count.value == 1
+
+
+def _get_in_thread(ref):
+    values = []
+    thread = threading.Thread(target=lambda: values.append(ref.get()))
+    thread.daemon = True
+    thread.start()
+    thread.join(0.2)
+    return values
+
+
+def test_free_threaded(monkeypatch):
+    # Which `AtomicReference.get` is used is decided when the module is
+    # executed, so execute a copy of it with the flag patched.
+    monkeypatch.setattr(atomos.util, 'FREE_THREADED', True)
+    spec = importlib.util.spec_from_file_location('_atomic_free_threaded',
+                                                  atomos.atomic.__file__)
+    free_threaded = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(free_threaded)
+
+    ref = atomos.atomic.AtomicReference('foo')
+    ref_free_threaded = free_threaded.AtomicReference('foo')
+
+    # While a writer holds the lock, readers wait for it, unless the build
+    # is free-threaded, where they do not take the lock at all.
+    ref._lock.exclusive.acquire()
+    ref_free_threaded._lock.exclusive.acquire()
+    try:
+        assert _get_in_thread(ref) == []
+        assert _get_in_thread(ref_free_threaded) == ['foo']
+    finally:
+        ref._lock.exclusive.release()
+        ref_free_threaded._lock.exclusive.release()
+
+
+def test_biased_lock():
+    lock = atomos.util.BiasedLock()
+
+    # The owner never touches the underlying lock.
+    with lock.exclusive:
+        assert lock._lock._writer_lock.locked() is False
+    with lock.shared:
+        pass
+    assert lock.revoked is False
+
+
+def test_biased_lock_revocation():
+    revocations = []
+    lock = atomos.util.BiasedLock(
+        on_revoke=lambda *args: revocations.append(args))
+    before = atomos.util.BiasedLock.revocations
+
+    entered = threading.Event()
+    leave = threading.Event()
+    other = []
+
+    def hold():
+        with lock.exclusive:
+            entered.set()
+            leave.wait()
+
+    def contend():
+        with lock.exclusive:
+            other.append(threading.get_ident())
+
+    # A revoking thread waits for the owner to leave its critical section.
+    holder = threading.Thread(target=hold)
+    holder.start()
+    entered.wait()
+    contender = threading.Thread(target=contend)
+    contender.start()
+    contender.join(0.05)
+    assert other == []
+
+    leave.set()
+    holder.join()
+    contender.join()
+    assert other == [contender.ident]
+    assert lock.revoked is True
+    assert revocations == [(lock, holder.ident, contender.ident)]
+    assert atomos.util.BiasedLock.revocations == before + 1
+
+    # Afterwards every thread uses the underlying lock.
+    with lock.exclusive:
+        assert lock._lock._writer_lock.locked() is True
+
+
+def test_biased_lock_atomics(thread_count=10, loop_count=1000):
+    atomic_int = atomos.atomic._PyAtomicInteger(
+        lock_type=atomos.util.BiasedLock)
+    atomic_int.add_and_get(1)
+
+    def inc():
+        for _ in range(loop_count):
+            atomic_int.add_and_get(1)
+
+    threads = [threading.Thread(target=inc) for _ in range(thread_count)]
+    for t in threads:
+        t.start()
+
+    for t in threads:
+        t.join()
+
+    assert atomic_int.get() == thread_count * loop_count + 1
+    assert atomic_int._lock.revoked is True
+
+
+def test_adaptive_lock():
+    lock = atomos.util.AdaptiveLock()
+
+    with lock:
+        assert lock.locked() is True
+        assert lock.acquire(False) is False
+        assert lock.acquire(timeout=0.01) is False
+    assert lock.locked() is False
+
+    # It may be released by another thread, as the writer lock of a
+    # readers-writer lock is.
+    lock.acquire()
+    t = threading.Thread(target=lock.release)
+    t.start()
+    t.join()
+    assert lock.acquire(timeout=1) is True
+    lock.release()
+
+    # Only contended acquisitions are timed.
+    assert lock._wait_time == 0.0
+    lock.acquire()
+    t = threading.Timer(0.01, lock.release)
+    t.start()
+    assert lock.acquire(timeout=1) is True
+    assert lock._wait_time > 0.0
+    lock.release()
+    t.join()
+
+
+def test_adaptive_lock_atomics(thread_count=10, loop_count=1000):
+    atomic_int = atomos.atomic._PyAtomicInteger(
+        lock_type=atomos.util.AdaptiveLock)
+    assert isinstance(atomic_int._lock, atomos.util.ReadersWriterLock)
+    assert isinstance(atomic_int._lock.exclusive, atomos.util.AdaptiveLock)
+
+    def inc():
+        for _ in range(loop_count):
+            atomic_int.add_and_get(1)
+            atomic_int.get()
+
+    threads = [threading.Thread(target=inc) for _ in range(thread_count)]
+    for t in threads:
+        t.start()
+
+    for t in threads:
+        t.join()
+
+    assert atomic_int.get() == thread_count * loop_count